@@ -151,6 +151,36 @@ for index in range(N):
     plt.xlabel("$t/T$")
     plt.legend()
 
+###############################################################################
+# Simulating the Switched-Capacitor Control
+# -----------------------------------------
+#
+# Alternatively, the capacitor voltages and the charge and discharge
+# phases can be simulated explicitly by the
+# :class:`cbadc.digital_control.SwitchedCapacitorControl`. For this
+# digital control, :func:`cbadc.simulator.get_simulator` returns a
+# :class:`cbadc.simulator.SwitchedCapacitorSimulator`. Charging the capacitors
+# at the end of each clock period results in the same control signals
+# as the impulse response above.
+
+digital_control_explicit_sc = cbadc.digital_control.SwitchedCapacitorControl(
+    T, 0.0, T, M, -np.eye(M) / (R_s * C_Gamma)
+)
+simulator_explicit_sc = cbadc.simulator.get_simulator(
+    analog_system_sc, digital_control_explicit_sc, [analog_signal]
+)
+control_signals_explicit_sc, states_explicit_sc = simulator_explicit_sc.simulate(
+    size, state_decimation=1
+)
+
+plt.figure()
+plt.title("Analog state trajectories, explicit switched-capacitor control")
+for index in range(N):
+    plt.plot(np.arange(size), states_explicit_sc[:, index], label=f"$x_{index + 1}$")
+plt.grid(visible=True, which="major", color="gray", alpha=0.6, lw=1.5)
+plt.xlabel("$t/T$")
+plt.legend()
+
 
 ###############################################################################
 # Filter Coefficients
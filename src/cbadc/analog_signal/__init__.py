@@ -13,10 +13,13 @@ from .constant_signal import ConstantSignal
 from .ramp import Ramp
 from .sinc_pulse import SincPulse
 from .sinusoidal import Sinusoidal
+from .sampled_signal import SampledSignal
 from .clock import Clock
 from .impulse_responses import StepResponse, RCImpulseResponse
 
-_valid_input_signal_types = Union[ConstantSignal, Ramp, SincPulse, Sinusoidal, Clock]
+_valid_input_signal_types = Union[
+    ConstantSignal, Ramp, SincPulse, Sinusoidal, SampledSignal, Clock
+]
 
 _valid_impulse_response_types = Union[StepResponse, RCImpulseResponse]
 
@@ -0,0 +1,146 @@
+"""Sampled-data analog signals."""
+import logging
+import numpy as np
+from ._analog_signal import _AnalogSignal
+
+logger = logging.getLogger(__name__)
+
+
+class SampledSignal(_AnalogSignal):
+    """An analog signal interpolated from a sequence of samples.
+
+    The samples :math:`u[n]` are located at the time instances
+    :math:`t_n = n / f_s` and are interpolated either by a zero-order hold,
+
+    :math:`u(t) = u[n]` for :math:`t \in [t_n, t_{n+1})`,
+
+    or linearly,
+
+    :math:`u(t) = u[n] + (u[n+1] - u[n]) (t - t_n) f_s` for :math:`t \in [t_n, t_{n+1})`.
+
+    Samples outside the range of the sample array are considered zero.
+
+    Parameters
+    ----------
+    samples : `array_like`, shape=(K,)
+        the samples :math:`u[n]`, either a numpy array or a memory mapped
+        array, see :py:func:`cbadc.analog_signal.SampledSignal.from_file`.
+    fs : `float`
+        the sample rate :math:`f_s` in [Hz].
+    interpolation_order : `int`, `optional`
+        0 for zero-order hold and 1 for linear interpolation, defaults to 1.
+
+    Attributes
+    ----------
+    samples : `array_like`, shape=(K,)
+        the samples.
+    fs : `float`
+        the sample rate in [Hz].
+    interpolation_order : `int`
+        the interpolation order.
+
+    See also
+    --------
+    :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator`
+
+    Examples
+    --------
+    >>> from cbadc.analog_signal import SampledSignal
+    >>> u = SampledSignal([0.0, 1.0, 0.5], 10.0)
+    >>> u.evaluate(0.05)
+    0.5
+    >>> u = SampledSignal([0.0, 1.0, 0.5], 10.0, interpolation_order=0)
+    >>> u.evaluate(0.05)
+    0.0
+    """
+
+    def __init__(self, samples: np.ndarray, fs: float, interpolation_order: int = 1):
+        super().__init__()
+        if interpolation_order not in (0, 1):
+            raise Exception("interpolation_order must be either 0 or 1.")
+        if fs <= 0:
+            raise Exception("fs must be positive.")
+        if isinstance(samples, np.memmap):
+            self.samples = samples
+        else:
+            self.samples = np.asarray(samples, dtype=np.double)
+        if len(self.samples.shape) != 1:
+            raise Exception("samples must be a one dimensional array.")
+        self.fs: float = fs
+        self.interpolation_order: int = interpolation_order
+
+    @classmethod
+    def from_file(
+        cls,
+        filename: str,
+        fs: float,
+        interpolation_order: int = 1,
+        dtype=np.double,
+    ):
+        """Create a sampled signal backed by a memory mapped file.
+
+        Parameters
+        ----------
+        filename : `str`
+            either a .npy file or a raw binary file of samples.
+        fs : `float`
+            the sample rate :math:`f_s` in [Hz].
+        interpolation_order : `int`, `optional`
+            0 for zero-order hold and 1 for linear interpolation, defaults to 1.
+        dtype : `numpy.dtype`, `optional`
+            the data type of a raw binary file, defaults to numpy.double.
+
+        Returns
+        -------
+        : :py:class:`cbadc.analog_signal.SampledSignal`
+            the sampled signal.
+        """
+        logger.info(f"Memory mapping samples from file {filename}.")
+        if filename.endswith(".npy"):
+            samples = np.load(filename, mmap_mode="r")
+        else:
+            samples = np.memmap(filename, dtype=dtype, mode="r")
+        return cls(samples, fs, interpolation_order)
+
+    def sample(self, n: np.ndarray) -> np.ndarray:
+        """Return the samples :math:`u[n]`, zero outside the sample range.
+
+        Parameters
+        ----------
+        n : `array_like`, dtype=int
+            the sample indices.
+
+        Returns
+        -------
+        `array_like`
+            the samples.
+        """
+        n = np.asarray(n, dtype=np.int64)
+        valid = (n >= 0) & (n < self.samples.size)
+        res = np.zeros(n.shape, dtype=np.double)
+        res[valid] = self.samples[n[valid]]
+        return res
+
+    def evaluate(self, t: float) -> float:
+        """Evaluate the signal at time :math:`t`.
+
+        Parameters
+        ----------
+        t : `float`
+            the time instance for evaluation.
+
+        Returns
+        -------
+        float
+            The analog signal value
+        """
+        x = t * self.fs
+        n = int(np.floor(x))
+        u = self.sample(np.array([n, n + 1]))
+        if self.interpolation_order == 0:
+            return float(u[0])
+        return float(u[0] + (u[1] - u[0]) * (x - n))
+
+    def __str__(self):
+        return f"""SampledSignal parameterized as: \nfs = {self.fs}, \n
+        interpolation_order = {self.interpolation_order}, \nand\nnumber of samples = {self.samples.size}"""
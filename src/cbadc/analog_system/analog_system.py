@@ -9,6 +9,7 @@ to quickly initialize analog systems of particular structures.
 import numpy as np
 import numpy.typing as npt
 import scipy.signal
+import scipy.sparse
 import logging
 from typing import Union
 import sympy as sp
@@ -16,6 +17,14 @@ import sympy as sp
 logger = logging.getLogger(__name__)
 
 
+def _operator(dense: np.ndarray, sparse: bool):
+    """Return the compressed sparse row version of the matrix if sparse and
+    the dense matrix otherwise."""
+    if sparse and dense is not None:
+        return scipy.sparse.csr_matrix(dense)
+    return dense
+
+
 class AnalogSystem:
     """Represents an analog system.
 
@@ -58,6 +67,18 @@ class AnalogSystem:
     Gamma_tildeT : `array_like`, shape=(M_tilde, N)
         control observation matrix.
 
+    Any of the matrices can be given as a :py:mod:`scipy.sparse` matrix.
+    The matrices are nevertheless stored as dense arrays, i.e., the
+    attributes below are dense, and sparse operators are only kept for the
+    products with the given sparse matrices in
+    :py:func:`cbadc.analog_system.AnalogSystem.derivative`,
+    :py:func:`cbadc.analog_system.AnalogSystem.signal_observation`,
+    :py:func:`cbadc.analog_system.AnalogSystem.control_observation`, the
+    Jacobian of the numerical (Radau) solvers, and the jitter and control
+    observation products of the precomputed and ensemble simulators. The
+    matrix exponentials, and thereby the per clock period state transitions
+    of the precomputed simulators, are computed from, and applied as, dense
+    matrices.
 
     Attributes
     ----------
@@ -81,6 +102,8 @@ class AnalogSystem:
         control input matrix :math:`\mathbf{\Gamma}`.
     Gamma_tildeT : `array_like`, shape=(M_tilde, N)
         control observation matrix :math:`\\tilde{\mathbf{\Gamma}}^\mathsf{T}`.
+    sparse : `bool`
+        True if any of the matrices were given as a scipy.sparse matrix.
     t: :py:class:`sympy.Symbol`
         the symbolic time variable.
     x: [:py:class:`sympy.Function`]
@@ -134,15 +157,34 @@ class AnalogSystem:
             the direct matrix, defaults to None
         """
 
+        sparse = {
+            name
+            for name, matrix in zip(
+                ("A", "B", "CT", "Gamma", "Gamma_tildeT"),
+                (A, B, CT, Gamma, Gamma_tildeT),
+            )
+            if scipy.sparse.issparse(matrix)
+        }
+        self.sparse = bool(sparse)
+        A, B, CT, Gamma, Gamma_tildeT, D = (
+            matrix.toarray() if scipy.sparse.issparse(matrix) else matrix
+            for matrix in (A, B, CT, Gamma, Gamma_tildeT, D)
+        )
+        # the symbolic matrices are derived, when first used, from the
+        # given (possibly integer valued) matrices.
+        self._symbolic_sources = {
+            "A": A,
+            "B": B,
+            "CT": CT,
+            "Gamma": Gamma,
+            "Gamma_tildeT": Gamma_tildeT,
+        }
+        self._symbolic_matrices = {}
         self.A = np.array(A, dtype=np.double)
-        self._A_s = sp.Matrix(A)
         self.B = np.array(B, dtype=np.double)
-        self._B_s = sp.Matrix(B)
         self.CT = np.array(CT, dtype=np.double)
-        self._CT_s = sp.Matrix(CT)
         if Gamma is not None:
             self.Gamma = np.array(Gamma, dtype=np.double)
-            self._Gamma_s = sp.Matrix(Gamma)
             if self.Gamma.shape[0] != self.A.shape[0]:
                 raise InvalidAnalogSystemError(
                     self, "N does not agree with control input matrix Gamma."
@@ -150,12 +192,10 @@ class AnalogSystem:
             self.M: int = self.Gamma.shape[1]
         else:
             self.Gamma = None
-            self._Gamma_s = None
             self.M: int = 0
 
         if Gamma_tildeT is not None:
             self.Gamma_tildeT = np.array(Gamma_tildeT, dtype=np.double)
-            self._Gamma_tildeT_s = sp.Matrix(Gamma_tildeT)
             if self.Gamma_tildeT.shape[1] != self.A.shape[0]:
                 raise InvalidAnalogSystemError(
                     self,
@@ -165,7 +205,6 @@ class AnalogSystem:
             self.M_tilde: int = self.Gamma_tildeT.shape[0]
         else:
             self.Gamma_tildeT = None
-            self._Gamma_tildeT_s = None
             self.M_tilde: int = 0
 
         self.N: int = self.A.shape[0]
@@ -200,7 +239,7 @@ class AnalogSystem:
             self.D = np.array(D, dtype=np.double)
         else:
             self.D = np.zeros((self.N_tilde, self.L))
-        self._D_s = sp.Matrix(self.D)
+        self._symbolic_sources["D"] = self.D
 
         if self.D is not None and (
             self.D.shape[0] != self.N_tilde or self.D.shape[1] != self.L
@@ -208,12 +247,55 @@ class AnalogSystem:
             raise InvalidAnalogSystemError(
                 self, "D matrix has wrong dimensions. Should be N_tilde x L"
             )
+
+        # the operators of the per time step matrix vector products, sparse
+        # for matrices given as scipy.sparse matrices.
+        self._A_operator = _operator(self.A, "A" in sparse)
+        self._B_operator = _operator(self.B, "B" in sparse)
+        self._CT_operator = _operator(self.CT, "CT" in sparse)
+        self._Gamma_operator = _operator(self.Gamma, "Gamma" in sparse)
+        self._Gamma_tildeT_operator = _operator(
+            self.Gamma_tildeT, "Gamma_tildeT" in sparse
+        )
+
         self.t = sp.Symbol('t', real=True)
         self.x = [sp.Function(f'x_{i+1}')(self.t) for i in range(self.N)]
         self.omega = sp.Symbol('omega')
         self._atf_lambda = None
         self._ctf_lambda = None
 
+    def _symbolic(self, name: str):
+        if name not in self._symbolic_matrices:
+            source = self._symbolic_sources[name]
+            self._symbolic_matrices[name] = (
+                None if source is None else sp.Matrix(source)
+            )
+        return self._symbolic_matrices[name]
+
+    @property
+    def _A_s(self):
+        return self._symbolic("A")
+
+    @property
+    def _B_s(self):
+        return self._symbolic("B")
+
+    @property
+    def _CT_s(self):
+        return self._symbolic("CT")
+
+    @property
+    def _Gamma_s(self):
+        return self._symbolic("Gamma")
+
+    @property
+    def _Gamma_tildeT_s(self):
+        return self._symbolic("Gamma_tildeT")
+
+    @property
+    def _D_s(self):
+        return self._symbolic("D")
+
     def derivative(
         self, x: np.ndarray, t: float, u: np.ndarray, s: np.ndarray
     ) -> np.ndarray:
@@ -243,7 +325,11 @@ class AnalogSystem:
         `array_like`, shape=(N,)
             the derivative :math:`\dot{\mathbf{x}}(t)`.
         """
-        return np.dot(self.A, x) + np.dot(self.B, u) + np.dot(self.Gamma, s)
+        return (
+            self._A_operator.dot(x)
+            + self._B_operator.dot(u)
+            + self._Gamma_operator.dot(s)
+        )
 
     def homogenius_solution(self):
         """Compute the symbolic homogenious solution
@@ -316,7 +402,7 @@ class AnalogSystem:
             the signal observation.
 
         """
-        return np.dot(self.CT, x)
+        return self._CT_operator.dot(x)
 
     def control_observation(self, x: np.ndarray) -> np.ndarray:
         """Computes the control observation for a given state vector :math:`\mathbf{x}(t)`
@@ -337,7 +423,7 @@ class AnalogSystem:
             the control observation.
 
         """
-        return np.dot(self.Gamma_tildeT, x)
+        return self._Gamma_tildeT_operator.dot(x)
 
     def _lazy_initialize_ATF(self):
         logger.info("computing analytical transfer function matrix")
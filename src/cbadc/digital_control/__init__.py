@@ -8,8 +8,12 @@ from typing import Union
 from .digital_control import DigitalControl
 from .multi_phase_control import MultiPhaseDigitalControl
 from .conservative_control import ConservativeControl
+from .switch_capacitor_control import SwitchedCapacitorControl
 from .utilities import overcomplete_set, unit_element_set
 
 _valid_digital_control_types = Union[
-    DigitalControl, MultiPhaseDigitalControl, ConservativeControl
+    DigitalControl,
+    MultiPhaseDigitalControl,
+    ConservativeControl,
+    SwitchedCapacitorControl,
 ]
@@ -2,6 +2,7 @@
 import numpy as np
 from ..analog_signal import StepResponse, _valid_clock_types, Clock
 from ..analog_signal.impulse_responses import _ImpulseResponse
+from .. import utilities
 
 
 class DigitalControl:
@@ -50,6 +51,9 @@ class DigitalControl:
     >>> dc = DigitalControl(clock, M)
     """
 
+    # the attributes constituting the dynamic state, see checkpoint().
+    _checkpoint_attributes = ("_s", "_t_next", "_t_last_update", "_control_descisions")
+
     def __init__(
         self,
         clock: _valid_clock_types,
@@ -86,6 +90,39 @@ class DigitalControl:
         self._t_next = t0
         self._t_last_update = t0 * np.ones(self.M)
 
+    def checkpoint(self) -> dict:
+        """Snapshot the dynamic state of the digital control.
+
+        Returns
+        -------
+        `dict`
+            a versioned snapshot, see
+            :py:func:`cbadc.digital_control.DigitalControl.restore`.
+
+        Examples
+        --------
+        >>> from cbadc.digital_control import DigitalControl
+        >>> from cbadc.analog_signal import Clock
+        >>> dc = DigitalControl(Clock(1e-6), 2)
+        >>> snapshot = dc.checkpoint()
+        >>> dc.control_update(1e-6, np.array([-1.0, 1.0]))
+        >>> dc.restore(snapshot)
+        >>> dc.control_signal()
+        array([ True,  True])
+        """
+        return utilities._checkpoint(self, self._checkpoint_attributes)
+
+    def restore(self, checkpoint: dict):
+        """Restore the dynamic state from a snapshot.
+
+        Parameters
+        ----------
+        checkpoint: `dict`
+            a snapshot as returned by
+            :py:func:`cbadc.digital_control.DigitalControl.checkpoint`.
+        """
+        utilities._restore(self, self._checkpoint_attributes, checkpoint)
+
     def control_update(self, t: float, s_tilde: np.ndarray):
         """Updates the control at time t if valid.
 
@@ -97,16 +134,32 @@ class DigitalControl:
             state vector evaluated at time t
         """
         # Check if time t has passed the next control update
-        if np.allclose(t, self._t_next, atol=self.clock._tt_2):
+        # scalar equivalent of np.allclose(t, self._t_next, atol=self.clock._tt_2)
+        if abs(t - self._t_next) <= self.clock._tt_2 + 1e-5 * abs(self._t_next):
             # if so update the control signal state
             # print(f"digital_control set for {t} and {s_tilde}")
-            self._s = s_tilde >= 0
+            self._s = self.quantize(s_tilde)
             self._t_last_update[:] = t
             self._t_next += self.clock.T
             # DAC
             self._control_descisions = np.asarray(2 * self._s - 1, dtype=np.double)
         # return self._dac_values * self._impulse_response(t - self._t_next + self.T)
 
+    def quantize(self, s_tilde: np.ndarray) -> np.ndarray:
+        """Returns the control decisions for control observations.
+
+        Parameters
+        ----------
+        s_tilde : `array_like`, shape=(..., M_tilde)
+            control observations, e.g., one row per simulation.
+
+        Returns
+        -------
+        `array_like`, shape=(..., M), dtype=bool
+            the control decisions.
+        """
+        return s_tilde >= 0
+
     def control_signal(self) -> np.ndarray:
         """Returns the current control state, i.e, :math:`\mathbf{s}[k]`.
 
@@ -45,6 +45,11 @@ class MultiPhaseDigitalControl(DigitalControl):
     For this digital control system :math:`M=\\tilde{M}`.
     """
 
+    _checkpoint_attributes = DigitalControl._checkpoint_attributes + (
+        "_t_next_phase",
+        "_dac_values",
+    )
+
     def __init__(
         self,
         clock: _valid_clock_types,
@@ -70,23 +75,50 @@ class MultiPhaseDigitalControl(DigitalControl):
         else:
             self._impulse_response = [StepResponse() for _ in range(self.M)]
 
+        # the event table, i.e., the phases sorted by their offset within
+        # the clock period.
+        self._schedule = np.argsort(
+            np.mod(self._phi_1, self.clock.T), kind="stable"
+        ).astype(int)
+
         self._dac_values = np.zeros(self.M, dtype=np.double)
         # initialize dac values
         self.control_update(self._t_next, np.zeros(self.M))
 
     def _next_update(self):
-        t_next = np.inf
-        for m in range(self.M):
-            if self._t_next_phase[m] < t_next:
-                t_next = self._t_next_phase[m]
-        return t_next
+        return np.min(self._t_next_phase)
 
     def jitter(self, t: float):
         "Jitter the phase by t"
-        for m in range(self.M):
-            self._t_next_phase[m] += t
+        self._t_next_phase += t
         self._t_next = self._next_update()
 
+    def next_events(self, K: int):
+        """Returns the next K control updates without updating the
+        digital control.
+
+        Phases updating simultaneously result in separate events with
+        the same time.
+
+        Parameters
+        ----------
+        K : `int`
+            the number of events.
+
+        Returns
+        -------
+        `array_like`, shape=(K,)
+            the event times in increasing order.
+        `array_like`, shape=(K,), dtype=int
+            the phase :math:`m` updated by each event.
+        """
+        # the pending updates are a rotation of the event table
+        start = int(np.argmin(self._t_next_phase[self._schedule]))
+        k = np.arange(K)
+        phases = self._schedule[(start + k) % self.M]
+        times = self._t_next_phase[phases] + self.clock.T * (k // self.M)
+        return times, phases
+
     def control_update(self, t: float, s_tilde: np.ndarray):
         """Updates the control descisions at time t given a control observation
         s_tilde.
@@ -101,16 +133,14 @@ class MultiPhaseDigitalControl(DigitalControl):
         """
         # Check if time t has passed the next control update
         if t >= self._t_next:
-            for m in range(self.M):
-                if t >= self._t_next_phase[m]:
-                    # if so update the control signal state
-                    self._s[m] = s_tilde[m] >= 0
-                    self._t_next_phase[m] += self.clock.T
-                    self._t_next = self._next_update()
-                    self._t_last_update[m] = t
-                    # DAC
-                    self._dac_values = np.asarray(2 * self._s - 1, dtype=np.double)
-                    # print(f"m = {m}, t = {t}, s = {self._dac_values}")
+            # if so update the control signal state of all phases due
+            due = t >= self._t_next_phase
+            self._s[due] = s_tilde[due] >= 0
+            self._t_next_phase[due] += self.clock.T
+            self._t_last_update[due] = t
+            self._t_next = self._next_update()
+            # DAC
+            self._dac_values = np.asarray(2 * self._s - 1, dtype=np.double)
 
     def impulse_response(self, m: int, t: float) -> np.ndarray:
         """The impulse response of the corresponding DAC waveform
@@ -1,6 +1,7 @@
 """Switched capacitor digital control"""
 import numpy as np
 from .digital_control import DigitalControl
+from ..analog_signal import Clock
 
 
 class SwitchedCapacitorControl(DigitalControl):
@@ -27,11 +28,22 @@ class SwitchedCapacitorControl(DigitalControl):
         the voltage stored on each capacitor before discharge,
         defaults to 1.
 
+    At :math:`T_1` the :math:`m`-th control signal is decided and the
+    capacitor, charged to :math:`\pm` VCap, is connected to the analog system
+    (phase 0). Thereafter, the capacitor voltages :math:`\mathbf{v}(t)`
+    discharge as :math:`\dot{\mathbf{v}}(t) = \mathbf{A} \mathbf{v}(t)` into
+    the analog system through the control input matrix :math:`\mathbf{\Gamma}`.
+    At :math:`T_2` the capacitor is disconnected and re-charged (phase 1).
+    These dynamics are simulated by
+    :py:class:`cbadc.simulator.SwitchedCapacitorSimulator`.
+
 
     Attributes
     ----------
     T : `float`
         total clock period :math:`T` of digital control system.
+    clock : :py:class:`cbadc.analog_signal.clock.Clock`
+        the digital control clock of period :math:`T`.
     T1 : `array_like`, shape=(M,)
         discharge phase time
     T2 : `float`
@@ -46,6 +58,8 @@ class SwitchedCapacitorControl(DigitalControl):
     For this digital control system :math:`M=\\tilde{M}`.
     """
 
+    _checkpoint_attributes = ("_s", "_T1_next", "_T2_next", "phase")
+
     def __init__(self, T, T1, T2, M, A, t0=0, VCap=1.0):
         if isinstance(T1, (list, tuple, np.ndarray)):
             self.T1 = np.array(T1, dtype=np.double)
@@ -57,7 +71,7 @@ class SwitchedCapacitorControl(DigitalControl):
         if isinstance(T2, (list, tuple, np.ndarray)):
             self.T2 = np.array(T2, dtype=np.double)
         else:
-            self.T2 = T2 * np.ones(T2, dtype=np.double)
+            self.T2 = T2 * np.ones(M, dtype=np.double)
         self._T2_next = t0 + self.T2
 
         self.M = M
@@ -70,6 +84,7 @@ class SwitchedCapacitorControl(DigitalControl):
                 )
 
         self.T = T
+        self.clock = Clock(T)
         if (self.T < self.T1).any() or (2 * self.T < self.T2).any():
             raise Exception("T1 cannot exceed T and T2 cannot exceed 2T.")
 
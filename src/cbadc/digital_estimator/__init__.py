@@ -1,10 +1,11 @@
 """A selection of control-bounded digital estimators
 """
 from .batch_estimator import BatchEstimator
-from .fir_estimator import FIRFilter
+from .fir_estimator import FIRFilter, FIRFilterBackend
 from .iir_estimator import IIRFilter
 from .parallel_digital_estimator import ParallelEstimator
 from .nuv_estimator import NUVEstimator
+from .segmented_estimator import SegmentedEstimator
 from ._filter_coefficients import FilterComputationBackend
 from typing import Union
 
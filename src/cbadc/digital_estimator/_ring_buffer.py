@@ -0,0 +1,82 @@
+"""A circular buffer of control signals."""
+import numpy as np
+
+
+class _RingBuffer:
+    """A first-in first-out buffer of rows with a contiguous view.
+
+    Rows are appended at the tail and discarded from the head by moving
+    the head index instead of shifting the buffered rows. Every row is
+    stored twice, at the positions :math:`i` and :math:`i + K` of a
+    storage of :math:`2K` rows, such that the buffered rows are always
+    the contiguous slice starting at the head.
+
+    Parameters
+    ----------
+    size: `int`
+        the capacity :math:`K` of the buffer.
+    width: `int`
+        the number of columns of each row.
+    dtype: `numpy.dtype`, `optional`
+        the data type, defaults to numpy.int8.
+    full: `bool`, `optional`
+        initially fill the buffer with zeros, defaults to False.
+    """
+
+    def __init__(self, size: int, width: int, dtype=np.int8, full: bool = False):
+        self.size = size
+        self._data = np.zeros((2 * size, width), dtype=dtype)
+        self._head = 0
+        self._length = size if full else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def view(self) -> np.ndarray:
+        """Return the buffered rows, oldest first.
+
+        Returns
+        -------
+        `array_like`, shape=(len(self), width)
+            a read-only view of the buffered rows.
+        """
+        view = self._data[self._head : self._head + self._length, :]
+        view.flags.writeable = False
+        return view
+
+    def append(self, rows: np.ndarray):
+        """Append rows at the tail.
+
+        Parameters
+        ----------
+        rows: `array_like`, shape=(K, width)
+            the rows to append.
+        """
+        K = rows.shape[0]
+        if self._length + K > self.size:
+            raise Exception("Ring buffer full.")
+        tail = (self._head + self._length) % self.size
+        first = min(K, self.size - tail)
+        for offset in (0, self.size):
+            self._data[offset + tail : offset + tail + first, :] = rows[:first, :]
+            self._data[offset : offset + K - first, :] = rows[first:, :]
+        self._length += K
+
+    def discard(self, K: int):
+        """Discard the K oldest rows."""
+        if K > self._length:
+            raise Exception("Can't discard more rows than buffered.")
+        self._head = (self._head + K) % self.size
+        self._length -= K
+
+    def push(self, rows: np.ndarray):
+        """Append rows and discard as many of the oldest rows, i.e., slide
+        a full buffer forward.
+
+        Parameters
+        ----------
+        rows: `array_like`, shape=(K, width)
+            the rows to append.
+        """
+        self.discard(rows.shape[0])
+        self.append(rows)
@@ -7,6 +7,7 @@ from cbadc.digital_estimator._filter_coefficients import (
     FilterComputationBackend,
 )
 import cbadc.utilities
+from ._ring_buffer import _RingBuffer
 import numpy as np
 import sympy as sp
 import logging
@@ -218,6 +219,46 @@ class BatchEstimator(Iterator[np.ndarray]):
         """
         self.control_signal = control_signal_sequence
 
+    # the attributes constituting the dynamic state, see checkpoint().
+    _checkpoint_attributes = (
+        "_control_signal",
+        "_estimate",
+        "_control_signal_in_buffer",
+        "_mean",
+        "_estimate_pointer",
+        "_iteration",
+        "_stop_iteration",
+        "_filter_lag",
+    )
+
+    def checkpoint(self) -> dict:
+        """Snapshot the dynamic state of the estimator.
+
+        The snapshot contains the buffered control signals, estimates,
+        and filter states but neither the filter coefficients nor the
+        control signal iterator. An estimation is resumed by restoring
+        the snapshot into an estimator constructed with the same
+        parameters and setting the iterator to the remaining control
+        signals, see :py:func:`cbadc.digital_estimator.BatchEstimator.restore`.
+
+        Returns
+        -------
+        `dict`
+            a versioned snapshot.
+        """
+        return cbadc.utilities._checkpoint(self, self._checkpoint_attributes)
+
+    def restore(self, checkpoint: dict):
+        """Resume an estimation from a snapshot.
+
+        Parameters
+        ----------
+        checkpoint: `dict`
+            a snapshot as returned by
+            :py:func:`cbadc.digital_estimator.BatchEstimator.checkpoint`.
+        """
+        cbadc.utilities._restore(self, self._checkpoint_attributes, checkpoint)
+
     def _compute_filter_coefficients(
         self,
         analog_system: cbadc.analog_system.AnalogSystem,
@@ -253,49 +294,49 @@ class BatchEstimator(Iterator[np.ndarray]):
 
     def _allocate_memory_buffers(self):
         # Allocate memory buffers
-        self._control_signal = np.zeros((self.K3, self.analog_system.M), dtype=np.int8)
+        self._control_signal = _RingBuffer(self.K3, self.analog_system.M)
         self._estimate = np.zeros((self.K1, self.analog_system.L), dtype=np.double)
         self._control_signal_in_buffer = 0
         self._mean = np.zeros((self.K1 + 1, self.analog_system.N), dtype=np.double)
 
     def _compute_batch(self):
         logger.info("Computing batch.")
-        temp_forward_mean = np.zeros(self.analog_system.N, dtype=np.double)
         # check if ready to compute buffer
         if self._control_signal_in_buffer < self.K3:
             raise Exception("Control signal buffer not full")
+        # the control contributions of the whole buffer
+        control_signal = self._control_signal.view()
+        forward_inputs = np.dot(control_signal, self.Bf.transpose())
+        backward_inputs = np.dot(control_signal, self.Bb.transpose())
         # compute lookahead
         for k1 in range(self.K3 - 1, self.K1 - 1, -1):
-            temp = np.dot(self.Ab, self._mean[self.K1, :]) + np.dot(
-                self.Bb, self._control_signal[k1, :]
+            self._mean[self.K1, :] = (
+                np.dot(self.Ab, self._mean[self.K1, :]) + backward_inputs[k1, :]
             )
-            for n in range(self.analog_system.N):
-                self._mean[self.K1, n] = temp[n]
         # compute forward recursion
-        for k2 in range(self.K1):
-            temp = np.dot(self.Af, self._mean[k2, :]) + np.dot(
-                self.Bf, self._control_signal[k2, :]
+        for k2 in range(self.K1 - 1):
+            self._mean[k2 + 1, :] = (
+                np.dot(self.Af, self._mean[k2, :]) + forward_inputs[k2, :]
             )
-            if k2 < self.K1 - 1:
-                for n in range(self.analog_system.N):
-                    self._mean[k2 + 1, n] = temp[n]
-            else:
-                for n in range(self.analog_system.N):
-                    temp_forward_mean[n] = temp[n]
+        temp_forward_mean = (
+            np.dot(self.Af, self._mean[self.K1 - 1, :]) + forward_inputs[self.K1 - 1, :]
+        )
         # compute backward recursion and estimate
+        backward_mean = np.zeros_like(self._mean)
+        backward_mean[self.K1, :] = self._mean[self.K1, :]
         for k3 in range(self.K1 - 1, -1, -1):
-            temp = np.dot(self.Ab, self._mean[k3 + 1, :]) + np.dot(
-                self.Bb, self._control_signal[k3, :]
+            backward_mean[k3, :] = (
+                np.dot(self.Ab, backward_mean[k3 + 1, :]) + backward_inputs[k3, :]
             )
-            temp_estimate = np.dot(self.WT, temp - self._mean[k3, :])
-            self._estimate[k3, :] = temp_estimate[:]
-            self._mean[k3, :] = temp[:]
+        self._estimate[:, :] = np.dot(
+            backward_mean[: self.K1, :] - self._mean[: self.K1, :],
+            self.WT.transpose(),
+        )
         # reset intital means
-        for n in range(self.analog_system.N):
-            self._mean[0, n] = temp_forward_mean[n]
-            self._mean[self.K1, n] = 0
-        # rotate buffer to make place for new control signals
-        self._control_signal = np.roll(self._control_signal, -self.K1, axis=0)
+        self._mean[0, :] = temp_forward_mean
+        self._mean[self.K1, :] = 0
+        # make place for new control signals
+        self._control_signal.discard(self.K1)
         self._control_signal_in_buffer -= self.K1
 
     def _input(self, s: np.ndarray) -> bool:
@@ -304,13 +345,63 @@ class BatchEstimator(Iterator[np.ndarray]):
                 """Input buffer full. You must compute batch before adding
                 more control signals"""
             )
-        for m in range(self.analog_system.M):
-            self._control_signal[self._control_signal_in_buffer, :] = np.asarray(
-                2 * s - 1, dtype=np.int8
-            )
+        self._control_signal.append(np.asarray(2 * s - 1, dtype=np.int8)[None, :])
         self._control_signal_in_buffer += 1
         return self._control_signal_in_buffer > (self.K3 - 1)
 
+    def _input_block(self, s: np.ndarray) -> int:
+        """Fill the control signal buffer from the start of a sequence of
+        control signals and return the number of control signals added."""
+        size = min(s.shape[0], self.K3 - self._control_signal_in_buffer)
+        self._control_signal.append(np.asarray(2 * s[:size, :] - 1, dtype=np.int8))
+        self._control_signal_in_buffer += size
+        return size
+
+    def estimate(self, control_signals: np.ndarray, out: np.ndarray = None):
+        """Estimate from an array of control signals.
+
+        The control signals are processed in batches of K1 samples and
+        continue the estimation of previous calls, i.e., control signals
+        not yet completing a batch are kept in the buffer for the next
+        call. Consequently, each call returns the estimates of the
+        batches completed, preceded by estimates buffered but not yet
+        returned by :py:func:`next`.
+
+        Parameters
+        ----------
+        control_signals: `array_like`, shape=(K, M)
+            the control signals :math:`\mathbf{s}[k]`.
+        out: `array_like`, shape=(K + K1 - 1, L), `optional`
+            an array to store the estimates in.
+
+        Returns
+        -------
+        `array_like`, shape=(K', L)
+            the estimates :math:`\hat{\mathbf{u}}(k T)` computed.
+        """
+        control_signals = np.asarray(control_signals)
+        K = control_signals.shape[0]
+        pending = self.K1 - self._estimate_pointer
+        in_buffer = self._control_signal_in_buffer + K
+        batches = (in_buffer - self.K2) // self.K1 if in_buffer >= self.K3 else 0
+        size = pending + batches * self.K1
+        if out is None:
+            out = np.zeros((size, self.analog_system.L), dtype=np.double)
+        elif out.shape[0] < size:
+            raise Exception(f"out must be an array of length at least {size}")
+        out[:pending, :] = self._estimate[self._estimate_pointer :, :]
+        self._estimate_pointer = self.K1
+        index = pending
+        k = 0
+        while k < K:
+            k += self._input_block(control_signals[k:, :])
+            if self._control_signal_in_buffer == self.K3:
+                self._compute_batch()
+                out[index : index + self.K1, :] = self._estimate
+                index += self.K1
+        self._iteration += size
+        return out[:size]
+
     def __call__(self, control_signal_sequence: Iterator[np.ndarray]):
         return self.set_iterator(control_signal_sequence)
 
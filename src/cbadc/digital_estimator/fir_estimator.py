@@ -1,16 +1,28 @@
 """The digital FIR estimator"""
 from typing import Union
 import cbadc
+import enum
 import logging
 import os
 import scipy.integrate
+import scipy.fft
 import numpy as np
 from .batch_estimator import BatchEstimator
+from ._ring_buffer import _RingBuffer
 from ._filter_coefficients import FilterComputationBackend
 
 logger = logging.getLogger(__name__)
 
 
+class FIRFilterBackend(enum.Enum):
+    """The convolution used by :py:func:`cbadc.digital_estimator.FIRFilter.estimate`."""
+
+    auto = 0
+    direct = 1
+    fft = 2
+    lookup_table = 3
+
+
 class FIRFilter(BatchEstimator):
     """FIR filter implementation of the digital estimator.
 
@@ -107,6 +119,8 @@ class FIRFilter(BatchEstimator):
         an input estimate sample :math:`\hat{\mathbf{u}}(t)`
     """
 
+    _checkpoint_attributes = ("_control_signal_valued", "_iteration", "_filter_lag")
+
     def __init__(
         self,
         analog_system: cbadc.analog_system.AnalogSystem,
@@ -181,30 +195,295 @@ class FIRFilter(BatchEstimator):
             self.h = np.zeros(
                 (self.analog_system.L, self.K3, self.analog_system.M), dtype=np.double
             )
+        # The recursions propagate the (L, N) rows W^T A^k, instead of the
+        # (N, M) columns A^k B, as typically L < M.
         # Compute lookback.
-        temp1 = np.copy(self.Bf)
+        temp1 = np.copy(self.WT)
         for k1 in range(self.K1 - 1, -1, -1):
             if self.fixed_point:
-                self.h[:, k1, :] = self.__float_to_fixed(-np.dot(self.WT, temp1))
+                self.h[:, k1, :] = self.__float_to_fixed(-np.dot(temp1, self.Bf))
             else:
-                self.h[:, k1, :] = -np.dot(self.WT, temp1)
-            temp1 = np.dot(self.Af, temp1)
+                self.h[:, k1, :] = -np.dot(temp1, self.Bf)
+            temp1 = np.dot(temp1, self.Af)
 
         # Compute lookahead.
-        temp2 = np.copy(self.Bb)
+        temp2 = np.copy(self.WT)
         for k2 in range(self.K1, self.K3):
             if self.fixed_point:
-                self.h[:, k2, :] = self.__float_to_fixed(np.dot(self.WT, temp2))
+                self.h[:, k2, :] = self.__float_to_fixed(np.dot(temp2, self.Bb))
             else:
-                self.h[:, k2, :] = np.dot(self.WT, temp2)
-            temp2 = np.dot(self.Ab, temp2)
-        self._control_signal_valued = np.zeros(
-            (self.K3, self.analog_system.M), dtype=np.int8
+                self.h[:, k2, :] = np.dot(temp2, self.Bb)
+            temp2 = np.dot(temp2, self.Ab)
+        self._control_signal_valued = _RingBuffer(
+            self.K3, self.analog_system.M, full=True
         )
 
     def __iter__(self):
         return self
 
+    def estimate(
+        self,
+        control_signals: np.ndarray,
+        out: np.ndarray = None,
+        backend: FIRFilterBackend = FIRFilterBackend.auto,
+        workers: int = None,
+        packed: bool = False,
+    ):
+        """Estimate from an array of control signals.
+
+        Computes the same estimates as repeatedly calling :py:func:`next`
+        and continues the estimation of previous calls. The estimates are
+        either computed by the direct form, i.e., by accumulating the
+        contributions of each filter tap for all estimates at once, by
+        an overlap-save FFT convolution, or by table lookups, see
+        :py:func:`cbadc.digital_estimator.FIRFilter.lookup_table`.
+        By default, the backend with the lowest estimated number of
+        operations is used, which is typically the FFT convolution for
+        filters with more than a few hundred taps.
+
+        Parameters
+        ----------
+        control_signals: `array_like`, shape=(K, M) or shape=(K,) if packed
+            the control signals :math:`\mathbf{s}[k]`, where K must be a
+            multiple of downsample.
+        out: `array_like`, shape=(K // downsample, L), `optional`
+            an array to store the estimates in.
+        backend: :py:class:`cbadc.digital_estimator.FIRFilterBackend`, `optional`
+            the convolution backend, defaults to automatic selection.
+        workers: `int`, `optional`
+            number of threads used by :py:func:`scipy.fft.rfft`, defaults to
+            a single thread.
+        packed: `bool`, `optional`
+            the control signals are packed into integer words as by
+            :py:func:`cbadc.utilities.pack_control_signals`, or equivalently
+            :py:func:`cbadc.utilities.control_signal_2_byte_stream`, defaults
+            to False.
+
+        Returns
+        -------
+        `array_like`, shape=(K // downsample, L)
+            the estimates :math:`\hat{\mathbf{u}}(k T)`.
+        """
+        control_signals = np.asarray(control_signals)
+        K = control_signals.shape[0]
+        if K % self.downsample != 0:
+            raise Exception(
+                f"The number of control signals must be a multiple of downsample={self.downsample}."
+            )
+        size = K // self.downsample
+        if out is None:
+            out = np.zeros((size, self.analog_system.L), dtype=np.double)
+        elif out.shape[0] != size:
+            raise Exception(f"out must be an array of length {size}")
+        if size == 0:
+            return out
+        if backend == FIRFilterBackend.auto:
+            backend = self._select_backend(K)
+        window = self._control_signal_valued.view()
+        if backend == FIRFilterBackend.lookup_table:
+            # the table indices are computed from the (packed) control
+            # signals, only the new filter window is unpacked.
+            result = self._lookup_table_convolution(window, control_signals, packed)
+            valued = self._valued(control_signals[-self.K3 :], packed)
+        else:
+            valued = self._valued(control_signals, packed)
+            # the filter window followed by the new control signals
+            x = np.vstack((window, valued))
+            if backend == FIRFilterBackend.fft:
+                if self.fixed_point:
+                    raise Exception("The FFT backend does not support fixed point.")
+                result = self._fft_convolution(x, workers)
+            else:
+                result = self._direct_convolution(x)
+        self._control_signal_valued.push(valued[-self.K3 :, :])
+        self._iteration += K
+        result = result + self.offset
+        if self.fixed_point:
+            result = self.__fixed_to_float(result)
+        out[:, :] = result
+        return out
+
+    def _select_backend(self, K: int) -> FIRFilterBackend:
+        """Select the backend with the lowest estimated number of
+        operations for K control signals."""
+        L = self.analog_system.L
+        M = self.analog_system.M
+        size = K // self.downsample
+        costs = {
+            FIRFilterBackend.direct: self.K3 * M * L * size,
+            # a table lookup costs about four multiply-adds, in addition
+            # the table indices are computed for each control signal.
+            FIRFilterBackend.lookup_table: 4 * -(-self.K3 // 8) * M * L * size
+            + 8 * M * K,
+        }
+        if not self.fixed_point:
+            fft_size = self._fft_size(K)
+            outputs_per_block = fft_size - self.K3 + 1
+            blocks = -(-K // outputs_per_block)
+            costs[FIRFilterBackend.fft] = (
+                blocks * fft_size * ((M + L) * 2.5 * np.log2(fft_size) + 2 * M * L)
+            )
+        return min(costs, key=costs.get)
+
+    def _valued(self, control_signals: np.ndarray, packed: bool) -> np.ndarray:
+        """Unpack control signals into the values :math:`2 \mathbf{s}[k] - 1`."""
+        if packed:
+            bits = np.bitwise_and(
+                np.right_shift(
+                    control_signals.astype(np.int64)[:, None],
+                    np.arange(self.analog_system.M),
+                ),
+                1,
+            ).astype(np.int8)
+        else:
+            bits = np.asarray(control_signals > 0, dtype=np.int8)
+        return 2 * bits - 1
+
+    def _direct_convolution(self, x: np.ndarray) -> np.ndarray:
+        D = self.downsample
+        size = (x.shape[0] - self.K3) // D
+        result = np.zeros((size, self.analog_system.L), dtype=self.h.dtype)
+        for k in range(self.K3):
+            result += np.dot(
+                x[D + k : D + k + size * D : D, :], self.h[:, k, :].transpose()
+            )
+        return result
+
+    def lookup_table(self) -> np.ndarray:
+        """Return the lookup table of the lookup table backend.
+
+        The filter taps of each control are grouped into G groups of 8
+        consecutive taps, where the first group is zero padded to
+        :math:`8 G \geq K_3` taps. For each group, the table contains the
+        256 partial sums
+
+        :math:`\sum_{b=0}^{7} h_{\ell, m}[8 g + b] \left(2 s_b - 1\right)`
+
+        where the byte :math:`\sum_{b=0}^{7} s_b 2^b` represents the
+        control signals of the group. Each estimate is, therefore, the sum of
+        :math:`M G` table entries instead of the :math:`M K_3` products of
+        the direct form. For fixed point filters, the table contains the
+        fixed point partial sums.
+
+        Returns
+        -------
+        `array_like`, shape=(M, G, 256, L)
+            the lookup table.
+        """
+        if getattr(self, "_lookup_table", None) is None:
+            L = self.analog_system.L
+            M = self.analog_system.M
+            groups = -(-self.K3 // 8)
+            h = np.zeros((L, 8 * groups, M), dtype=self.h.dtype)
+            h[:, 8 * groups - self.K3 :, :] = self.h
+            signs = 2 * ((np.arange(256)[:, None] >> np.arange(8)) & 1) - 1
+            self._lookup_table = np.ascontiguousarray(
+                np.einsum("lgbm,ib->mgil", h.reshape((L, groups, 8, M)), signs).astype(
+                    self.h.dtype
+                )
+            )
+        return self._lookup_table
+
+    def _lookup_table_convolution(
+        self, window: np.ndarray, control_signals: np.ndarray, packed: bool
+    ) -> np.ndarray:
+        """Convolve the filter window and the, possibly packed, control
+        signals by table lookups.
+
+        The table indices, i.e., the bytes of each group of 8 consecutive
+        control signals, are computed one control at a time, directly from
+        the bits of the packed words if packed.
+        """
+        D = self.downsample
+        K = control_signals.shape[0]
+        size = K // D
+        table = self.lookup_table()
+        groups = table.shape[1]
+        padding = 8 * groups - self.K3
+        # the bits of a control for the zero padded filter window followed
+        # by the control signals
+        bits = np.zeros(padding + self.K3 + K, dtype=np.uint16)
+        index = np.zeros(bits.size - 7, dtype=np.uint16)
+        result = np.zeros((size, self.analog_system.L), dtype=self.h.dtype)
+        for m in range(self.analog_system.M):
+            bits[padding : padding + self.K3] = window[:, m] > 0
+            if packed:
+                bits[padding + self.K3 :] = np.bitwise_and(
+                    np.right_shift(control_signals, m), 1
+                )
+            else:
+                bits[padding + self.K3 :] = control_signals[:, m] > 0
+            index[:] = bits[: index.size]
+            for b in range(1, 8):
+                index |= bits[b : b + index.size] << b
+            for g in range(groups):
+                result += table[m, g][index[D + 8 * g : D + 8 * g + size * D : D]]
+        # the initial filter window is zero valued, which the
+        # bits represent as -1.
+        zero = window == 0
+        if zero.any():
+            affected = min(size, self.K3 // D)
+            result[:affected, :] += self._direct_convolution(
+                np.vstack(
+                    (
+                        zero.astype(np.int8),
+                        np.zeros((affected * D, window.shape[1]), dtype=np.int8),
+                    )
+                )
+            )
+        return result
+
+    def _fft_size(self, K: int) -> int:
+        return scipy.fft.next_fast_len(min(8 * self.K3, K + self.K3), real=True)
+
+    def _fft_convolution(self, x: np.ndarray, workers: int = None) -> np.ndarray:
+        """Overlap-save convolution of the filter window and the
+        control signals x."""
+        K = x.shape[0] - self.K3
+        D = self.downsample
+        fft_size = self._fft_size(K)
+        if getattr(self, "_h_fft_size", None) != fft_size:
+            # the transfer functions of the time-reversed filter taps
+            self._h_fft = scipy.fft.rfft(
+                self.h[:, ::-1, :], n=fft_size, axis=1, workers=workers
+            )
+            self._h_fft_size = fft_size
+        outputs_per_block = fft_size - self.K3 + 1
+        # the estimate following control signal i is the i-th output
+        # of the correlation of x and h.
+        correlation = np.zeros((K + 1, self.analog_system.L), dtype=np.double)
+        blocks = -(-(K + 1) // outputs_per_block)
+        x = np.vstack(
+            (
+                x,
+                np.zeros(
+                    (blocks * outputs_per_block + self.K3 - 1 - x.shape[0], x.shape[1]),
+                    dtype=x.dtype,
+                ),
+            )
+        )
+        # transform blocks of at most 2^22 elements at a time
+        max_blocks = max(1, (1 << 22) // (fft_size * self.analog_system.M))
+        for first in range(0, blocks, max_blocks):
+            last = min(blocks, first + max_blocks)
+            segments = np.lib.stride_tricks.sliding_window_view(
+                x[first * outputs_per_block :, :], fft_size, axis=0
+            )[: (last - first) * outputs_per_block : outputs_per_block]
+            # segments.shape -> (blocks, M, fft_size)
+            X = scipy.fft.rfft(segments, axis=2, workers=workers)
+            Y = np.einsum("bmf,lfm->blf", X, self._h_fft)
+            y = scipy.fft.irfft(Y, n=fft_size, axis=2, workers=workers)
+            # the valid, i.e., non-circular, part of each block
+            y = (
+                y[:, :, self.K3 - 1 :]
+                .transpose(0, 2, 1)
+                .reshape((-1, self.analog_system.L))
+            )
+            start = first * outputs_per_block
+            stop = min(K + 1, last * outputs_per_block)
+            correlation[start:stop, :] = y[: stop - start, :]
+        return correlation[D::D, :]
+
     # def _compute_filter_coefficients(
     #     self,
     #     analog_system: cbadc.analog_system.AnalogSystem,
@@ -571,11 +850,6 @@ class FIRFilter(BatchEstimator):
         if self.number_of_iterations and self.number_of_iterations < self._iteration:
             raise StopIteration
 
-        # Rotate control_signal vector
-        self._control_signal_valued = np.roll(
-            self._control_signal_valued, -self.downsample, axis=0
-        )
-
         # insert new control signal
         try:
             for index in range(self.downsample):
@@ -584,14 +858,15 @@ class FIRFilter(BatchEstimator):
             logger.warning("Estimator received Stop Iteration")
             raise StopIteration
 
-        self._control_signal_valued[
-            self.K3 - self.downsample :, :
-        ] = self._temp_controls
+        # slide the control_signal window
+        self._control_signal_valued.push(self._temp_controls)
 
-        # self._control_signal_valued.shape -> (K3, M)
+        # self._control_signal_valued.view().shape -> (K3, M)
         # self.h.shape -> (L, K3, M)
         res = (
-            np.tensordot(self.h, self._control_signal_valued, axes=((1, 2), (0, 1)))
+            np.tensordot(
+                self.h, self._control_signal_valued.view(), axes=((1, 2), (0, 1))
+            )
             + self.offset
         )
         if self.fixed_point:
@@ -669,6 +944,10 @@ class FIRFilter(BatchEstimator):
                     self.h[l, :, m] = temp[
                         (mid_point - half_length) : (mid_point + half_length)
                     ]
+        # invalidate the transfer functions of the FFT backend and the
+        # lookup table
+        self._h_fft_size = None
+        self._lookup_table = None
 
     def write_C_header(self, filename: str):
         """Write the FIR filter coefficients h into
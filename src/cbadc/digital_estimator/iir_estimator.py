@@ -3,6 +3,7 @@ import cbadc
 import logging
 import numpy as np
 from .batch_estimator import BatchEstimator
+from ._ring_buffer import _RingBuffer
 from ._filter_coefficients import FilterComputationBackend
 
 logger = logging.getLogger(__name__)
@@ -98,6 +99,13 @@ class IIRFilter(BatchEstimator):
 
     """
 
+    _checkpoint_attributes = (
+        "_control_signal_valued",
+        "_mean",
+        "_iteration",
+        "_filter_lag",
+    )
+
     def __init__(
         self,
         analog_system: cbadc.analog_system.AnalogSystem,
@@ -148,18 +156,75 @@ class IIRFilter(BatchEstimator):
             (self.analog_system.L, self.K2, self.analog_system.M), dtype=np.double
         )
         # Compute lookback
-        temp2 = np.copy(self.Bb)
+        temp2 = np.copy(self.WT)
         for k2 in range(self.K2):
-            self.h[:, k2, :] = np.dot(self.WT, temp2)
-            temp2 = np.dot(self.Ab, temp2)
-        self._control_signal_valued = np.zeros(
-            (self.K2, self.analog_system.M), dtype=np.int8
+            self.h[:, k2, :] = np.dot(temp2, self.Bb)
+            temp2 = np.dot(temp2, self.Ab)
+        self._control_signal_valued = _RingBuffer(
+            self.K2, self.analog_system.M, full=True
         )
         self._mean = np.zeros(self.analog_system.N, dtype=np.double)
 
     def __iter__(self):
         return self
 
+    def estimate(self, control_signals: np.ndarray, out: np.ndarray = None):
+        """Estimate from an array of control signals.
+
+        Computes the same estimates as repeatedly calling :py:func:`next`
+        and continues the estimation of previous calls. The lookahead
+        contributions of all estimates are accumulated per filter tap such
+        that only the recursion of :math:`\overrightarrow{\mathbf{m}}_k` is
+        computed sample by sample.
+
+        Parameters
+        ----------
+        control_signals: `array_like`, shape=(K, M)
+            the control signals :math:`\mathbf{s}[k]`.
+        out: `array_like`, shape=(K', L), `optional`
+            an array to store the estimates in, where K' is the number of
+            estimates, i.e., K // downsample if all previous calls consumed
+            multiples of downsample control signals.
+
+        Returns
+        -------
+        `array_like`, shape=(K', L)
+            the estimates :math:`\hat{\mathbf{u}}(k T)`.
+        """
+        control_signals = np.asarray(control_signals)
+        K = control_signals.shape[0]
+        # an estimate is returned for every downsample:th control signal
+        indices = np.arange((-self._iteration) % self.downsample, K, self.downsample)
+        if out is None:
+            out = np.zeros((indices.size, self.analog_system.L), dtype=np.double)
+        elif out.shape[0] != indices.size:
+            raise Exception(f"out must be an array of length {indices.size}")
+        if K == 0:
+            return out
+        # the filter window followed by the new control signals
+        x = np.vstack(
+            (
+                self._control_signal_valued.view(),
+                2 * np.asarray(control_signals > 0, dtype=np.int8) - 1,
+            )
+        )
+        self._control_signal_valued.push(x[x.shape[0] - self.K2 :, :])
+        self._iteration += K
+
+        forcing = np.dot(x[1 : K + 1, :], self.Bf.transpose())
+        means = np.zeros((K, self.analog_system.N), dtype=np.double)
+        mean = self._mean
+        for k in range(K):
+            means[k, :] = mean
+            mean = np.dot(self.Af, mean) + forcing[k, :]
+        self._mean = mean
+
+        result = -np.dot(means[indices, :], self.WT.transpose())
+        for k2 in range(self.K2):
+            result += np.dot(x[indices + 1 + k2, :], self.h[:, k2, :].transpose())
+        out[:, :] = result
+        return out
+
     def __next__(self) -> np.ndarray:
         # Check if control signal iterator is set.
         if self.control_signal is None:
@@ -170,9 +235,6 @@ class IIRFilter(BatchEstimator):
         if self.number_of_iterations and self.number_of_iterations < self._iteration:
             raise StopIteration
 
-        # Rotate control_signal vector
-        self._control_signal_valued = np.roll(self._control_signal_valued, -1, axis=0)
-
         # insert new control signal
         try:
             temp = self.control_signal.__next__()
@@ -180,17 +242,21 @@ class IIRFilter(BatchEstimator):
             logger.warning("Estimator received Stop Iteration")
             raise StopIteration
 
-        self._control_signal_valued[-1, :] = np.asarray(2 * temp - 1, dtype=np.int8)
+        # slide the control_signal window
+        self._control_signal_valued.push(
+            np.asarray(2 * temp - 1, dtype=np.int8)[None, :]
+        )
+        control_signal_valued = self._control_signal_valued.view()
 
-        # self._control_signal_valued.shape -> (K2, M)
+        # control_signal_valued.shape -> (K2, M)
         # self.h.shape -> (L, K2, M)
         result = -np.dot(self.WT, self._mean)
         self._mean = np.dot(self.Af, self._mean) + np.dot(
-            self.Bf, self._control_signal_valued[0, :]
+            self.Bf, control_signal_valued[0, :]
         )
         if ((self._iteration - 1) % self.downsample) == 0:
             return (
-                np.tensordot(self.h, self._control_signal_valued, axes=((1, 2), (0, 1)))
+                np.tensordot(self.h, control_signal_valued, axes=((1, 2), (0, 1)))
                 + result
             )
             # return np.einsum('ijk,jk', self.h, self._control_signal_valued) + result
@@ -5,6 +5,7 @@ import logging
 import scipy.linalg
 import scipy.integrate
 import numpy as np
+from ._ring_buffer import _RingBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -131,7 +132,7 @@ class NUVEstimator:
 
     def _allocate_memory_buffers(self):
         # Allocate memory buffers
-        self._control_signal = np.zeros((self.K3, self.analog_system.M), dtype=np.int8)
+        self._control_signal = _RingBuffer(self.K3, self.analog_system.M)
         self._estimate = np.zeros((self.K1, self.analog_system.L), dtype=np.double)
         self._control_signal_in_buffer = 0
         self._forward_mean = np.zeros((self.K3, self.analog_system.N), dtype=np.double)
@@ -179,6 +180,42 @@ class NUVEstimator:
         """
         self.control_signal = control_signal_sequence
 
+    # the attributes constituting the dynamic state, see checkpoint().
+    _checkpoint_attributes = (
+        "_control_signal",
+        "_estimate",
+        "_control_signal_in_buffer",
+        "_estimate_pointer",
+        "_stop_iteration",
+        "_forward_mean",
+        "_forward_CoVariance",
+        "_xi_tilde",
+        "_sigma_squared_1",
+        "_sigma_squared_2",
+    )
+
+    def checkpoint(self) -> dict:
+        """Snapshot the dynamic state of the estimator.
+
+        Returns
+        -------
+        `dict`
+            a versioned snapshot, see
+            :py:func:`cbadc.digital_estimator.NUVEstimator.restore`.
+        """
+        return cbadc.utilities._checkpoint(self, self._checkpoint_attributes)
+
+    def restore(self, checkpoint: dict):
+        """Resume an estimation from a snapshot.
+
+        Parameters
+        ----------
+        checkpoint: `dict`
+            a snapshot as returned by
+            :py:func:`cbadc.digital_estimator.NUVEstimator.checkpoint`.
+        """
+        cbadc.utilities._restore(self, self._checkpoint_attributes, checkpoint)
+
     def __call__(self, control_signal_sequence: Iterator[np.ndarray]):
         return self.set_iterator(control_signal_sequence)
 
@@ -232,10 +269,7 @@ class NUVEstimator:
                 """Input buffer full. You must compute batch before adding
                 more control signals"""
             )
-        for _ in range(self.analog_system.M):
-            self._control_signal[self._control_signal_in_buffer, :] = np.asarray(
-                2 * s - 1, dtype=np.int8
-            )
+        self._control_signal.append(np.asarray(2 * s - 1, dtype=np.int8)[None, :])
         self._control_signal_in_buffer += 1
         return self._control_signal_in_buffer > (self.K3 - 1)
 
@@ -333,13 +367,14 @@ class NUVEstimator:
         self._sigma_squared_1[0, :] = self._sigma_squared_1[self.K1 - 1, :]
         self._sigma_squared_2[0, :] = self._sigma_squared_2[self.K1 - 1, :]
 
-        # rotate buffer to make place for new control signals
-        self._control_signal = np.roll(self._control_signal, -self.K1, axis=0)
+        # make place for new control signals
+        self._control_signal.discard(self.K1)
         self._control_signal_in_buffer -= self.K1
 
     def _MBF(self):
         # Forward pass
         temp_K3 = self.K3 - 1
+        control_signal = self._control_signal.view()
         for k in range(self.K3):
             self._G[k, :, :] = np.linalg.inv(
                 self._y_CoVariance[k, :, :]
@@ -372,7 +407,7 @@ class NUVEstimator:
                             ),
                         ),
                     )
-                    + np.dot(self.Bf, self._control_signal[k, :])
+                    + np.dot(self.Bf, control_signal[k, :])
                 )
 
                 self._forward_CoVariance[k + 1, :, :] = (
@@ -3,6 +3,7 @@ import cbadc
 import numpy as np
 import logging
 from .batch_estimator import BatchEstimator
+from ._ring_buffer import _RingBuffer
 from ._filter_coefficients import FilterComputationBackend
 
 logger = logging.getLogger(__name__)
@@ -195,7 +196,7 @@ class ParallelEstimator(BatchEstimator):
 
     def _allocate_memory_buffers(self):
         # Allocate memory buffers
-        self._control_signal = np.zeros((self.K3, self.analog_system.M), dtype=np.int8)
+        self._control_signal = _RingBuffer(self.K3, self.analog_system.M)
         self._estimate = np.zeros((self.K1, self.analog_system.L), dtype=np.double)
         self._control_signal_in_buffer = 0
         self._mean = np.zeros((self.analog_system.N), dtype=np.complex128)
@@ -208,6 +209,7 @@ class ParallelEstimator(BatchEstimator):
             raise Exception("Control signal buffer not full")
 
         self._estimate = np.zeros((self.K1, self.analog_system.L), dtype=np.double)
+        control_signal = self._control_signal.view()
 
         for n in range(self.analog_system.N):
             mean = self._mean[n]
@@ -216,7 +218,7 @@ class ParallelEstimator(BatchEstimator):
                     self._estimate[k1, l] += np.real(self.forward_w[l, n] * mean)
                 mean = self.forward_a[n] * mean
                 for m in range(self.analog_system.M):
-                    if self._control_signal[k1, m]:
+                    if control_signal[k1, m]:
                         mean += self.forward_b[n, m]
                     else:
                         mean -= self.forward_b[n, m]
@@ -225,14 +227,14 @@ class ParallelEstimator(BatchEstimator):
             for k3 in range(self.K3 - 1, -1, -1):
                 mean = self.backward_a[n] * mean
                 for m in range(self.analog_system.M):
-                    if self._control_signal[k3, m]:
+                    if control_signal[k3, m]:
                         mean += self.backward_b[n, m]
                     else:
                         mean -= self.backward_b[n, m]
                 if k3 < self.K1:
                     for l in range(self.analog_system.L):
                         self._estimate[k3, l] += np.real(self.backward_w[l, n] * mean)
-        self._control_signal = np.roll(self._control_signal, -self.K1, axis=0)
+        self._control_signal.discard(self.K1)
         self._control_signal_in_buffer -= self.K1
 
     def _input(self, s: np.ndarray) -> bool:
@@ -240,12 +242,16 @@ class ParallelEstimator(BatchEstimator):
             raise Exception(
                 "Input buffer full. You must compute batch before adding more control signals"
             )
-        self._control_signal[self._control_signal_in_buffer, :] = np.asarray(
-            s, dtype=np.int8
-        )
+        self._control_signal.append(np.asarray(s, dtype=np.int8)[None, :])
         self._control_signal_in_buffer += 1
         return self._control_signal_in_buffer > (self.K3 - 1)
 
+    def _input_block(self, s: np.ndarray) -> int:
+        size = min(s.shape[0], self.K3 - self._control_signal_in_buffer)
+        self._control_signal.append(np.asarray(s[:size, :], dtype=np.int8))
+        self._control_signal_in_buffer += size
+        return size
+
     def __iter__(self):
         return self
 
@@ -0,0 +1,253 @@
+"""Segment-parallel estimation of long control signal records."""
+import copy
+import logging
+import math
+import multiprocessing
+import numpy as np
+from typing import Tuple
+from .batch_estimator import BatchEstimator
+from .fir_estimator import FIRFilter
+from .iir_estimator import IIRFilter
+
+logger = logging.getLogger(__name__)
+
+# The estimator template shared by all segments of a worker process.
+_template = None
+
+
+def _initialize_worker(template):
+    global _template
+    _template = template
+
+
+def _estimate_segment(task: Tuple[int, int, np.ndarray]) -> np.ndarray:
+    skip, size, control_signals = task
+    estimator = copy.deepcopy(
+        _template,
+        {
+            id(_template.analog_system): _template.analog_system,
+            id(_template.digital_control): _template.digital_control,
+        },
+    )
+    return estimator.estimate(control_signals)[skip : skip + size]
+
+
+class SegmentedEstimator:
+    """Estimate long control signal records segment by segment in parallel.
+
+    The forward recursion of the estimators carries state across batches.
+    However, as :math:`\mathbf{A}_f` is stable, the forward mean forgets its
+    initial condition exponentially fast. Therefore, a record is split into
+    segments that are estimated independently, on a process pool, by copies
+    of an estimator. Each segment is preceded by the control signals required
+    to warm up the estimator, whose estimates are discarded, and followed by
+    the lookahead required to complete its last estimate. The segment
+    estimates are then stitched together.
+
+    The control signals preceding a segment and the lookahead depend on the
+    estimator:
+
+    - :py:class:`cbadc.digital_estimator.BatchEstimator` and
+      :py:class:`cbadc.digital_estimator.ParallelEstimator` segments start at
+      multiples of the batch size K1 such that the batches, and thereby the
+      backward recursions, coincide with those of sequential processing. Each
+      segment is preceded by warm_up control signals and followed by the K3
+      control signals completing its last batch.
+    - :py:class:`cbadc.digital_estimator.FIRFilter` segments are preceded by
+      the K3 - downsample control signals of the filter window of their
+      first estimate and need no warm up. Consequently, the estimates are
+      the same as those of sequential processing.
+    - :py:class:`cbadc.digital_estimator.IIRFilter` segments are preceded by
+      the K2 control signals of the filter window of their first estimate and
+      warm_up control signals for the forward recursion.
+
+    Segments are given in estimates, i.e., control signals divided by the
+    downsampling factor, and start at multiples of downsample such that the
+    estimates coincide with those of sequential processing. Therefore, the
+    estimates only deviate due to the truncated forward recursion. This
+    deviation is reported by estimating a validation slice, following the
+    first segment boundary not preceded by the start of the record,
+    sequentially.
+
+    Parameters
+    ----------
+    estimator: :py:class:`cbadc.digital_estimator.BatchEstimator`
+        a :py:class:`cbadc.digital_estimator.BatchEstimator`,
+        :py:class:`cbadc.digital_estimator.ParallelEstimator`,
+        :py:class:`cbadc.digital_estimator.FIRFilter`, or
+        :py:class:`cbadc.digital_estimator.IIRFilter` in its initial state,
+        which is copied for each segment.
+    segment_size: `int`
+        the number of estimates per segment.
+    warm_up: `int`, `optional`
+        the number of control signals for the forward recursion preceding
+        each segment, defaults to the number of samples for the forward
+        state to decay by the factor tolerance, and to 0 for a
+        :py:class:`cbadc.digital_estimator.FIRFilter`.
+    processes: `int`, `optional`
+        number of worker processes, defaults to :py:func:`os.cpu_count`.
+        If set to 1, the segments are estimated in the calling process.
+    validation_size: `int`, `optional`
+        the number of estimates, following the first segment boundary with
+        a truncated forward recursion, compared with sequential processing,
+        defaults to 0, i.e., no validation.
+    tolerance: `float`, `optional`
+        the decay of the forward state determining the default warm_up,
+        defaults to 1e-12.
+
+    Attributes
+    ----------
+    deviation: `float`
+        the largest absolute deviation from sequential processing on the
+        validation slice of the last estimation, None without a validation
+        slice.
+    """
+
+    def __init__(
+        self,
+        estimator,
+        segment_size: int,
+        warm_up: int = None,
+        processes: int = None,
+        validation_size: int = 0,
+        tolerance: float = 1e-12,
+    ):
+        if segment_size < 1:
+            raise Exception("segment_size must be a positive integer.")
+        if validation_size < 0:
+            raise Exception("validation_size must be a non negative integer.")
+        if not isinstance(estimator, BatchEstimator):
+            raise Exception(
+                f"{type(estimator).__name__} does not support segmented estimation."
+            )
+        self.estimator = estimator
+        self.segment_size = segment_size
+        # the downsampling factor, the alignment of the segment starts, and
+        # the control signals required before the first and after the last
+        # control signal of a segment, excluding the warm up.
+        if isinstance(estimator, FIRFilter):
+            self._downsample = estimator.downsample
+            self._alignment = estimator.downsample
+            self._lookback = max(0, estimator.K3 - estimator.downsample)
+            self._lookahead = 0
+        elif isinstance(estimator, IIRFilter):
+            self._downsample = estimator.downsample
+            self._alignment = estimator.downsample
+            self._lookback = estimator.K2
+            self._lookahead = 0
+        else:
+            self._downsample = 1
+            self._alignment = estimator.K1
+            self._lookback = 0
+            self._lookahead = estimator.K3
+        if warm_up is None and isinstance(estimator, FIRFilter):
+            warm_up = 0
+        elif warm_up is None:
+            spectral_radius = np.max(np.abs(np.linalg.eigvals(estimator.Af)))
+            if spectral_radius >= 1:
+                raise Exception(
+                    "Af is not stable, the warm_up must be specified explicitly."
+                )
+            warm_up = (
+                0
+                if spectral_radius == 0
+                else int(math.ceil(np.log(tolerance) / np.log(spectral_radius)))
+            )
+            logger.info(f"Using a warm up of {warm_up} samples.")
+        if warm_up < 0:
+            raise Exception("warm_up must be a non negative integer.")
+        self.warm_up = warm_up
+        self.processes = processes if processes else multiprocessing.cpu_count()
+        self.validation_size = validation_size
+        self.deviation = None
+
+    def _task(self, control_signals: np.ndarray, start: int, stop: int):
+        """The task estimating the estimates [start, stop)."""
+        D = self._downsample
+        # the batches, or downsampled estimates, coincide with those of
+        # sequential processing
+        begin = (
+            max(0, start * D - self._lookback - self.warm_up)
+            // self._alignment
+            * self._alignment
+        )
+        end = min(control_signals.shape[0], stop * D + self._lookahead)
+        return ((start * D - begin) // D, stop - start, control_signals[begin:end, :])
+
+    def estimate(self, control_signals: np.ndarray, out: np.ndarray = None):
+        """Estimate a record of control signals.
+
+        Parameters
+        ----------
+        control_signals: `array_like`, shape=(K, M)
+            the control signals :math:`\mathbf{s}[k]`.
+        out: `array_like`, shape=(ceil(K / downsample), L), `optional`
+            an array to store the estimates in.
+
+        Returns
+        -------
+        `array_like`, shape=(K', L)
+            the estimates, i.e., the same estimates as a single call to
+            the estimate method of the estimator up to the deviation due to the truncated forward recursion.
+        """
+        control_signals = np.asarray(control_signals)
+        K = control_signals.shape[0]
+        if isinstance(self.estimator, FIRFilter) and K % self._downsample != 0:
+            raise Exception(
+                f"The number of control signals must be a multiple of downsample={self._downsample}."
+            )
+        # the number of estimates, at most, of sequential processing
+        size = -(-K // self._downsample)
+        starts = range(0, size, self.segment_size)
+        tasks = [
+            self._task(control_signals, start, min(size, start + self.segment_size))
+            for start in starts
+        ]
+        # the first segment boundary not preceded by the start of the record
+        validation_start = next(
+            (start for start, task in zip(starts, tasks) if task[0] < start), None
+        )
+        validate = self.validation_size > 0 and validation_start is not None
+        if validate:
+            # the sequential estimates up to the end of the validation slice
+            validation_stop = min(size, validation_start + self.validation_size)
+            tasks.append(self._task(control_signals, 0, validation_stop))
+        logger.info(f"Estimating {len(tasks)} segments.")
+        if self.processes == 1:
+            _initialize_worker(self.estimator)
+            results = [_estimate_segment(task) for task in tasks]
+        else:
+            with multiprocessing.Pool(
+                min(self.processes, len(tasks)),
+                initializer=_initialize_worker,
+                initargs=(self.estimator,),
+            ) as pool:
+                results = pool.map(_estimate_segment, tasks, 1)
+        if validate:
+            sequential = results.pop()
+        size = sum(result.shape[0] for result in results)
+        if out is None:
+            out = np.zeros((size, self.estimator.analog_system.L), dtype=np.double)
+        elif out.shape[0] < size:
+            raise Exception(f"out must be an array of length at least {size}")
+        index = 0
+        for result in results:
+            out[index : index + result.shape[0], :] = result
+            index += result.shape[0]
+        if validate:
+            stop = min(size, sequential.shape[0])
+            self.deviation = float(
+                np.max(
+                    np.abs(
+                        out[validation_start:stop, :]
+                        - sequential[validation_start:stop, :]
+                    ),
+                    initial=0.0,
+                )
+            )
+            logger.info(
+                f"Largest deviation from sequential estimation: {self.deviation:.2e}"
+            )
+        else:
+            self.deviation = None
+        return out[:size]
@@ -13,10 +13,20 @@ from typing import Union
 from .numerical_simulator import FullSimulator, PreComputedControlSignalsSimulator
 from .analytical_simulator import AnalyticalSimulator
 from .mp_simulator import MPSimulator
-from .utilities import extended_simulation_result
+from .modal_simulator import ModalSimulator
+from .switched_capacitor_simulator import SwitchedCapacitorSimulator
+from .ensemble_simulator import EnsembleSimulator
+from .utilities import extended_simulation_result, TrajectoryRecorder
+from .simulation_cache import SimulationCache, CachedSimulator
 from .wrapper import get_simulator, SimulatorType
+from .state_bounds import StateBounds, StateBoundsExceededError
 
 
 _valid_simulators = Union[
-    FullSimulator, PreComputedControlSignalsSimulator, AnalyticalSimulator, MPSimulator
+    FullSimulator,
+    PreComputedControlSignalsSimulator,
+    AnalyticalSimulator,
+    MPSimulator,
+    ModalSimulator,
+    SwitchedCapacitorSimulator,
 ]
@@ -2,7 +2,9 @@ import logging
 import cbadc.analog_system
 import cbadc.digital_control
 import cbadc.analog_signal
+import cbadc.utilities
 import numpy as np
+from ._statistics import _SimulatorStatistics
 import math
 from typing import Iterator, List
 
@@ -44,6 +46,8 @@ class _BaseSimulator(Iterator[np.ndarray]):
         end time at which the generator raises :py:class:`StopIteration`.
     initial_state_vector: `array_like`
         the initial state of the simulator.
+    state_bounds: :py:class:`cbadc.simulator.state_bounds.StateBounds`
+        if set, monitors every simulated state vector, defaults to None.
 
     Yields
     ------
@@ -126,13 +130,283 @@ class _BaseSimulator(Iterator[np.ndarray]):
         """
         return self.analog_system.signal_observation(self.state_vector())
 
+    # the attributes constituting the dynamic state, see checkpoint().
+    _checkpoint_attributes = ("t", "_state_vector")
+
+    state_bounds = None
+
+    def _monitor_state_bounds(self):
+        """Pass the current state vector to the state bounds monitor."""
+        self.state_bounds.monitor(
+            self.t, np.array(self.state_vector(), dtype=np.double).flatten()
+        )
+
+    def checkpoint(self) -> dict:
+        """Snapshot the dynamic state of the simulation.
+
+        The snapshot contains the simulation time, the state vector, and
+        the state of the digital control. Precomputed matrices and the
+        input signals are not included; instead, a simulation is resumed
+        by restoring the snapshot into a simulator constructed with the
+        same parameters, see
+        :py:func:`cbadc.simulator._BaseSimulator.restore`. The snapshot
+        is picklable, e.g., by :py:func:`cbadc.utilities.pickle_dump`.
+
+        Returns
+        -------
+        `dict`
+            a versioned snapshot.
+        """
+        checkpoint = cbadc.utilities._checkpoint(self, self._checkpoint_attributes)
+        checkpoint["digital_control"] = self.digital_control.checkpoint()
+        return checkpoint
+
+    def restore(self, checkpoint: dict):
+        """Resume a simulation from a snapshot.
+
+        Continuing the simulation after restoring a snapshot results
+        in the same control signals as continuing the simulation from
+        which the snapshot was taken.
+
+        Parameters
+        ----------
+        checkpoint: `dict`
+            a snapshot as returned by
+            :py:func:`cbadc.simulator._BaseSimulator.checkpoint`.
+        """
+        if "digital_control" not in checkpoint:
+            raise Exception("Checkpoint is missing the digital control state.")
+        cbadc.utilities._restore(self, self._checkpoint_attributes, checkpoint)
+        self.digital_control.restore(checkpoint["digital_control"])
+
+    # the statistics collector, see enable_statistics().
+    _statistics = None
+
+    def enable_statistics(self, callback=None, interval: float = 1.0):
+        """Start collecting simulation statistics.
+
+        While enabled, the simulator counts the simulated samples and
+        accumulates the wall time spent simulating, integrating input
+        signals, updating the digital control, and, in between, transitioning
+        the state. Additionally, the number of :py:func:`scipy.integrate.solve_ivp`
+        calls, function evaluations (nfev), Jacobian evaluations (njev),
+        and events are counted. A simulator for which statistics are not
+        enabled only checks for them at these call sites.
+
+        Parameters
+        ----------
+        callback: `callable`, `optional`
+            called with the :py:func:`cbadc.simulator._BaseSimulator.stats`
+            dictionary at most once every interval seconds while simulating,
+            defaults to None.
+        interval: `float`, `optional`
+            the callback period [s], defaults to 1.0.
+        """
+        if self._statistics is not None:
+            self.disable_statistics()
+        self._statistics = _SimulatorStatistics(callback, interval)
+
+    def disable_statistics(self):
+        """Stop collecting simulation statistics.
+
+        Returns
+        -------
+        `dict`
+            the final statistics, see
+            :py:func:`cbadc.simulator._BaseSimulator.stats`.
+        """
+        stats = self.stats()
+        self._statistics = None
+        return stats
+
+    def stats(self) -> dict:
+        """Return the simulation statistics.
+
+        Returns
+        -------
+        `dict`
+            containing the number of simulated 'samples', the 'elapsed'
+            time [s] since the statistics were enabled, the
+            'simulation_time' [s] spent simulating, the throughput
+            'samples_per_second', the 'input_integration_time',
+            'state_transition_time', and 'control_update_time' [s], as
+            well as the 'ivp_calls', 'nfev', 'njev', and 'events' of
+            :py:func:`scipy.integrate.solve_ivp`.
+        """
+        if self._statistics is None:
+            raise Exception("Statistics are not enabled, see enable_statistics().")
+        return self._statistics.as_dict()
+
+    def _timed(self, attribute: str, function):
+        """Return function, accumulating its wall time in the statistics
+        attribute if statistics are enabled."""
+        if self._statistics is None:
+            return function
+        return self._statistics.timed(attribute, function)
+
+    def _control_update(self, t: float, s_tilde: np.ndarray):
+        """Update the digital control, timed if statistics are enabled."""
+        self._timed("control_update_time", self.digital_control.control_update)(
+            t, s_tilde
+        )
+
+    def simulate(
+        self,
+        n_samples: int,
+        out: np.ndarray = None,
+        packed: bool = False,
+        state_decimation: int = None,
+    ):
+        """Simulate a block of control signals.
+
+        Advances the simulator :math:`n` control periods, equivalently to
+        calling :py:func:`next` :math:`n` times, writing the control signals
+        into a (preallocated) array.
+
+        Parameters
+        ----------
+        n_samples: `int`
+            number of control signal samples :math:`n` to simulate.
+        out: `array_like`, `optional`
+            a preallocated output array of shape=(n_samples, M) and
+            dtype=numpy.int8 or, if packed, of shape=(n_samples,) and
+            with the dtype of :py:func:`cbadc.utilities.pack_control_signals`.
+        packed: `bool`, `optional`
+            if True, the control signals are bit-packed as in
+            :py:func:`cbadc.utilities.pack_control_signals`, defaults
+            to False.
+        state_decimation: `int`, `optional`
+            if set, also return the state vector :math:`\mathbf{x}(t)`
+            sampled at every state_decimation:th control signal, defaults
+            to None.
+
+        Returns
+        -------
+        `array_like`, shape=(n_samples, M) or shape=(n_samples,)
+            the control signals. In case the simulator reaches t_stop the
+            array is truncated.
+        `array_like`, shape=(ceil(n_samples / state_decimation), N)
+            the decimated state trajectory, only returned if
+            state_decimation is set.
+        """
+        M = self.digital_control.M
+        members = self._ensemble_shape
+        if packed:
+            dtype = np.dtype(
+                cbadc.utilities.number_of_bytes_selector(M)["format_marker"]
+            )
+            shape = (n_samples,) + members
+        else:
+            dtype = np.dtype(np.int8)
+            shape = (n_samples,) + members + (M,)
+        if out is None:
+            out = np.zeros(shape, dtype=dtype)
+        elif out.shape != shape or out.dtype != dtype:
+            raise Exception(f"out must be an array of shape={shape} and dtype={dtype}")
+        states = None
+        if state_decimation is not None:
+            if state_decimation < 1:
+                raise Exception("state_decimation must be a positive integer.")
+            states = np.zeros(
+                ((n_samples + state_decimation - 1) // state_decimation,)
+                + members
+                + (self.analog_system.N,),
+                dtype=np.double,
+            )
+
+        # simulate in blocks of at most _block_size samples such that the
+        # temporaries of _simulate_block are bounded.
+        block_size = min(max(n_samples, 1), self._block_size)
+        simulate_block = self._simulate_block
+        if self._statistics is not None:
+            statistics = self._statistics
+
+            def simulate_block(*args):
+                return statistics.step(
+                    self._simulate_block, *args, samples=lambda done: done
+                )
+
+        if packed:
+            block = np.zeros((block_size,) + members + (M,), dtype=np.int8)
+        index = 0
+        while index < n_samples:
+            size = min(n_samples - index, block_size)
+            if packed:
+                done = simulate_block(block[:size], index, states, state_decimation)
+                out[index : index + done] = cbadc.utilities.pack_control_signals(
+                    block[:done].reshape((-1, M))
+                ).reshape((done,) + members)
+            else:
+                done = simulate_block(
+                    out[index : index + size], index, states, state_decimation
+                )
+            index += done
+            if done < size:
+                break
+
+        if states is not None:
+            return (
+                out[:index],
+                states[: (index + state_decimation - 1) // state_decimation],
+            )
+        return out[:index]
+
+    _block_size = 1 << 14
+
+    # the leading dimensions of the control signals and states of an
+    # ensemble of simulations, see cbadc.simulator.EnsembleSimulator.
+    _ensemble_shape = ()
+
+    def _simulate_block(
+        self,
+        control_signals: np.ndarray,
+        index: int,
+        states: np.ndarray,
+        state_decimation: int,
+    ) -> int:
+        """Simulate control signals into a block
+
+        Parameters
+        ----------
+        control_signals: `array_like`, shape=(K, M), dtype=numpy.int8
+            the block to fill.
+        index: `int`
+            the sample index of the first control signal in the block.
+        states: `array_like`, shape=(., N)
+            the decimated state trajectory or None.
+        state_decimation: `int`
+            the state decimation.
+
+        Returns
+        -------
+        `int`
+            number of simulated samples which is less than K only if
+            the simulator stopped.
+        """
+        for k in range(control_signals.shape[0]):
+            try:
+                control_signals[k, :] = self.__next__()
+            except StopIteration:
+                return k
+            if states is not None and (index + k) % state_decimation == 0:
+                states[(index + k) // state_decimation, :] = np.array(
+                    self.state_vector(), dtype=np.double
+                ).flatten()
+        return control_signals.shape[0]
+
     def __iter__(self):
         """Use simulator as an iterator"""
         return self
 
     def __next__(self) -> np.ndarray:
         """Computes the next control signal :math:`\mathbf{s}[k]`"""
+        if self._statistics is not None:
+            return self._statistics.step(self._next)
+        return self._next()
 
+    def _next(self) -> np.ndarray:
+        """Advance the simulation one clock period and return the control
+        signal, implemented by the simulators."""
         raise NotImplementedError
 
     def __str__(self) -> str:
@@ -0,0 +1,112 @@
+"""Disk cache for simulator precomputations.
+
+Expensive precomputations, e.g., the extended precision propagators of
+:py:class:`cbadc.simulator.MPSimulator`, are pickled to a cache directory
+keyed by a hash of everything they depend on. The cache directory is
+either specified explicitly or by the environment variable
+:code:`CBADC_CACHE_DIR`. If neither is set, nothing is cached.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+_environment_variable = "CBADC_CACHE_DIR"
+
+
+def cache_directory(cache_dir: str = None):
+    """Resolve the cache directory.
+
+    Parameters
+    ----------
+    cache_dir: `str`, `optional`
+        an explicit cache directory, defaults to the environment
+        variable CBADC_CACHE_DIR.
+
+    Returns
+    -------
+    `str` or `None`
+        the cache directory or None if caching is disabled.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(_environment_variable)
+    return cache_dir if cache_dir else None
+
+
+def key(*parts) -> str:
+    """Hash the parts determining a cache entry.
+
+    Parameters
+    ----------
+    parts:
+        objects with a deterministic string representation.
+
+    Returns
+    -------
+    `str`
+        the cache key.
+    """
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def load(cache_dir: str, cache_key: str):
+    """Load a cache entry.
+
+    Parameters
+    ----------
+    cache_dir: `str`
+        the cache directory, or None to disable caching.
+    cache_key: `str`
+        the key as returned by :py:func:`cbadc.simulator._cache.key`.
+
+    Returns
+    -------
+    any
+        the cached value or None if there is no (valid) entry.
+    """
+    if cache_dir is None:
+        return None
+    filename = os.path.join(cache_dir, f"{cache_key}.pickle")
+    try:
+        with open(filename, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as error:
+        logger.warning(f"Ignoring unreadable cache entry {filename}: {error}")
+        return None
+    logger.info(f"Loaded cache entry {filename}.")
+    return value
+
+
+def store(cache_dir: str, cache_key: str, value):
+    """Store a cache entry.
+
+    The entry is written to a temporary file which is then atomically
+    renamed, such that concurrent processes never observe partial entries.
+
+    Parameters
+    ----------
+    cache_dir: `str`
+        the cache directory, or None to disable caching.
+    cache_key: `str`
+        the key as returned by :py:func:`cbadc.simulator._cache.key`.
+    value: any
+        a picklable value.
+    """
+    if cache_dir is None:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    filename = os.path.join(cache_dir, f"{cache_key}.pickle")
+    fd, temporary_filename = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=-1)
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        os.remove(temporary_filename)
+        raise
+    logger.info(f"Stored cache entry {filename}.")
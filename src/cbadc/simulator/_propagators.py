@@ -0,0 +1,831 @@
+"""Closed-form state propagators.
+
+This module collects the matrix exponential based propagators used by the
+simulators to advance the analog system exactly over an interval of length
+:math:`\\Delta t` whenever the driving signal has a finite dimensional linear
+generator (constants, ramps, sinusoidals, ...) or is interpolated from samples.
+"""
+import fractions
+import logging
+from typing import List, Union
+import numpy as np
+import scipy.linalg
+from mpmath import mp
+import cbadc.analog_signal
+
+logger = logging.getLogger(__name__)
+
+
+def _van_loan(A: np.ndarray, B: np.ndarray, S: np.ndarray, dt: float):
+    """Solve the augmented linear system
+
+    :math:`\\dot{\mathbf{x}}(t) = \mathbf{A} \mathbf{x}(t) + \mathbf{B} \mathbf{w}(t)`
+
+    :math:`\\dot{\mathbf{w}}(t) = \mathbf{S} \mathbf{w}(t)`
+
+    over :math:`[0, \\Delta t]` using a single matrix exponential.
+
+    Parameters
+    ----------
+    A: `array_like`, shape=(N, N)
+        the system matrix.
+    B: `array_like`, shape=(N, K)
+        the generator input matrix.
+    S: `array_like`, shape=(K, K)
+        the generator (exo-system) matrix.
+    dt: `float`
+        the time interval :math:`\\Delta t`.
+
+    Returns
+    -------
+    `array_like`, shape=(N, N)
+        the state transition :math:`\exp(\mathbf{A} \\Delta t)`.
+    `array_like`, shape=(N, K)
+        the state response at :math:`\\Delta t` for each unit initial
+        generator state and zero initial state.
+    """
+    N = A.shape[0]
+    K = S.shape[0]
+    augmented = np.zeros((N + K, N + K), dtype=np.double)
+    augmented[:N, :N] = A
+    augmented[:N, N:] = B
+    augmented[N:, N:] = S
+    res = scipy.linalg.expm(augmented * dt)
+    return res[:N, :N], res[:N, N:]
+
+
+def _discrete_noise_covariance(A: np.ndarray, Sigma: np.ndarray, dt: float):
+    """Compute the integrated process noise covariance
+
+    :math:`\mathbf{Q} = \int_0^{\Delta t} \exp\left(\mathbf{A} \tau\right) \mathbf{\Sigma} \exp\left(\mathbf{A}^\mathsf{T} \tau\right) \mathrm{d} \tau`
+
+    of the system :math:`\dot{\mathbf{x}}(t) = \mathbf{A} \mathbf{x}(t) + \mathbf{w}(t)`
+    driven by white noise with covariance :math:`\mathbf{\Sigma} \delta(\tau)`
+    using Van Loan's method.
+
+    Parameters
+    ----------
+    A: `array_like`, shape=(N, N)
+        the system matrix.
+    Sigma: `array_like`, shape=(N, N)
+        the (symmetric, positive semidefinite) noise covariance density.
+    dt: `float`
+        the time interval :math:`\Delta t`.
+
+    Returns
+    -------
+    `array_like`, shape=(N, N)
+        the covariance :math:`\mathbf{Q}`.
+    """
+    N = A.shape[0]
+    augmented = np.zeros((2 * N, 2 * N), dtype=np.double)
+    augmented[:N, :N] = -A
+    augmented[:N, N:] = Sigma
+    augmented[N:, N:] = A.transpose()
+    res = scipy.linalg.expm(augmented * dt)
+    Q = np.dot(res[N:, N:].transpose(), res[:N, N:])
+    # symmetrize round-off errors
+    return (Q + Q.transpose()) / 2.0
+
+
+def _covariance_factor(Q: np.ndarray):
+    """Factor a covariance matrix as :math:`\mathbf{Q} = \mathbf{L} \mathbf{L}^\mathsf{T}`
+
+    using a Cholesky decomposition, or, for singular covariance matrices,
+    an eigenvalue decomposition with negative round-off eigenvalues
+    clipped.
+
+    Parameters
+    ----------
+    Q: `array_like`, shape=(N, N)
+        the covariance matrix.
+
+    Returns
+    -------
+    `array_like`, shape=(N, N)
+        the factor :math:`\mathbf{L}`.
+    """
+    try:
+        return np.linalg.cholesky(Q)
+    except np.linalg.LinAlgError:
+        logger.info("Singular noise covariance, factoring by eigenvalue decomposition.")
+        eigenvalues, eigenvectors = np.linalg.eigh(Q)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def _spawn_seeds(seed, n: int):
+    """Derive independent child seed sequences.
+
+    The children equal those of :py:func:`numpy.random.SeedSequence.spawn`
+    of a fresh seed sequence, however, without advancing the (user's) seed
+    sequence such that the same seed always results in the same children.
+
+    Parameters
+    ----------
+    seed: `int` or :py:class:`numpy.random.SeedSequence`
+        the parent seed, None for fresh entropy.
+    n: `int`
+        the number of children.
+
+    Returns
+    -------
+    [:py:class:`numpy.random.SeedSequence`]
+        the children.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [
+        np.random.SeedSequence(
+            seed.entropy,
+            spawn_key=seed.spawn_key + (child,),
+            pool_size=seed.pool_size,
+        )
+        for child in range(n)
+    ]
+
+
+def _perturbation_generators(seed, noise: bool, jitter: bool):
+    """Create the counter-based (Philox) noise and jitter generators of a
+    simulation from the children of its seed.
+
+    Parameters
+    ----------
+    seed: `int` or :py:class:`numpy.random.SeedSequence`
+        the seed of the simulation, None for fresh entropy.
+    noise: `bool`
+        create the noise generator.
+    jitter: `bool`
+        create the jitter generator.
+
+    Returns
+    -------
+    :py:class:`numpy.random.Generator`
+        the noise generator or None.
+    :py:class:`numpy.random.Generator`
+        the jitter generator or None.
+    """
+    noise_seed, jitter_seed = _spawn_seeds(seed, 2)
+    return (
+        np.random.Generator(np.random.Philox(noise_seed)) if noise else None,
+        np.random.Generator(np.random.Philox(jitter_seed)) if jitter else None,
+    )
+
+
+def _noise_factor(A: np.ndarray, noise_covariance: np.ndarray, dt: float):
+    """Factor the integrated noise covariance of a clock period.
+
+    Parameters
+    ----------
+    A: `array_like`, shape=(N, N)
+        the system matrix.
+    noise_covariance: `array_like`, shape=(N, N)
+        the noise covariance density.
+    dt: `float`
+        the clock period.
+
+    Returns
+    -------
+    `array_like`, shape=(N, N)
+        the factor :math:`\mathbf{L}` of the covariance of
+        :py:func:`_discrete_noise_covariance`.
+    """
+    noise_covariance = np.array(noise_covariance, dtype=np.double)
+    if noise_covariance.shape != A.shape:
+        raise Exception("noise_covariance must be of shape=(N, N).")
+    return _covariance_factor(_discrete_noise_covariance(A, noise_covariance, dt))
+
+
+def _dac_end_matrix(Gamma: np.ndarray, digital_control, T: float):
+    """Compute the DAC contribution :math:`\mathbf{\Gamma} \mathbf{d}(T)` to
+    the state derivative at the end of a clock period.
+
+    Parameters
+    ----------
+    Gamma: `array_like`, shape=(N, M)
+        the control input matrix.
+    digital_control: :py:class:`cbadc.digital_control.DigitalControl`
+        the digital control.
+    T: `float`
+        the clock period.
+
+    Returns
+    -------
+    `array_like`, shape=(N, M)
+        the DAC contribution.
+    """
+    dac_end = np.array(
+        [digital_control.impulse_response(m, T)[m] for m in range(digital_control.M)]
+    )
+    return np.asarray(Gamma) * dac_end
+
+
+def _evaluate_inputs(input_signals: List, t: np.ndarray) -> np.ndarray:
+    """Evaluate input signals on a time grid.
+
+    Parameters
+    ----------
+    input_signals: [:py:class:`cbadc.analog_signal._AnalogSignal`]
+        the L input signals.
+    t: `array_like`, shape=(K,)
+        the time grid.
+
+    Returns
+    -------
+    `array_like`, shape=(K, L)
+        the input signal values.
+    """
+    K = t.size
+    inputs = np.zeros((K, len(input_signals)), dtype=np.double)
+    for l, signal in enumerate(input_signals):
+        try:
+            # most signals evaluate element-wise on arrays
+            inputs[:, l] = np.broadcast_to(
+                np.asarray(signal.evaluate(t), dtype=np.double), (K,)
+            )
+        except (TypeError, ValueError):
+            inputs[:, l] = [signal.evaluate(t_k) for t_k in t]
+    return inputs
+
+
+def _draw_perturbations(
+    t: np.ndarray,
+    input_signals: List[List],
+    B: np.ndarray,
+    noise_generators: List,
+    noise_factor: np.ndarray,
+    jitter_generators: List,
+    jitter_std: float,
+    jitter_last: np.ndarray,
+):
+    """Draw the noise and jitter perturbations of P independently perturbed
+    simulations for a sequence of clock periods.
+
+    Parameters
+    ----------
+    t: `array_like`, shape=(K + 1,)
+        the clock period boundaries.
+    input_signals: [[:py:class:`cbadc.analog_signal._AnalogSignal`]]
+        the L input signals of each simulation.
+    B: `array_like`, shape=(N, L)
+        the input matrix.
+    noise_generators: [:py:class:`numpy.random.Generator`]
+        the noise generator of each simulation, or None for no noise.
+    noise_factor: `array_like`, shape=(N, N)
+        the factor of the integrated noise covariance, see
+        :py:func:`_noise_factor`.
+    jitter_generators: [:py:class:`numpy.random.Generator`]
+        the jitter generator of each simulation, or None for no jitter.
+    jitter_std: `float`
+        the standard deviation of the sampling clock jitter.
+    jitter_last: `array_like`, shape=(P,)
+        the sampling time perturbations of the preceding clock period.
+
+    Returns
+    -------
+    `array_like`, shape=(K, P, N)
+        the state noise or None.
+    `array_like`, shape=(K, P)
+        the sampling time perturbations :math:`\delta_{k} - \delta_{k-1}`
+        or None.
+    `array_like`, shape=(K, P, N)
+        the input signal contribution to the jitter perturbation or None.
+    `array_like`, shape=(P,)
+        the sampling time perturbations of the last clock period.
+    """
+    K = t.size - 1
+    noise = None
+    if noise_generators is not None:
+        noise = np.dot(
+            np.stack(
+                [
+                    generator.standard_normal((K, noise_factor.shape[0]))
+                    for generator in noise_generators
+                ],
+                axis=1,
+            ),
+            noise_factor.transpose(),
+        )
+    if jitter_generators is None:
+        return noise, None, None, jitter_last
+    delta = np.vstack(
+        (
+            jitter_last,
+            jitter_std
+            * np.stack(
+                [generator.standard_normal(K) for generator in jitter_generators],
+                axis=1,
+            ),
+        )
+    )
+    jitter = np.diff(delta, axis=0)
+    inputs = np.stack(
+        [_evaluate_inputs(member, t[1:]) for member in input_signals], axis=1
+    )
+    jitter_inputs = jitter[:, :, None] * np.dot(inputs, np.asarray(B).transpose())
+    return noise, jitter, jitter_inputs, delta[-1, :]
+
+
+class _InputContribution:
+    """The input contribution of a single input signal
+
+    Specifically, evaluates
+
+    :math:`\int_{t}^{t + \\Delta t} \exp\\left(\mathbf{A} (t + \\Delta t - \\tau)\\right) \mathbf{b} u(\\tau) \mathrm{d} \\tau`
+
+    in closed form. The propagators are computed once per distinct
+    :math:`\\Delta t` and are thereafter reused.
+
+    Parameters
+    ----------
+    A: `array_like`, shape=(N, N)
+        the system matrix.
+    b: `array_like`, shape=(N,)
+        the input vector of the signal.
+    signal: :py:class:`cbadc.analog_signal._AnalogSignal`
+        the input signal.
+    """
+
+    def __init__(self, A: np.ndarray, b: np.ndarray, signal):
+        self.A = np.array(A, dtype=np.double)
+        self.b = np.array(b, dtype=np.double).reshape((self.A.shape[0], 1))
+        self.signal = signal
+        self._propagators = {}
+
+    def _propagator(self, dt: float) -> np.ndarray:
+        if dt not in self._propagators:
+            self._propagators[dt] = self._compute_propagator(dt)
+        return self._propagators[dt]
+
+    def _compute_propagator(self, dt: float) -> np.ndarray:
+        raise NotImplementedError
+
+    def __call__(self, t: float, dt: float) -> np.ndarray:
+        """Compute the contribution over the interval :math:`[t, t + \\Delta t]`
+
+        Parameters
+        ----------
+        t: `float`
+            start of interval.
+        dt: `float`
+            length of interval.
+
+        Returns
+        -------
+        `array_like`, shape=(N,)
+            the resulting state contribution.
+        """
+        return self.block(np.array([t]), dt)[0, :]
+
+    def block(self, t: np.ndarray, dt: float) -> np.ndarray:
+        """Compute the contribution for a sequence of intervals
+        :math:`[t_k, t_k + \\Delta t]`.
+
+        Parameters
+        ----------
+        t: `array_like`, shape=(K,)
+            start of intervals.
+        dt: `float`
+            length of intervals.
+
+        Returns
+        -------
+        `array_like`, shape=(K, N)
+            the resulting state contributions.
+        """
+        raise NotImplementedError
+
+
+class _ConstantContribution(_InputContribution):
+    def _compute_propagator(self, dt: float) -> np.ndarray:
+        _, res = _van_loan(self.A, self.b, np.zeros((1, 1)), dt)
+        return res[:, 0]
+
+    def block(self, t: np.ndarray, dt: float) -> np.ndarray:
+        return np.outer(
+            np.ones_like(t, dtype=np.double), self.signal.offset * self._propagator(dt)
+        )
+
+
+class _SinusoidalContribution(_InputContribution):
+    def _compute_propagator(self, dt: float) -> np.ndarray:
+        omega = self.signal.angularFrequency
+        B = np.hstack((self.b, np.zeros_like(self.b), self.b))
+        S = np.array([[0.0, -omega, 0.0], [omega, 0.0, 0.0], [0.0, 0.0, 0.0]])
+        _, res = _van_loan(self.A, B, S, dt)
+        # columns: int cos(w tau), -int sin(w tau), int 1
+        res[:, 1] = -res[:, 1]
+        return res
+
+    def block(self, t: np.ndarray, dt: float) -> np.ndarray:
+        propagator = self._propagator(dt)
+        # sin(theta + w tau) = sin(theta) cos(w tau) + cos(theta) sin(w tau)
+        theta = self.signal.angularFrequency * t + self.signal.phase
+        return self.signal.amplitude * (
+            np.outer(np.sin(theta), propagator[:, 0])
+            + np.outer(np.cos(theta), propagator[:, 1])
+        ) + np.outer(np.ones_like(theta), self.signal.offset * propagator[:, 2])
+
+
+class _RampContribution(_InputContribution):
+    def _compute_propagator(self, dt: float):
+        B = np.hstack((self.b, np.zeros_like(self.b)))
+        S = np.array([[0.0, 1.0], [0.0, 0.0]])
+        return _van_loan(self.A, B, S, dt)
+
+    def _segment(self, u0: float, dt: float, cache: bool) -> np.ndarray:
+        if cache:
+            _, res = self._propagator(dt)
+        else:
+            _, res = self._compute_propagator(dt)
+        return u0 * res[:, 0] + self.signal.amplitude * res[:, 1]
+
+    def _wrapped(self, t: float, dt: float) -> np.ndarray:
+        # The ramp resets within the interval, integrate piecewise
+        # between the reset times j * period - phase.
+        res = np.zeros(self.A.shape[0], dtype=np.double)
+        t_end = t + dt
+        u0 = self.signal.evaluate(t)
+        j = np.floor((t + self.signal.phase) / self.signal.period) + 1
+        while t < t_end:
+            t_next = min(j * self.signal.period - self.signal.phase, t_end)
+            if t_next > t:
+                transition, _ = self._compute_propagator(t_end - t_next)
+                res += np.dot(transition, self._segment(u0, t_next - t, False))
+            t = t_next
+            u0 = self.signal.offset
+            j += 1
+        return res
+
+    def block(self, t: np.ndarray, dt: float) -> np.ndarray:
+        _, propagator = self._propagator(dt)
+        start = (t + self.signal.phase) % self.signal.period
+        res = np.outer(
+            self.signal.amplitude * start + self.signal.offset, propagator[:, 0]
+        ) + np.outer(np.ones_like(start), self.signal.amplitude * propagator[:, 1])
+        for index in np.flatnonzero(start + dt > self.signal.period):
+            res[index, :] = self._wrapped(t[index], dt)
+        return res
+
+
+class _SampledContribution(_InputContribution):
+    """The contribution of a :py:class:`cbadc.analog_signal.SampledSignal`
+
+    Over each interval, the interpolated signal is a fixed linear combination
+    of the nearby samples. Therefore, the contribution is a weight matrix
+    times these samples where the weight matrix only depends on the
+    position of the interval relative to the sample grid. For rational
+    ratios :math:`\\Delta t f_s = p / q` there are at most q such positions
+    and the corresponding weight matrices are computed once.
+    """
+
+    _max_denominator = 1 << 12
+
+    def __init__(self, A: np.ndarray, b: np.ndarray, signal):
+        super().__init__(A, b, signal)
+        self._weights = {}
+
+    def _grid(self, dt: float):
+        ratio = fractions.Fraction(dt * self.signal.fs).limit_denominator(
+            self._max_denominator
+        )
+        if abs(float(ratio) - dt * self.signal.fs) > 1e-9 * dt * self.signal.fs:
+            return None
+        return ratio.denominator
+
+    def _compute_propagator(self, dt: float):
+        return self._grid(dt)
+
+    def _compute_weights(self, offset: float, dt: float) -> np.ndarray:
+        """Compute the weight matrix of an interval starting offset samples
+        after a sample instance.
+
+        Parameters
+        ----------
+        offset: `float`
+            the offset in [0, 1) in units of samples.
+        dt: `float`
+            the interval length.
+
+        Returns
+        -------
+        `array_like`, shape=(N, S)
+            the weights of the S consecutive samples starting from the
+            sample preceding the interval.
+        """
+        fs = self.signal.fs
+        end = offset + dt * fs
+        boundaries = np.arange(1, int(np.ceil(end - 1e-12)))
+        x = np.hstack((offset, boundaries, end))
+        S = boundaries.size + 1 + self.signal.interpolation_order
+        weights = np.zeros((self.A.shape[0], S), dtype=np.double)
+        for j in range(x.size - 1):
+            transition, _ = self._compute_segment(dt - (x[j + 1] - offset) / fs)
+            _, res = self._compute_segment((x[j + 1] - x[j]) / fs)
+            res = np.dot(transition, res)
+            if self.signal.interpolation_order == 0:
+                weights[:, j] += res[:, 0]
+            else:
+                # u(x) = u[j] (1 - (x - j)) + u[j + 1] (x - j)
+                local = x[j] - j
+                weights[:, j] += (1 - local) * res[:, 0] - fs * res[:, 1]
+                weights[:, j + 1] += local * res[:, 0] + fs * res[:, 1]
+        return weights
+
+    def _compute_segment(self, dt: float):
+        B = np.hstack((self.b, np.zeros_like(self.b)))
+        S = np.array([[0.0, 1.0], [0.0, 0.0]])
+        return _van_loan(self.A, B, S, dt)
+
+    def block(self, t: np.ndarray, dt: float) -> np.ndarray:
+        q = self._propagator(dt)
+        x = np.asarray(t) * self.signal.fs
+        res = np.zeros((x.size, self.A.shape[0]), dtype=np.double)
+        if q is not None:
+            m = np.round(x * q)
+            aligned = np.abs(x * q - m) < 1e-6
+        else:
+            aligned = np.zeros(x.size, dtype=bool)
+        # intervals on the rational grid share cached weights
+        if np.any(aligned):
+            m = m[aligned].astype(np.int64)
+            n, r = np.divmod(m, q)
+            indices = np.flatnonzero(aligned)
+            for phase in np.unique(r):
+                key = (dt, int(phase))
+                if key not in self._weights:
+                    self._weights[key] = self._compute_weights(phase / q, dt)
+                weights = self._weights[key]
+                selection = r == phase
+                samples = self.signal.sample(
+                    n[selection][:, None] + np.arange(weights.shape[1])[None, :]
+                )
+                res[indices[selection], :] = np.dot(samples, weights.transpose())
+        # remaining intervals
+        for index in np.flatnonzero(np.logical_not(aligned)):
+            n = int(np.floor(x[index]))
+            weights = self._compute_weights(x[index] - n, dt)
+            samples = self.signal.sample(n + np.arange(weights.shape[1]))
+            res[index, :] = np.dot(weights, samples)
+        return res
+
+
+def _closed_form_input_contribution(
+    A: np.ndarray, b: np.ndarray, signal: cbadc.analog_signal._AnalogSignal
+) -> Union[_InputContribution, None]:
+    """Select a closed-form input contribution for a given signal
+
+    Parameters
+    ----------
+    A: `array_like`, shape=(N, N)
+        the system matrix.
+    b: `array_like`, shape=(N,)
+        the input vector of the signal.
+    signal: :py:class:`cbadc.analog_signal._AnalogSignal`
+        the input signal.
+
+    Returns
+    -------
+    :py:class:`_InputContribution` or `None`
+        the closed-form contribution or `None` if the signal type
+        has no known closed-form solution.
+    """
+    if isinstance(signal, cbadc.analog_signal.Sinusoidal):
+        return _SinusoidalContribution(A, b, signal)
+    if isinstance(signal, cbadc.analog_signal.ConstantSignal):
+        return _ConstantContribution(A, b, signal)
+    if isinstance(signal, cbadc.analog_signal.Ramp):
+        return _RampContribution(A, b, signal)
+    if isinstance(signal, cbadc.analog_signal.SampledSignal):
+        return _SampledContribution(A, b, signal)
+    return None
+
+
+def _closed_form_input_contributions(
+    A: np.ndarray, B: np.ndarray, signals: List[cbadc.analog_signal._AnalogSignal]
+):
+    """Partition input signals into closed-form and numerical contributions
+
+    Parameters
+    ----------
+    A: `array_like`, shape=(N, N)
+        the system matrix.
+    B: `array_like`, shape=(N, L)
+        the input matrix.
+    signals: [:py:class:`cbadc.analog_signal._AnalogSignal`]
+        the L input signals.
+
+    Returns
+    -------
+    [:py:class:`_InputContribution`]
+        the closed-form contributions.
+    [`int`]
+        the indices of the signals requiring numerical integration.
+    """
+    contributions = []
+    numerical = []
+    for l, signal in enumerate(signals):
+        contribution = _closed_form_input_contribution(A, B[:, l], signal)
+        if contribution is None:
+            logger.info(
+                f"No closed-form solution for input signal {l}, falling back to numerical integration."
+            )
+            numerical.append(l)
+        else:
+            contributions.append(contribution)
+    return contributions, numerical
+
+
+def _mp_van_loan(A: mp.matrix, B: mp.matrix, S: mp.matrix, dt: mp.mpf):
+    """The extended precision equivalent of :py:func:`_van_loan`
+
+    Evaluated at the current :py:obj:`mpmath.mp.dps`.
+
+    Parameters
+    ----------
+    A: :py:class:`mpmath.matrix`, shape=(N, N)
+        the system matrix.
+    B: :py:class:`mpmath.matrix`, shape=(N, K)
+        the generator input matrix.
+    S: :py:class:`mpmath.matrix`, shape=(K, K)
+        the generator (exo-system) matrix.
+    dt: :py:class:`mpmath.mpf`
+        the time interval :math:`\\Delta t`.
+
+    Returns
+    -------
+    :py:class:`mpmath.matrix`, shape=(N, N)
+        the state transition :math:`\exp(\mathbf{A} \\Delta t)`.
+    :py:class:`mpmath.matrix`, shape=(N, K)
+        the state response at :math:`\\Delta t` for each unit initial
+        generator state and zero initial state.
+    """
+    N = A.rows
+    K = S.rows
+    augmented = mp.zeros(N + K, N + K)
+    augmented[:N, :N] = A
+    augmented[:N, N:] = B
+    augmented[N:, N:] = S
+    res = mp.expm(augmented * dt)
+    return res[:N, :N], res[:N, N:]
+
+
+class _MPInputContribution:
+    """The extended precision equivalent of :py:class:`_InputContribution`
+
+    All evaluations are done at the current :py:obj:`mpmath.mp.dps`.
+    The propagator for the interval :math:`\\Delta t` is computed once,
+    or set from a disk cache, see :py:func:`cbadc.simulator._cache.load`.
+
+    Parameters
+    ----------
+    A: :py:class:`mpmath.matrix`, shape=(N, N)
+        the system matrix.
+    b: :py:class:`mpmath.matrix`, shape=(N, 1)
+        the input vector of the signal.
+    signal: :py:class:`cbadc.analog_signal._AnalogSignal`
+        the input signal.
+    dt: `float`
+        the interval :math:`\\Delta t`.
+    """
+
+    def __init__(self, A: mp.matrix, b: mp.matrix, signal, dt: float):
+        self.A = A
+        self.b = b
+        self.signal = signal
+        self.dt = mp.mpf(dt)
+        self.propagator = None
+
+    def cache_key(self) -> tuple:
+        """The parameters, besides the system and interval, determining
+        the propagator."""
+        return (type(self).__name__,)
+
+    def compute_propagator(self):
+        raise NotImplementedError
+
+    def __call__(self, t: mp.mpf) -> mp.matrix:
+        """Compute the contribution over the interval :math:`[t, t + \\Delta t]`
+
+        Parameters
+        ----------
+        t: :py:class:`mpmath.mpf`
+            start of interval.
+
+        Returns
+        -------
+        :py:class:`mpmath.matrix`, shape=(N, 1)
+            the resulting state contribution.
+        """
+        raise NotImplementedError
+
+
+class _MPConstantContribution(_MPInputContribution):
+    def compute_propagator(self):
+        _, res = _mp_van_loan(self.A, self.b, mp.zeros(1, 1), self.dt)
+        return res
+
+    def __call__(self, t: mp.mpf) -> mp.matrix:
+        return mp.mpf(self.signal.offset) * self.propagator
+
+
+class _MPSinusoidalContribution(_MPInputContribution):
+    def cache_key(self) -> tuple:
+        return (type(self).__name__, str(self.signal._mpmath_dic['frequency']))
+
+    def compute_propagator(self):
+        omega = mp.mpf(2) * mp.pi * self.signal._mpmath_dic['frequency']
+        N = self.A.rows
+        B = mp.zeros(N, 3)
+        B[:, 0] = self.b
+        B[:, 2] = self.b
+        S = mp.matrix([[0, -omega, 0], [omega, 0, 0], [0, 0, 0]])
+        _, res = _mp_van_loan(self.A, B, S, self.dt)
+        # columns: int cos(w tau), int sin(w tau), int 1
+        res[:, 1] = -res[:, 1]
+        return res
+
+    def __call__(self, t: mp.mpf) -> mp.matrix:
+        parameters = self.signal._mpmath_dic
+        theta = parameters['angularFrequency'] * t + parameters['phase']
+        return (
+            parameters['amplitude']
+            * (
+                mp.sin(theta) * self.propagator[:, 0]
+                + mp.cos(theta) * self.propagator[:, 1]
+            )
+            + parameters['offset'] * self.propagator[:, 2]
+        )
+
+
+class _MPRampContribution(_MPInputContribution):
+    def _van_loan(self, dt: mp.mpf):
+        N = self.A.rows
+        B = mp.zeros(N, 2)
+        B[:, 0] = self.b
+        S = mp.matrix([[0, 1], [0, 0]])
+        return _mp_van_loan(self.A, B, S, dt)
+
+    def compute_propagator(self):
+        _, res = self._van_loan(self.dt)
+        return res
+
+    def __call__(self, t: mp.mpf) -> mp.matrix:
+        parameters = self.signal._mpmath_dic
+        # the effective offset, see cbadc.analog_signal.Ramp.evaluate
+        offset = parameters['offset'] - parameters['amplitude'] / 2
+        t_phase = t + parameters['phase']
+        j = mp.floor(t_phase / parameters['period'])
+        start = t_phase - j * parameters['period']
+        if start + self.dt <= parameters['period']:
+            return (parameters['amplitude'] * start + offset) * self.propagator[
+                :, 0
+            ] + parameters['amplitude'] * self.propagator[:, 1]
+        # The ramp resets within the interval, integrate piecewise
+        # between the reset times j * period - phase.
+        res = mp.zeros(self.A.rows, 1)
+        t_end = t + self.dt
+        u0 = parameters['amplitude'] * start + offset
+        j += 1
+        while t < t_end:
+            t_next = min(j * parameters['period'] - parameters['phase'], t_end)
+            if t_next > t:
+                transition, _ = self._van_loan(t_end - t_next)
+                _, segment = self._van_loan(t_next - t)
+                res += transition * (
+                    u0 * segment[:, 0] + parameters['amplitude'] * segment[:, 1]
+                )
+            t = t_next
+            u0 = offset
+            j += 1
+        return res
+
+
+def _mp_closed_form_input_contribution(
+    A: mp.matrix, b: mp.matrix, signal: cbadc.analog_signal._AnalogSignal, dt: float
+) -> Union[_MPInputContribution, None]:
+    """Select an extended precision closed-form input contribution
+
+    Parameters
+    ----------
+    A: :py:class:`mpmath.matrix`, shape=(N, N)
+        the system matrix.
+    b: :py:class:`mpmath.matrix`, shape=(N, 1)
+        the input vector of the signal.
+    signal: :py:class:`cbadc.analog_signal._AnalogSignal`
+        the input signal.
+    dt: `float`
+        the interval :math:`\\Delta t`.
+
+    Returns
+    -------
+    :py:class:`_MPInputContribution` or `None`
+        the closed-form contribution or `None` if the signal type
+        has no known closed-form solution.
+    """
+    if isinstance(signal, cbadc.analog_signal.Sinusoidal):
+        return _MPSinusoidalContribution(A, b, signal, dt)
+    if isinstance(signal, cbadc.analog_signal.ConstantSignal):
+        return _MPConstantContribution(A, b, signal, dt)
+    if isinstance(signal, cbadc.analog_signal.Ramp):
+        return _MPRampContribution(A, b, signal, dt)
+    return None
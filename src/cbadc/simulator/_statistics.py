@@ -0,0 +1,135 @@
+"""Opt-in simulator instrumentation.
+
+The statistics are held by the simulator, which checks for them at the
+stepping, input integration, and control update call sites. Hence, a
+simulator for which statistics are not enabled only pays for a None check.
+"""
+import logging
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class _SimulatorStatistics:
+    """Counters collected while a simulator is instrumented.
+
+    Parameters
+    ----------
+    callback: `callable`, `optional`
+        called with the :py:func:`_SimulatorStatistics.as_dict` dictionary
+        at most once every interval seconds.
+    interval: `float`
+        the callback period [s].
+    """
+
+    def __init__(self, callback: Callable[[dict], None] = None, interval: float = 1.0):
+        if interval <= 0:
+            raise Exception("interval must be positive.")
+        self.callback = callback
+        self.interval = interval
+        self.samples = 0
+        self.simulation_time = 0.0
+        self.input_integration_time = 0.0
+        self.control_update_time = 0.0
+        self.ivp_calls = 0
+        self.nfev = 0
+        self.njev = 0
+        self.events = 0
+        # nesting depth of timed stepping calls, only the outermost counts.
+        self._depth = 0
+        self._t_start = time.perf_counter()
+        self._t_callback = self._t_start
+
+    def step(self, function: Callable, *args, samples: Callable = None):
+        """Time a call advancing the simulation.
+
+        Parameters
+        ----------
+        function: `callable`
+            advances the simulation when called with args.
+        samples: `callable`, `optional`
+            maps the return value of function to the number of simulated
+            samples, defaults to one sample per call.
+
+        Returns
+        -------
+        any
+            the return value of function.
+        """
+        if self._depth:
+            return function(*args)
+        self._depth += 1
+        t_start = time.perf_counter()
+        try:
+            result = function(*args)
+        finally:
+            t_stop = time.perf_counter()
+            self._depth -= 1
+            self.simulation_time += t_stop - t_start
+        self.samples += 1 if samples is None else samples(result)
+        if self.callback is not None and t_stop - self._t_callback >= self.interval:
+            self._t_callback = t_stop
+            self.callback(self.as_dict())
+        return result
+
+    def timed(self, attribute: str, function: Callable) -> Callable:
+        """Wrap a function accumulating its wall time.
+
+        Parameters
+        ----------
+        attribute: `str`
+            the name of the accumulating attribute.
+        function: `callable`
+            the function to time.
+
+        Returns
+        -------
+        `callable`
+            the timed function.
+        """
+
+        def wrapper(*args, **kwargs):
+            t_start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                setattr(
+                    self,
+                    attribute,
+                    getattr(self, attribute) + time.perf_counter() - t_start,
+                )
+
+        return wrapper
+
+    def record_ivp(self, solution):
+        """Accumulate the solver statistics of a
+        :py:func:`scipy.integrate.solve_ivp` solution."""
+        self.ivp_calls += 1
+        self.nfev += solution.nfev
+        self.njev += solution.njev
+        if solution.t_events is not None:
+            self.events += sum(len(t_events) for t_events in solution.t_events)
+
+    def as_dict(self) -> dict:
+        elapsed = time.perf_counter() - self._t_start
+        return {
+            "samples": self.samples,
+            "elapsed": elapsed,
+            "simulation_time": self.simulation_time,
+            "samples_per_second": self.samples / self.simulation_time
+            if self.simulation_time > 0
+            else 0.0,
+            "input_integration_time": self.input_integration_time,
+            "state_transition_time": max(
+                self.simulation_time
+                - self.input_integration_time
+                - self.control_update_time,
+                0.0,
+            ),
+            "control_update_time": self.control_update_time,
+            "ivp_calls": self.ivp_calls,
+            "nfev": self.nfev,
+            "njev": self.njev,
+            "events": self.events,
+        }
@@ -10,6 +10,7 @@ import numpy as np
 import sympy as sp
 import mpmath as mp
 from ._base_simulator import _BaseSimulator
+from . import _cache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -26,7 +27,10 @@ class AnalyticalSimulator(_BaseSimulator):
     digital_control: :py:class:`cbadc.digital_control.DigitalControl`
         the digital control
     input_signals : [:py:class:`cbadc.analog_signal.AnalogSignal`]
-        a python list of analog signals (or a derived class)
+        a python list of analog signals (or a derived class). Each signal
+        must have a symbolic representation, i.e.,
+        :py:class:`cbadc.analog_signal.SampledSignal` inputs are not
+        supported.
     clock: :py:class:`cbadc.simulator.clock`, `optional`
         a clock to syncronize simulator output against, defaults to
         a phase delayed version of the digital_control clock.
@@ -34,6 +38,11 @@ class AnalyticalSimulator(_BaseSimulator):
         determines a stop time, defaults to :py:obj:`math.inf`
     initial_state_vector: `array_like`, shape=(N), `optional`
         initial state vector.
+    cache_dir: `str`, `optional`
+        a directory in which the symbolic solution is cached and reused
+        between simulator instances with the same analog system, input
+        signals, digital control, and clock. Defaults to the environment
+        variable CBADC_CACHE_DIR or, if not set, no caching.
 
     Attributes
     ----------
@@ -64,6 +73,7 @@ class AnalyticalSimulator(_BaseSimulator):
         clock: cbadc.analog_signal._valid_clock_types = None,
         t_stop: float = math.inf,
         initial_state_vector=None,
+        cache_dir: str = None,
     ):
         super().__init__(
             analog_system,
@@ -73,8 +83,65 @@ class AnalyticalSimulator(_BaseSimulator):
             t_stop,
             initial_state_vector,
         )
+        if any(
+            isinstance(s, cbadc.analog_signal.SampledSignal) for s in self.input_signals
+        ):
+            raise Exception(
+                "SampledSignal inputs have no symbolic representation; "
+                "use the PreComputedControlSignalsSimulator instead."
+            )
         mp.dps = 30
         self._state_vector = mp.matrix(self._state_vector)
+        cache_dir = _cache.cache_directory(cache_dir)
+        cache_key = _cache.key(
+            "AnalyticalSimulator",
+            sp.srepr(self.analog_system._A_s),
+            sp.srepr(self.analog_system._B_s),
+            sp.srepr(self.analog_system._Gamma_s),
+            [(sp.srepr(s.symbolic()), s.t0) for s in self.input_signals],
+            [
+                (sp.srepr(s.symbolic()), s.t0)
+                for s in self.digital_control._impulse_response
+            ],
+            self.clock.T,
+        )
+        solution = _cache.load(cache_dir, cache_key)
+        if solution is None:
+            solution = self._solve()
+            _cache.store(cache_dir, cache_key, solution)
+        tmp_Af, tmp_Gamma, tmp_Bf, phases = solution
+
+        self.Af = mp.matrix(tmp_Af)
+        self.Gamma = mp.matrix(tmp_Gamma)
+        self.Gamma_tildeT = mp.matrix(self.analog_system.Gamma_tildeT)
+        # a single vectorized function evaluating the (N, L) input
+        # contributions given the phases of the L input signals.
+        self.Bf = sp.lambdify((phases,), tmp_Bf)
+        self._angular_frequencies = np.array(
+            [
+                s.angularFrequency
+                if isinstance(s, cbadc.analog_signal.Sinusoidal)
+                else 0.0
+                for s in self.input_signals
+            ]
+        )
+
+    def _solve(self):
+        """Symbolically solve for the state transition and the input and
+        control contributions over a clock period.
+
+        Returns
+        -------
+        :py:class:`sympy.Matrix`, shape=(N, N)
+            the evaluated state transition matrix.
+        :py:class:`sympy.Matrix`, shape=(N, M)
+            the evaluated control contributions.
+        :py:class:`sympy.Matrix`, shape=(N, L)
+            the input contributions as functions of the input phases.
+        (:py:class:`sympy.Symbol`,)
+            the L input phase symbols.
+        """
+        logger.info("Solving the analog system symbolically.")
         signals = [
             *[s.symbolic() for s in self.input_signals],
             *[s.symbolic() for s in self.digital_control._impulse_response],
@@ -91,30 +158,25 @@ class AnalyticalSimulator(_BaseSimulator):
         # replace t and extract rhs of expression
         tmp_Bf = [[s.subs(t, self.clock.T).rhs for s in ss] for ss in tmp_Bf]
 
-        # self.Af = np.array(tmp_Af.evalf(subs={t: self.clock.T})).astype(np.float64)
-        self.Af = mp.matrix(tmp_Af.evalf(subs={t: self.clock.T}))
-
-        self.Bf = [
-            [None for _ in range(self.analog_system.L)]
-            for _ in range(self.analog_system.N)
-        ]
-        # self.Gamma = np.zeros(
-        #     (self.analog_system.N, self.analog_system.M), dtype=np.float64
-        # )
-        self.Gamma = mp.matrix(self.analog_system.N, self.analog_system.M)
-
-        self.Gamma_tildeT = mp.matrix(self.analog_system.Gamma_tildeT)
+        # one phase symbol per input signal
+        phases = tuple(
+            sp.Symbol(f"\u03C6_{l}", real=True) for l in range(self.analog_system.L)
+        )
+        Bf = sp.Matrix(
+            self.analog_system.N,
+            self.analog_system.L,
+            lambda n, l: sp.re(
+                tmp_Bf[l][n].subs(self.input_signals[l].sym_phase, phases[l])
+            ),
+        )
+        Gamma = sp.Matrix(
+            self.analog_system.N,
+            self.analog_system.M,
+            lambda n, m: tmp_Bf[m + self.analog_system.L][n].doit().evalf(),
+        )
+        return tmp_Af.evalf(subs={t: self.clock.T}), Gamma, Bf, phases
 
-        for n in range(self.analog_system.N):
-            for l in range(self.analog_system.L):
-                self.Bf[n][l] = sp.lambdify(
-                    (self.input_signals[l].t, self.input_signals[l].sym_phase),
-                    sp.re(tmp_Bf[l][n]),
-                )
-            for m in range(self.analog_system.M):
-                self.Gamma[n, m] = tmp_Bf[m + self.analog_system.L][n].doit().evalf()
-
-    def __next__(self) -> np.ndarray:
+    def _next(self) -> np.ndarray:
         """Computes the next control signal :math:`\mathbf{s}[k]`"""
 
         t_end: float = self.t + self.clock.T
@@ -127,16 +189,12 @@ class AnalyticalSimulator(_BaseSimulator):
         # self._state_vector = np.dot(self.Af, self._state_vector)
         self._state_vector = self.Af * self._state_vector
         # Input Signals
+        artifical_phases = (self._angular_frequencies * self.t) % (2 * np.pi)
+        contributions = np.asarray(self.Bf(artifical_phases), dtype=np.float64).sum(
+            axis=1
+        )
         for n in range(self.analog_system.N):
-            for l in range(self.analog_system.L):
-                if isinstance(self.input_signals[l], cbadc.analog_signal.Sinusoidal):
-                    artifical_phase = (
-                        self.input_signals[l].angularFrequency * self.t
-                    ) % (2 * np.pi)
-
-                else:
-                    artifical_phase = 0
-                self._state_vector[n] += self.Bf[n][l](t_end - self.t, artifical_phase)
+            self._state_vector[n] += contributions[n]
 
         # Control signals
         # self._state_vector += np.dot(
@@ -149,8 +207,10 @@ class AnalyticalSimulator(_BaseSimulator):
         control_observation = np.array(
             (self.Gamma_tildeT * self._state_vector).tolist(), dtype=np.float64
         ).flatten()
-        self.digital_control.control_update(t_span[1], control_observation)
+        self._control_update(t_span[1], control_observation)
         self.t = t_end
+        if self.state_bounds is not None:
+            self._monitor_state_bounds()
         return self.digital_control.control_signal()
 
     def __str__(self):
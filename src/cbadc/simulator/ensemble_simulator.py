@@ -0,0 +1,467 @@
+"""Ensemble simulations."""
+import logging
+import cbadc.analog_system
+import cbadc.digital_control
+import cbadc.analog_signal
+import cbadc.utilities
+import numpy as np
+import scipy.integrate
+import scipy.linalg
+import math
+from typing import List
+from ._base_simulator import _BaseSimulator
+from .numerical_simulator import _pre_computed_control_matrix
+from ._propagators import (
+    _closed_form_input_contributions,
+    _dac_end_matrix,
+    _draw_perturbations,
+    _noise_factor,
+    _perturbation_generators,
+    _spawn_seeds,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EnsembleSimulator(_BaseSimulator):
+    """Simulate an ensemble of analog system and digital control interactions
+    in lockstep.
+
+    The P ensemble members share the same analog system and digital control
+    parametrization but have individual input signals, initial states, and
+    control decisions. Each control period the ensemble is advanced as
+
+    :math:`\mathbf{X}[k+1] = \mathbf{X}[k] \exp\\left(\mathbf{A} T\\right)^{\mathsf{T}} + \mathbf{U}[k] + \\left(2 \mathbf{S}[k] - 1\\right) \mathbf{A}_c^{\mathsf{T}}`
+
+    where :math:`\mathbf{X}[k]`, :math:`\mathbf{U}[k]`, and
+    :math:`\mathbf{S}[k]` hold the state vectors, input contributions and
+    control signals of all ensemble members as rows, and :math:`\mathbf{A}_c`
+    is the control contribution matrix of
+    :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator`. The
+    control decisions are quantized by
+    :py:func:`cbadc.digital_control.DigitalControl.quantize`.
+
+    Unlike :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator`,
+    the simulation and digital control clocks must have the same period,
+    the digital control must follow the
+    :py:class:`cbadc.digital_control.DigitalControl` update rule, and
+    state bounds are not supported.
+
+    Parameters
+    ----------
+    analog_system : :py:class:`cbadc.analog_system.AnalogSystem`
+        the analog system
+    digital_control: :py:class:`cbadc.digital_control.DigitalControl`
+        the digital control, only used as a template as each ensemble member
+        keeps its own control decisions.
+    input_signals : [[:py:class:`cbadc.analog_signal.AnalogSignal`]]
+        a list of P lists, each containing the L input signals of an
+        ensemble member.
+    clock: :py:class:`cbadc.simulator.clock`, `optional`
+        a clock to syncronize simulator output against, with the same period
+        as the digital control clock, defaults to the digital control clock.
+    t_stop : `float`, optional
+        determines a stop time, defaults to :py:obj:`math.inf`
+    initial_state_vectors: `array_like`, shape=(P, N), `optional`
+        initial state vectors, defaults to zeros.
+    atol, rtol : `float`, `optional`
+        absolute and relative tolerances of the numerical solver, see
+        :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator`.
+    closed_form_inputs: `bool`, `optional`
+        use closed-form input contributions where available,
+        defaults to True.
+    noise_covariance: `array_like`, shape=(N, N), `optional`
+        the covariance density of the white (thermal) noise driving each
+        ensemble member, defaults to None, i.e., no noise.
+    jitter_std: `float`, `optional`
+        the standard deviation of the sampling clock jitter [s] of each
+        ensemble member, defaults to 0.
+    seed: `int` or :py:class:`numpy.random.SeedSequence`, `optional`
+        seeds the noise and jitter generators, defaults to None, i.e., fresh
+        entropy. Each ensemble member draws from an independent stream,
+        seeded by the p:th child of :py:func:`numpy.random.SeedSequence.spawn`,
+        such that member p is perturbed as a
+        :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator` with
+        that child as its seed.
+
+    Attributes
+    ----------
+    analog_system : :py:class:`cbadc.analog_system.AnalogSystem`
+        the analog system being simulated.
+    digital_control : :py:class:`cbadc.digital_control.DigitalControl`
+        the digital control template.
+    P : `int`
+        the number of ensemble members.
+    t : `float`
+        current time of simulator.
+    t_stop : `float`
+        end time at which the generator raises :py:class:`StopIteration`.
+
+    Yields
+    ------
+    `array_like`, shape=(P, M), dtype=numpy.int8
+    """
+
+    _block_size = 1 << 12
+
+    def __init__(
+        self,
+        analog_system: cbadc.analog_system._valid_analog_system_types,
+        digital_control: cbadc.digital_control.DigitalControl,
+        input_signals: List[List[cbadc.analog_signal._AnalogSignal]],
+        clock: cbadc.analog_signal._valid_clock_types = None,
+        t_stop: float = math.inf,
+        initial_state_vectors=None,
+        atol: float = 1e-12,
+        rtol: float = 1e-8,
+        closed_form_inputs: bool = True,
+        noise_covariance: np.ndarray = None,
+        jitter_std: float = 0.0,
+        seed=None,
+    ):
+        if (
+            not isinstance(digital_control, cbadc.digital_control.DigitalControl)
+            or type(digital_control).control_update
+            is not cbadc.digital_control.DigitalControl.control_update
+        ):
+            raise Exception(
+                "The ensemble simulator only supports the cbadc.digital_control.DigitalControl update rule."
+            )
+        self.P = len(input_signals)
+        if self.P < 1:
+            raise Exception("The ensemble must contain at least one member.")
+        for member in input_signals:
+            if analog_system.L != len(member):
+                raise Exception(
+                    "The analog system does not have as many inputs as each ensemble member."
+                )
+        if not isinstance(clock, cbadc.analog_signal.Clock):
+            clock = digital_control.clock
+        _BaseSimulator.__init__(
+            self, analog_system, digital_control, input_signals[0], clock, t_stop
+        )
+        self.input_signals = input_signals
+        self._ensemble_shape = (self.P,)
+        if self.clock.T != self.digital_control.clock.T:
+            raise Exception(
+                "For this simulator, both simulation clock and digital control clock must have same clock period."
+            )
+        self.atol = atol
+        self.rtol = rtol
+        self.closed_form_inputs = closed_form_inputs
+        self.noise_covariance = noise_covariance
+        if jitter_std < 0:
+            raise Exception("jitter_std must be non-negative.")
+        self.jitter_std = jitter_std
+        self.seed = seed
+
+        if initial_state_vectors is not None:
+            self._state_vector = np.array(initial_state_vectors, dtype=np.double)
+            if self._state_vector.shape != (self.P, self.analog_system.N):
+                raise Exception("initial_state_vectors must be of shape (P, N).")
+        else:
+            self._state_vector = np.zeros(
+                (self.P, self.analog_system.N), dtype=np.double
+            )
+        # Same initial control decisions as DigitalControl
+        self._s = np.tile(
+            np.asarray(
+                digital_control.quantize(np.zeros(digital_control.M_tilde)),
+                dtype=np.int8,
+            ),
+            (self.P, 1),
+        )
+        self._pre_computations()
+
+    def _pre_computations(self):
+        """Precomputes the state transition, control, and input contributions
+        shared by all ensemble members."""
+        logger.info("Executing precomputations.")
+        self._pre_computed_state_transition_matrix = scipy.linalg.expm(
+            np.asarray(self.analog_system.A) * self.clock.T
+        )
+        self._pre_computed_control_matrix = _pre_computed_control_matrix(
+            self.analog_system, self.digital_control, self.atol, self.rtol
+        )
+        self._input_contributions = []
+        self._numerical_inputs = []
+        for p, member in enumerate(self.input_signals):
+            if self.closed_form_inputs:
+                contributions, numerical = _closed_form_input_contributions(
+                    self.analog_system.A, self.analog_system.B, member
+                )
+            else:
+                contributions, numerical = [], list(range(self.analog_system.L))
+            self._input_contributions.append(contributions)
+            self._numerical_inputs.extend([(p, l) for l in numerical])
+        self._noise_pre_computations()
+
+    def _noise_pre_computations(self):
+        """Precomputes the noise and jitter perturbations and seeds an
+        independent pair of noise and jitter generators per ensemble member,
+        see :py:func:`cbadc.simulator.PreComputedControlSignalsSimulator._noise_pre_computations`.
+        """
+        noise = self.noise_covariance is not None
+        jitter = self.jitter_std > 0
+        generators = [
+            _perturbation_generators(seed, noise, jitter)
+            for seed in _spawn_seeds(self.seed, self.P)
+        ]
+        self._noise_factor = None
+        self._noise_generators = None
+        if noise:
+            self._noise_factor = _noise_factor(
+                np.asarray(self.analog_system.A), self.noise_covariance, self.clock.T
+            )
+            self._noise_generators = [generator for generator, _ in generators]
+        self._dac_end_matrix = None
+        self._jitter_generators = None
+        if jitter:
+            self._dac_end_matrix = _dac_end_matrix(
+                self.analog_system.Gamma, self.digital_control, self.clock.T
+            )
+            self._jitter_generators = [generator for _, generator in generators]
+        self._jitter_last = np.zeros(self.P, dtype=np.double)
+
+    def _perturbations(self, t: np.ndarray):
+        """Draw the noise and jitter perturbations of all ensemble members
+        for a sequence of clock periods.
+
+        Parameters
+        ----------
+        t : `array_like`, shape=(K + 1,)
+            the clock period boundaries.
+
+        Returns
+        -------
+        `array_like`, shape=(K, P, N)
+            the state noise or None.
+        `array_like`, shape=(K, P)
+            the sampling time perturbations or None.
+        `array_like`, shape=(K, P, N)
+            the input signal contribution to the jitter perturbations or None.
+        """
+        noise, jitter, jitter_inputs, self._jitter_last = _draw_perturbations(
+            t,
+            self.input_signals,
+            self.analog_system.B,
+            self._noise_generators,
+            self._noise_factor,
+            self._jitter_generators,
+            self.jitter_std,
+            self._jitter_last,
+        )
+        return noise, jitter, jitter_inputs
+
+    def _input_contribution(self, t: np.ndarray) -> np.ndarray:
+        """Computes the input signal contributions of all ensemble members
+        for a sequence of clock periods.
+
+        Parameters
+        ----------
+        t : `array_like`, shape=(K + 1,)
+            the clock period boundaries.
+
+        Returns
+        -------
+        `array_like`, shape=(K, P, N)
+            the input signal contributions.
+        """
+        K = t.size - 1
+        N = self.analog_system.N
+        res = np.zeros((K, self.P, N), dtype=np.double)
+        for p, contributions in enumerate(self._input_contributions):
+            for contribution in contributions:
+                res[:, p, :] += contribution.block(t[:K], self.clock.T)
+        if not self._numerical_inputs:
+            return res
+
+        # A single numerical solution for all remaining inputs of all members
+        A = np.asarray(self.analog_system.A)
+        B = np.asarray(self.analog_system.B)
+
+        def f(t, x):
+            x = x.reshape((self.P, N))
+            dx = np.dot(x, A.transpose())
+            for p, l in self._numerical_inputs:
+                dx[p, :] += B[:, l] * self.input_signals[p][l].evaluate(t)
+            return dx.flatten()
+
+        for k in range(K):
+            sol = scipy.integrate.solve_ivp(
+                f,
+                (t[k], t[k + 1]),
+                np.zeros(self.P * N),
+                atol=self.atol,
+                rtol=self.rtol,
+                method="RK45",
+            )
+            if sol.status == -1:
+                logger.critical(f"IVP solver failed, See:\n\n{sol}")
+            if self._statistics is not None:
+                self._statistics.record_ivp(sol)
+            res[k, :, :] += sol.y[:, -1].reshape((self.P, N))
+        return res
+
+    def _block_input_contributions(self, t: np.ndarray):
+        """Computes the input signal contributions, including noise, and
+        the jitter perturbations of all ensemble members for a sequence of
+        clock periods, see
+        :py:func:`cbadc.simulator.EnsembleSimulator._perturbations`."""
+        input_contributions = self._input_contribution(t)
+        noise, jitter, jitter_inputs = self._perturbations(t)
+        if noise is not None:
+            input_contributions += noise
+        return input_contributions, jitter, jitter_inputs
+
+    def state_vector(self) -> np.ndarray:
+        """return the current state vectors of all ensemble members.
+
+        Returns
+        -------
+        `array_like`, shape=(P, N)
+            the state vectors :math:`\mathbf{X}(t)`.
+        """
+        return self._state_vector[:]
+
+    def observations(self) -> np.ndarray:
+        """return the current signal observations of all ensemble members.
+
+        Returns
+        -------
+        `array_like`, shape=(P, N_tilde)
+            the signal observations :math:`\mathbf{X}(t) \mathbf{C}`.
+        """
+        return self.analog_system._CT_operator.dot(
+            self._state_vector.transpose()
+        ).transpose()
+
+    def control_signal(self) -> np.ndarray:
+        """return the current control signals of all ensemble members.
+
+        Returns
+        -------
+        `array_like`, shape=(P, M), dtype=numpy.int8
+            the control signals :math:`\mathbf{S}[k]`.
+        """
+        return self._s[:]
+
+    # the attributes constituting the dynamic state, see checkpoint().
+    _checkpoint_attributes = _BaseSimulator._checkpoint_attributes + (
+        "_s",
+        "_noise_generators",
+        "_jitter_generators",
+        "_jitter_last",
+    )
+
+    def _next(self) -> np.ndarray:
+        """Computes the next control signals :math:`\mathbf{S}[k]`"""
+        control_signals = np.zeros((1, self.P, self.analog_system.M), dtype=np.int8)
+        if self._simulate_block(control_signals, 0, None, None) < 1:
+            raise StopIteration
+        return control_signals[0, :, :]
+
+    def simulate(
+        self,
+        n_samples: int,
+        out: np.ndarray = None,
+        packed: bool = False,
+        state_decimation: int = None,
+    ):
+        """Simulate a block of control signals for all ensemble members.
+
+        See :py:func:`cbadc.simulator._BaseSimulator.simulate`, except that
+        the control signals are of shape=(n_samples, P, M), or
+        shape=(n_samples, P) if packed, and the decimated state trajectories
+        of shape=(ceil(n_samples / state_decimation), P, N).
+        """
+        return _BaseSimulator.simulate(self, n_samples, out, packed, state_decimation)
+
+    def _simulate_block(
+        self,
+        control_signals: np.ndarray,
+        index: int,
+        states: np.ndarray,
+        state_decimation: int,
+    ) -> int:
+        if self.state_bounds is not None:
+            raise Exception("The ensemble simulator does not support state bounds.")
+        t = np.cumsum(
+            np.hstack(
+                (self.t, np.full(control_signals.shape[0], self.clock.T, np.double))
+            )
+        )
+        K = int(np.searchsorted(t[1:], self.t_stop, side="left"))
+        if K < 1:
+            return 0
+        input_contributions, jitter, jitter_inputs = self._timed(
+            "input_integration_time", self._block_input_contributions
+        )(t[: K + 1])
+        state_transition = self._pre_computed_state_transition_matrix.transpose()
+        control_matrix = self._pre_computed_control_matrix.transpose()
+        A = self.analog_system._A_operator
+        Gamma_tildeT = self.analog_system._Gamma_tildeT_operator
+        quantize = self._timed("control_update_time", self.digital_control.quantize)
+        if jitter is not None:
+            dac_end_matrix = self._dac_end_matrix.transpose()
+        X = self._state_vector
+        S = self._s
+        for k in range(K):
+            control = 2.0 * S - 1.0
+            X = (
+                np.dot(X, state_transition)
+                + input_contributions[k, :, :]
+                + np.dot(control, control_matrix)
+            )
+            if jitter is not None:
+                X = (
+                    X
+                    + jitter[k, :, None]
+                    * (
+                        A.dot(X.transpose()).transpose()
+                        + np.dot(control, dac_end_matrix)
+                    )
+                    + jitter_inputs[k, :, :]
+                )
+            S = np.asarray(
+                quantize(Gamma_tildeT.dot(X.transpose()).transpose()), dtype=np.int8
+            )
+            control_signals[k, :, :] = S
+            if states is not None and (index + k) % state_decimation == 0:
+                states[(index + k) // state_decimation, :, :] = X
+        self._state_vector = X
+        self._s = S
+        self.t = t[K]
+        return K
+
+    def __str__(self) -> str:
+        return f"""{80 * '='}
+
+The Ensemble Simulator is parameterized by the:
+
+{80 * '-'}
+
+Analog System:
+{self.analog_system}
+
+Digital Control:
+{self.digital_control}
+
+P:
+{self.P}
+
+t_stop:
+{self.t_stop}
+
+{80 * '-'}
+
+Currently the
+
+state vectors are:
+{self.state_vector()}
+
+t:
+{self.t}
+
+{80 * '='}
+        """
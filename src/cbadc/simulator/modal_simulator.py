@@ -0,0 +1,237 @@
+"""Modal (diagonalized) simulator."""
+import logging
+import cbadc.analog_system
+import cbadc.digital_control
+import cbadc.analog_signal
+import numpy as np
+import math
+from typing import List
+from .numerical_simulator import PreComputedControlSignalsSimulator
+
+logger = logging.getLogger(__name__)
+
+
+class ModalSimulator(PreComputedControlSignalsSimulator):
+    """Simulate the analog system and digital control interactions
+    in the eigenbasis of the system matrix.
+
+    For diagonalizable system matrices :math:`\mathbf{A} = \mathbf{V} \mathbf{\Lambda} \mathbf{V}^{-1}`
+    the simulator advances the modal state :math:`\mathbf{z} = \mathbf{V}^{-1} \mathbf{x}`
+    as
+
+    :math:`\mathbf{z}[k+1] = \exp\\left(\mathbf{\Lambda} T\\right) \odot \mathbf{z}[k] + \mathbf{V}^{-1} \mathbf{u}_c[k] + \mathbf{V}^{-1} \mathbf{A}_c \\left(2 \mathbf{s}[k] - 1\\right)`
+
+    where the state transition is an elementwise multiplication and
+    the input contributions :math:`\mathbf{u}_c[k]` of a block are
+    transformed by a single matrix product. The control observations
+    are computed by the precomputed projection
+    :math:`\\tilde{\mathbf{\Gamma}}^\mathsf{T} \mathbf{V}`. As the modal
+    coordinates of complex conjugate eigenvalue pairs are complex conjugates,
+    only one coordinate per pair is simulated. The modal update
+    is used by :py:func:`cbadc.simulator.ModalSimulator.simulate`, stepping
+    by :py:func:`next`, systems with ill-conditioned eigenvectors, and
+    simulation clocks differing from the digital control clock use the
+    dense updates of :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator`.
+
+    Parameters
+    ----------
+    analog_system : :py:class:`cbadc.analog_system.AnalogSystem`
+        the analog system
+    digital_control: :py:class:`cbadc.digital_control.DigitalControl`
+        the digital control
+    input_signals : [:py:class:`cbadc.analog_signal.AnalogSignal`]
+        a python list of analog signals (or a derived class)
+    clock: :py:class:`cbadc.simulator.clock`, `optional`
+        a clock to syncronize simulator output against, defaults to
+        a phase delayed version of the digital_control clock.
+    t_stop : `float`, optional
+        determines a stop time, defaults to :py:obj:`math.inf`
+    initial_state_vector: `array_like`, shape=(N), `optional`
+        initial state vector.
+    max_condition_number: `float`, `optional`
+        the largest condition number of the eigenvector matrix
+        :math:`\mathbf{V}` for which the modal update is used, defaults
+        to 1e8.
+    kwargs:
+        further arguments of :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator`.
+
+    Attributes
+    ----------
+    modal : `bool`
+        True if the modal update is used.
+    condition_number : `float`
+        the condition number of the eigenvector matrix.
+    """
+
+    def __init__(
+        self,
+        analog_system: cbadc.analog_system._valid_analog_system_types,
+        digital_control: cbadc.digital_control._valid_digital_control_types,
+        input_signal: List[cbadc.analog_signal._AnalogSignal],
+        clock: cbadc.analog_signal._valid_clock_types = None,
+        t_stop: float = math.inf,
+        initial_state_vector=None,
+        max_condition_number: float = 1e8,
+        **kwargs,
+    ):
+        self.max_condition_number = max_condition_number
+        self.modal = False
+        PreComputedControlSignalsSimulator.__init__(
+            self,
+            analog_system,
+            digital_control,
+            input_signal,
+            clock,
+            t_stop,
+            initial_state_vector,
+            **kwargs,
+        )
+
+    # The state vector is kept in either, or both, of the dense and modal
+    # coordinates and converted lazily.
+    @property
+    def _state_vector(self) -> np.ndarray:
+        if self._x is None:
+            self._x = np.real(np.dot(self._V, self._z))
+        return self._x
+
+    @_state_vector.setter
+    def _state_vector(self, x: np.ndarray):
+        self._x = x
+        self._z = None
+
+    def _modal_state_vector(self) -> np.ndarray:
+        if self._z is None:
+            self._z = np.dot(self._V_inv, self._x)
+        return self._z
+
+    def _pre_computations(self):
+        super()._pre_computations()
+        self._modal_pre_computations()
+
+    def _modal_pre_computations(self):
+        """Precomputes the eigendecomposition and the modal state transition,
+        control, and observation matrices."""
+        eigenvalues, V = np.linalg.eig(np.asarray(self.analog_system.A))
+        self.condition_number = np.linalg.cond(V)
+        self.modal = bool(self.condition_number <= self.max_condition_number)
+        if self._phases > 1 or self._stride > 1:
+            logger.info(
+                "Simulation and digital control clocks differ, using the dense state update."
+            )
+            self.modal = False
+            return
+        if not self.modal:
+            logger.warning(
+                f"Ill-conditioned eigenvectors (condition number {self.condition_number:.2e}), using the dense state update."
+            )
+            return
+        # The modal coordinates of complex conjugate eigenvalues are complex
+        # conjugates for real state vectors, hence, only one of each pair
+        # is simulated and its contribution to the state vector doubled.
+        real = eigenvalues.imag == 0
+        keep = real | (eigenvalues.imag > 0)
+        if np.sum(real) + 2 * np.sum(eigenvalues.imag > 0) != eigenvalues.size:
+            logger.warning(
+                "Eigenvalues are not in conjugate pairs, using the dense state update."
+            )
+            self.modal = False
+            return
+        self._eigenvalues = eigenvalues[keep]
+        self._V = V[:, keep] * np.where(real[keep], 1.0, 2.0)
+        self._V_inv = np.linalg.inv(V)[keep, :]
+        self._modal_state_transition = np.exp(self._eigenvalues * self.clock.T)
+        # The complex modal control and observation matrices are stored as
+        # real matrices acting on, and resulting in, interleaved real and
+        # imaginary parts, i.e., on numpy.complex128 arrays viewed as
+        # numpy.double, which avoids casting the control signals and the
+        # observations to complex numbers.
+        modal_control_matrix = np.dot(self._V_inv, self._pre_computed_control_matrix)
+        self._modal_control_matrix = np.zeros(
+            (2 * modal_control_matrix.shape[0], modal_control_matrix.shape[1])
+        )
+        self._modal_control_matrix[0::2, :] = np.real(modal_control_matrix)
+        self._modal_control_matrix[1::2, :] = np.imag(modal_control_matrix)
+        modal_observation_matrix = np.dot(self.analog_system.Gamma_tildeT, self._V)
+        self._modal_observation_matrix = np.zeros(
+            (modal_observation_matrix.shape[0], 2 * modal_observation_matrix.shape[1])
+        )
+        self._modal_observation_matrix[:, 0::2] = np.real(modal_observation_matrix)
+        self._modal_observation_matrix[:, 1::2] = -np.imag(modal_observation_matrix)
+        if self._dac_end_matrix is not None:
+            self._modal_dac_end_matrix = np.dot(self._V_inv, self._dac_end_matrix)
+
+    def _simulate_block(
+        self,
+        control_signals: np.ndarray,
+        index: int,
+        states: np.ndarray,
+        state_decimation: int,
+    ) -> int:
+        if not self.modal:
+            return super()._simulate_block(
+                control_signals, index, states, state_decimation
+            )
+        # the same time grid as repeatedly calling __next__
+        t = np.cumsum(
+            np.hstack(
+                (self.t, np.full(control_signals.shape[0], self.clock.T, np.double))
+            )
+        )
+        K = int(np.searchsorted(t[1:], self.t_stop, side="left"))
+        if K < 1:
+            return 0
+        t = t[: K + 1]
+        input_contributions, jitter, jitter_inputs = self._timed(
+            "input_integration_time", self._block_input_contributions
+        )(t)
+        modal_input_contributions = np.dot(input_contributions, self._V_inv.transpose())
+        if jitter is not None:
+            modal_jitter_inputs = np.dot(jitter_inputs, self._V_inv.transpose())
+
+        state_transition = self._modal_state_transition
+        control_matrix = self._modal_control_matrix
+        observation_matrix = self._modal_observation_matrix
+        eigenvalues = self._eigenvalues
+        digital_control = self.digital_control
+        control_update = self._timed(
+            "control_update_time", digital_control.control_update
+        )
+        # the consumed input contributions are overwritten by the trajectory
+        record = self.state_bounds is not None or states is not None
+        z = self._modal_state_vector()
+        for k in range(K):
+            control = 2.0 * digital_control._s - 1.0
+            z = (
+                state_transition * z
+                + modal_input_contributions[k, :]
+                + np.dot(control_matrix, control).view(np.complex128)
+            )
+            if jitter is not None:
+                z = (
+                    z
+                    + jitter[k]
+                    * (eigenvalues * z + np.dot(self._modal_dac_end_matrix, control))
+                    + modal_jitter_inputs[k, :]
+                )
+            control_update(t[k + 1], np.dot(observation_matrix, z.view(np.double)))
+            control_signals[k, :] = digital_control.control_signal()
+            if record:
+                modal_input_contributions[k, :] = z
+        self._x = None
+        self._z = z
+        self.t = t[K]
+        if record:
+            trajectory = np.real(np.dot(modal_input_contributions, self._V.transpose()))
+            if states is not None:
+                first = (-index) % state_decimation
+                states[
+                    (index + first)
+                    // state_decimation : (index + K - 1)
+                    // state_decimation
+                    + 1,
+                    :,
+                ] = trajectory[first::state_decimation, :]
+            if self.state_bounds is not None:
+                self.state_bounds.monitor(t[1:], trajectory)
+        return K
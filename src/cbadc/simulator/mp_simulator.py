@@ -11,12 +11,20 @@ from ..ode_solver.mpmath import invariant_system_solver
 import numpy as np
 import sympy as sp
 from ._base_simulator import _BaseSimulator
+from ._propagators import _mp_closed_form_input_contribution
+from . import _cache
 from mpmath import mp
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+def _exact(matrix: mp.matrix) -> list:
+    """An exact, precision independent, representation of a real matrix
+    for cache keys."""
+    return [mp.mpf(value)._mpf_ for row in matrix.tolist() for value in row]
+
+
 class MPSimulator(_BaseSimulator):
     """Simulate the analog system and digital control interactions
     in the presence on analog signals.
@@ -28,7 +36,10 @@ class MPSimulator(_BaseSimulator):
     digital_control: :py:class:`cbadc.digital_control.DigitalControl`
         the digital control
     input_signals : [:py:class:`cbadc.analog_signal.AnalogSignal`]
-        a python list of analog signals (or a derived class)
+        a python list of analog signals (or a derived class). Each signal
+        must be evaluable at arbitrary precision, i.e.,
+        :py:class:`cbadc.analog_signal.SampledSignal` inputs are not
+        supported.
     clock: :py:class:`cbadc.simulator.clock`, `optional`
         a clock to syncronize simulator output against, defaults to
         a phase delayed version of the digital_control clock.
@@ -38,6 +49,17 @@ class MPSimulator(_BaseSimulator):
         initial state vector.
     decimal_places: `int`, optional
         number of decimal places used in simulation
+    closed_form_inputs: `bool`, `optional`
+        if True, the contributions of constant, sinusoidal, and ramp input
+        signals are computed by propagators precomputed at the specified
+        decimal places such that each control period amounts to a few
+        matrix multiplications. The remaining input signals are
+        integrated numerically. Defaults to False.
+    cache_dir: `str`, `optional`
+        a directory in which the precomputed propagators are cached
+        and reused between simulator instances with the same analog system,
+        digital control, clock, and precision. Defaults to the environment
+        variable CBADC_CACHE_DIR or, if not set, no caching.
 
     Attributes
     ----------
@@ -70,6 +92,8 @@ class MPSimulator(_BaseSimulator):
         initial_state_vector=None,
         tol: float = 1e-20,
         decimal_places=20,
+        closed_form_inputs: bool = False,
+        cache_dir: str = None,
     ):
         super().__init__(
             analog_system,
@@ -79,21 +103,53 @@ class MPSimulator(_BaseSimulator):
             t_stop,
             initial_state_vector,
         )
+        if any(
+            isinstance(s, cbadc.analog_signal.SampledSignal) for s in self.input_signals
+        ):
+            raise Exception(
+                "SampledSignal inputs have no arbitrary precision "
+                "representation; use the PreComputedControlSignalsSimulator "
+                "instead."
+            )
         # Fix decimal places
         self.dps = decimal_places
         self.tol = tol
         A = mp.matrix(analog_system._A_s)
         B = mp.matrix(analog_system._B_s)
         Gamma = mp.matrix(analog_system._Gamma_s)
+        self.closed_form_inputs = closed_form_inputs
+        self._cache_dir = _cache.cache_directory(cache_dir)
         tmp_dps = mp.dps
         mp.dps = self.dps
-        tmp_Af, tmp_Gamma_f = invariant_system_solver(
-            A,
-            Gamma,
-            [s for s in digital_control._impulse_response],
-            (0, mp.mpf(self.clock.T)),
-            tol=self.tol,
+        cache_key = _cache.key(
+            "MPSimulator",
+            _exact(A),
+            _exact(Gamma),
+            [
+                (
+                    type(impulse_response).__name__,
+                    sorted(vars(impulse_response).items()),
+                )
+                for impulse_response in digital_control._impulse_response
+            ],
+            self.clock.T,
+            self.dps,
+            self.tol,
         )
+        cached = _cache.load(self._cache_dir, cache_key)
+        if cached is None:
+            tmp_Af, tmp_Gamma_f = invariant_system_solver(
+                A,
+                Gamma,
+                [s for s in digital_control._impulse_response],
+                (0, mp.mpf(self.clock.T)),
+                tol=self.tol,
+            )
+            _cache.store(
+                self._cache_dir, cache_key, (tmp_Af.tolist(), tmp_Gamma_f.tolist())
+            )
+        else:
+            tmp_Af, tmp_Gamma_f = (mp.matrix(value) for value in cached)
 
         self.A = A
         self.B = B
@@ -101,8 +157,44 @@ class MPSimulator(_BaseSimulator):
         self.Gamma_f = tmp_Gamma_f
         self.Gamma_tilde_f = mp.matrix(analog_system.Gamma_tildeT)
         self._state_vector = mp.matrix(self._state_vector)
+        self._input_pre_computations()
         mp.dps = tmp_dps
 
+    def _input_pre_computations(self):
+        """Select, and precompute, the closed-form input contributions."""
+        self._input_contributions = []
+        self._numerical_inputs = list(range(self.analog_system.L))
+        if not self.closed_form_inputs:
+            return
+        self._numerical_inputs = []
+        for l, signal in enumerate(self.input_signals):
+            contribution = _mp_closed_form_input_contribution(
+                self.A, self.B[:, l], signal, self.clock.T
+            )
+            if contribution is None:
+                logger.info(
+                    f"No closed-form solution for input signal {l}, falling back to numerical integration."
+                )
+                self._numerical_inputs.append(l)
+                continue
+            cache_key = _cache.key(
+                "MPSimulator input",
+                _exact(self.A),
+                _exact(self.B[:, l]),
+                contribution.cache_key(),
+                self.clock.T,
+                self.dps,
+            )
+            cached = _cache.load(self._cache_dir, cache_key)
+            if cached is None:
+                contribution.propagator = contribution.compute_propagator()
+                _cache.store(
+                    self._cache_dir, cache_key, contribution.propagator.tolist()
+                )
+            else:
+                contribution.propagator = mp.matrix(cached)
+            self._input_contributions.append(contribution)
+
     def _ode_solver_1(self, t_span: Tuple[float, float]):
         def diff_equation(x, y):
             res = mp.matrix(self.analog_system.N, 1)
@@ -125,24 +217,44 @@ class MPSimulator(_BaseSimulator):
             for n in range(self.analog_system.N):
                 for nn in range(self.analog_system.N):
                     res[n] += self.A[n, nn] * y[nn]
-            for l in range(self.analog_system.L):
+            for l in self._numerical_inputs:
                 res += self.B[:, l] * self.input_signals[l]._mpmath(x)
             return res
 
-        f = mp.odefun(
-            diff_equation,
-            t_span[0],
-            [0 for _ in range(self.analog_system.N)],
-            tol=self.tol,
-        )
-        res = mp.matrix(f(t_span[1]))
-        res += mp.matrix(self.Af * self._state_vector)
+        res = mp.matrix(self.Af * self._state_vector)
+        if self._numerical_inputs:
+            f = mp.odefun(
+                diff_equation,
+                t_span[0],
+                [0 for _ in range(self.analog_system.N)],
+                tol=self.tol,
+            )
+            res += mp.matrix(f(t_span[1]))
+        t = mp.mpf(t_span[0])
+        for contribution in self._input_contributions:
+            res += contribution(t)
         mp.dps = tmp_dps
         return res
 
+    def _simulate_block(
+        self,
+        control_signals: np.ndarray,
+        index: int,
+        states: np.ndarray,
+        state_decimation: int,
+    ) -> int:
+        # set the precision once per block rather than once per step.
+        with mp.workdps(self.dps):
+            return super()._simulate_block(
+                control_signals, index, states, state_decimation
+            )
+
     def __next__(self) -> np.ndarray:
         """Computes the next control signal :math:`\mathbf{s}[k]`"""
+        with mp.workdps(self.dps):
+            return super().__next__()
 
+    def _next(self) -> np.ndarray:
         t_end: float = self.t + self.clock.T
         t_span = np.array((self.t, t_end))
         if t_end >= self.t_stop:
@@ -159,11 +271,13 @@ class MPSimulator(_BaseSimulator):
         )
 
         # Update controls for next period if necessary
-        self.digital_control.control_update(
+        self._control_update(
             t_span[1],
             np.array(self.Gamma_tilde_f * self._state_vector, dtype=np.double),
         )
         self.t = t_end
+        if self.state_bounds is not None:
+            self._monitor_state_bounds()
         return self.digital_control.control_signal()
 
     def __str__(self):
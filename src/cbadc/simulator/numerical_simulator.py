@@ -9,11 +9,87 @@ import scipy.linalg
 import math
 from typing import List
 from ._base_simulator import _BaseSimulator
+from ._propagators import (
+    _closed_form_input_contributions,
+    _dac_end_matrix,
+    _draw_perturbations,
+    _noise_factor,
+    _perturbation_generators,
+    _van_loan,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+def _pre_computed_control_matrix(
+    analog_system: cbadc.analog_system._valid_analog_system_types,
+    digital_control: cbadc.digital_control._valid_digital_control_types,
+    atol: float,
+    rtol: float,
+    t_span: tuple = None,
+) -> np.ndarray:
+    """Computes the control contribution matrix
+
+    :math:`\mathbf{A}_c = \int_{t_1}^{t_2} \exp\\left(\mathbf{A} (t_2 - \\tau)\\right) \mathbf{\Gamma} \mathbf{d}(\\tau) \mathrm{d} \\tau`
+
+    where :math:`\mathbf{d}(\\tau)` is the DAC waveform (or impulse response)
+    of the digital control and, by default, :math:`t_1=0` and :math:`t_2=T`
+    its clock period.
+
+    Parameters
+    ----------
+    analog_system : :py:class:`cbadc.analog_system.AnalogSystem`
+        the analog system
+    digital_control: :py:class:`cbadc.digital_control.DigitalControl`
+        the digital control
+    atol, rtol : `float`
+        absolute and relative tolerance of the numerical solver.
+    t_span: (`float`, `float`), `optional`
+        the integration interval :math:`(t_1, t_2)` within a clock period,
+        defaults to the full clock period.
+
+    Returns
+    -------
+    `array_like`, shape=(N, M)
+        the control contribution matrix.
+    """
+    if t_span is None:
+        t_span = (0.0, digital_control.clock.T)
+    control_matrix = np.zeros((analog_system.N, analog_system.M))
+
+    for m in range(analog_system.M):
+
+        def derivative(t, x):
+            dac_waveform = digital_control.impulse_response(m, t)
+            return analog_system._A_operator.dot(x) + analog_system._Gamma_operator.dot(
+                dac_waveform
+            )
+
+        def impulse_start(t, x):
+            return t - digital_control._impulse_response[m].t0
+
+        # impulse_start.terminate = True
+        impulse_start.direction = 1.0
+
+        tspan = np.array(t_span, dtype=np.double)
+
+        sol = scipy.integrate.solve_ivp(
+            derivative,
+            (tspan[0], tspan[1]),
+            np.zeros((analog_system.N)),
+            atol=atol,
+            rtol=rtol,
+            # method="RK45",
+            method="Radau",
+            # method="DOP853",
+            jac=analog_system._A_operator,
+            events=(impulse_start,),
+        )
+        control_matrix[:, m] = sol.y[:, -1]
+    return control_matrix
+
+
 class FullSimulator(_BaseSimulator):
     """Simulate the analog system and digital control interactions
     in the presence on analog signals.
@@ -52,6 +128,12 @@ class FullSimulator(_BaseSimulator):
         :py:func:`scipy.integrate.solve_ivp`. Default to 1e-3 for rtol and 1e-6 for atol.
     initial_state_vector: `array_like`, shape=(N), `optional`
         initial state vector.
+    event_driven: `bool`, `optional`
+        propagate the state analytically, using cached matrix exponentials,
+        between control events instead of numerically solving the full
+        differential equation, defaults to False. Requires
+        :py:class:`cbadc.analog_signal.StepResponse` or
+        :py:class:`cbadc.analog_signal.RCImpulseResponse` DAC waveforms.
 
 
     Yields
@@ -69,6 +151,7 @@ class FullSimulator(_BaseSimulator):
         initial_state_vector=None,
         atol: float = 1e-20,
         rtol: float = 1e-12,
+        event_driven: bool = False,
     ):
         super().__init__(
             analog_system,
@@ -80,8 +163,11 @@ class FullSimulator(_BaseSimulator):
         )
         self.atol = atol
         self.rtol = rtol
+        self.event_driven = event_driven
+        if self.event_driven:
+            self._event_driven_pre_computations()
 
-    def __next__(self) -> np.ndarray:
+    def _next(self) -> np.ndarray:
         """Computes the next control signal :math:`\mathbf{s}[k]`"""
 
         t_end: float = self.t + self.clock.T
@@ -89,13 +175,158 @@ class FullSimulator(_BaseSimulator):
         if t_end >= self.t_stop:
             raise StopIteration
         # Solve full diff equation.
-        self._state_vector = self._full_ordinary_differential_solution(t_span)
+        if self.event_driven:
+            self._state_vector = self._event_driven_solution(t_span)
+        else:
+            self._state_vector = self._full_ordinary_differential_solution(t_span)
         self.t = t_end
+        if self.state_bounds is not None:
+            self._monitor_state_bounds()
         return self.digital_control.control_signal()
 
     def _analog_system_matrix_exponential(self, t: float) -> np.ndarray:
         return np.asarray(scipy.linalg.expm(np.asarray(self.analog_system.A) * t))
 
+    # resolution, relative to the clock period, of the cached propagators.
+    _dt_resolution = 2.0**-40
+
+    def _event_driven_pre_computations(self):
+        """Determine the DAC waveform generator and closed-form input
+        contributions of the event-driven solver.
+
+        Between control events each DAC waveform follows
+        :math:`\dot{w}_m(t) = \lambda_m w_m(t)` where :math:`\lambda_m = 0`
+        for a :py:class:`cbadc.analog_signal.StepResponse` and
+        :math:`\lambda_m = - 1 / \\tau` for a
+        :py:class:`cbadc.analog_signal.RCImpulseResponse`.
+        """
+        self._dac_poles = np.zeros(self.digital_control.M, dtype=np.double)
+        for m, impulse_response in enumerate(self.digital_control._impulse_response):
+            if isinstance(impulse_response, cbadc.analog_signal.StepResponse):
+                self._dac_poles[m] = 0.0
+            elif isinstance(impulse_response, cbadc.analog_signal.RCImpulseResponse):
+                self._dac_poles[m] = -1.0 / impulse_response.tau
+            else:
+                logger.warning(
+                    f"No closed-form DAC waveform for {impulse_response}, falling back to numerical integration."
+                )
+                self.event_driven = False
+                return
+        self._propagators = {}
+        (
+            self._input_contributions,
+            self._numerical_inputs,
+        ) = _closed_form_input_contributions(
+            self.analog_system.A, self.analog_system.B, self.input_signals
+        )
+
+    def _propagator(self, dt: float):
+        """Return the, cached, state transition and DAC waveform integral
+
+        :math:`\exp\\left(\mathbf{A} \Delta t\\right)` and
+        :math:`\int_0^{\Delta t} \exp\\left(\mathbf{A} (\Delta t - \\tau) \\right) \mathbf{\Gamma} \exp\\left(\mathbf{\Lambda} \\tau \\right) \mathrm{d} \\tau`
+
+        where :math:`\Delta t` is quantized to a fraction of the clock period.
+        """
+        key = int(round(dt / (self.clock.T * self._dt_resolution)))
+        if key not in self._propagators:
+            self._propagators[key] = _van_loan(
+                self.analog_system.A,
+                self.analog_system.Gamma,
+                np.diag(self._dac_poles),
+                key * self.clock.T * self._dt_resolution,
+            )
+        return self._propagators[key]
+
+    def _event_driven_solution(self, t_span: np.ndarray) -> np.ndarray:
+        """Computes the state trajectory by propagating the state analytically
+        from event to event.
+
+        The events are the control updates, i.e., the digital control's next
+        update time, and the start of each DAC waveform. In between events
+        the system is linear time-invariant such that
+
+        :math:`\mathbf{x}(t + \Delta t) = \exp\\left(\mathbf{A} \Delta t\\right) \mathbf{x}(t) + \int_0^{\Delta t} \exp\\left(\mathbf{A} (\Delta t - \\tau) \\right) \\left(\mathbf{\Gamma} \mathbf{w}(t + \\tau) + \mathbf{B} \mathbf{u}(t + \\tau) \\right) \mathrm{d} \\tau`
+
+        where :math:`\mathbf{w}(t)` is the DAC waveform. Only input signals
+        without a closed-form contribution are integrated numerically.
+
+        Parameters
+        ----------
+        t_span : (float, float)
+            the initial time :math:`t_1` and end time :math:`t_2` of the
+            simulation.
+
+        Returns
+        -------
+        array_like, shape=(N,)
+            computed state vector.
+        """
+        t = t_span[0]
+        x = self._state_vector[:]
+        atol_clock = self.digital_control.clock.T * 1e-4
+        t0_impulse_response = np.array(
+            [
+                impulse_response.t0
+                for impulse_response in self.digital_control._impulse_response
+            ]
+        )
+        while t_span[1] - t > atol_clock:
+            # the next event
+            candidates = np.hstack(
+                (
+                    self.digital_control._t_next,
+                    self.digital_control._t_last_update + t0_impulse_response,
+                )
+            )
+            candidates = candidates[
+                (candidates > t + atol_clock) & (candidates < t_span[1])
+            ]
+            t_event = np.min(candidates) if candidates.size else t_span[1]
+            dt = t_event - t
+
+            # the DAC waveform at the start of the interval
+            w = self.digital_control.control_contribution(t + dt / 2.0) * np.exp(
+                -self._dac_poles * dt / 2.0
+            )
+            transition, control = self._propagator(dt)
+            x = np.dot(transition, x) + np.dot(control, w)
+            for contribution in self._input_contributions:
+                x += contribution(t, dt)
+            if self._numerical_inputs:
+                x += self._timed(
+                    "input_integration_time", self._numerical_input_contribution
+                )(t, t_event)
+            t = t_event
+
+            if abs(t - self.digital_control._t_next) <= atol_clock or (
+                t_span[1] - t <= atol_clock
+            ):
+                self._control_update(t, self.analog_system.control_observation(x))
+        return x
+
+    def _numerical_input_contribution(self, t0: float, t1: float) -> np.ndarray:
+        def f(t, x):
+            res = self.analog_system._A_operator.dot(x)
+            for _l in self._numerical_inputs:
+                res += np.dot(
+                    self.analog_system.B[:, _l], self.input_signals[_l].evaluate(t)
+                )
+            return res.flatten()
+
+        sol = scipy.integrate.solve_ivp(
+            f,
+            (t0, t1),
+            np.zeros(self.analog_system.N),
+            atol=self.atol,
+            rtol=self.rtol,
+        )
+        if self._statistics is not None:
+            self._statistics.record_ivp(sol)
+        if sol.status == -1:
+            logger.critical(f"IVP solver failed, See:\n\n{sol}")
+        return sol.y[:, -1]
+
     def _full_ordinary_differential_solution(self, t_span: np.ndarray) -> np.ndarray:
         def f(t: float, y: np.ndarray):
             """Solve the differential computational problem
@@ -153,15 +384,15 @@ class FullSimulator(_BaseSimulator):
                 # method="DOP853",
                 events=(control_update, *t0_impulse_response),
             )
+            if self._statistics is not None:
+                self._statistics.record_ivp(res)
             if res.status == -1:
                 logger.critical(f"IVP solver failed, See:\n\n{res}")
             # In case of control update event
             t = res.t[-1]
             y_new = res.y[:, -1]
             if res.status == 1 or t == t_span[1]:
-                self.digital_control.control_update(
-                    t, np.dot(self.analog_system.Gamma_tildeT, y_new)
-                )
+                self._control_update(t, self.analog_system.control_observation(y_new))
         return y_new
 
     def __str__(self):
@@ -190,7 +421,12 @@ class PreComputedControlSignalsSimulator(_BaseSimulator):
         a python list of analog signals (or a derived class)
     clock: :py:class:`cbadc.simulator.clock`, `optional`
         a clock to syncronize simulator output against, defaults to
-        a phase delayed version of the digital_control clock.
+        a phase delayed version of the digital_control clock. The clock
+        period must be an integer fraction or multiple of the digital
+        control clock period. For a fraction :math:`T / P` the state is
+        advanced, and observed, :math:`P` times per control period using
+        partial DAC waveform integrals per phase. For a multiple
+        :math:`R T` every :math:`R`:th control period is output.
     t_stop : `float`, optional
         determines a stop time, defaults to :py:obj:`math.inf`
     initial_state_vector: `array_like`, shape=(N), `optional`
@@ -199,6 +435,30 @@ class PreComputedControlSignalsSimulator(_BaseSimulator):
         Relative and absolute tolerances. The solver keeps the local error estimates less
         than atol + rtol * abs(y). Effects the underlying solver as described in
         :py:func:`scipy.integrate.solve_ivp`. Default to 1e-3 for rtol and 1e-6 for atol.
+    closed_form_inputs: `bool`, `optional`
+        compute the input signal contribution of
+        :py:class:`cbadc.analog_signal.Sinusoidal`,
+        :py:class:`cbadc.analog_signal.ConstantSignal`,
+        :py:class:`cbadc.analog_signal.Ramp`, and
+        :py:class:`cbadc.analog_signal.SampledSignal` input signals from
+        precomputed matrix exponentials instead of numerically solving an
+        initial value problem every clock period, defaults to True. Other
+        input signal types are always integrated numerically.
+    noise_covariance: `array_like`, shape=(N, N), `optional`
+        the covariance density :math:`\mathbf{\Sigma}` of white (thermal) noise
+        :math:`\mathbf{w}(t)` driving the analog system as
+        :math:`\dot{\mathbf{x}}(t) = \dots + \mathbf{w}(t)`, defaults to None,
+        i.e., no noise. The integrated noise covariance per clock period
+        is precomputed and its factor applied to blocks of normal draws.
+    jitter_std: `float`, `optional`
+        the standard deviation of the (non-accumulating) sampling clock
+        jitter [s], defaults to 0. The state is perturbed to first order
+        as :math:`\mathbf{x}(t_k + \delta_k) \approx \mathbf{x}(t_k) + \delta_k \dot{\mathbf{x}}(t_k)`.
+    seed: `int` or :py:class:`numpy.random.SeedSequence`, `optional`
+        seeds the counter-based (Philox) noise and jitter generators, defaults
+        to None, i.e., fresh entropy. For independent streams, e.g., one per
+        worker, pass the children of
+        :py:func:`numpy.random.SeedSequence.spawn`.
 
 
     Attributes
@@ -234,6 +494,10 @@ class PreComputedControlSignalsSimulator(_BaseSimulator):
         initial_state_vector=None,
         atol: float = 1e-12,
         rtol: float = 1e-8,
+        closed_form_inputs: bool = True,
+        noise_covariance: np.ndarray = None,
+        jitter_std: float = 0.0,
+        seed=None,
     ):
         _BaseSimulator.__init__(
             self,
@@ -248,23 +512,169 @@ class PreComputedControlSignalsSimulator(_BaseSimulator):
         self._temp_state_vector = np.zeros(self.analog_system.N, dtype=np.double)
         self.atol = atol
         self.rtol = rtol
-        if self.clock.T != self.digital_control.clock.T:
+        self.closed_form_inputs = closed_form_inputs
+        self.noise_covariance = noise_covariance
+        if jitter_std < 0:
+            raise Exception("jitter_std must be non-negative.")
+        self.jitter_std = jitter_std
+        self.seed = seed
+        self._multi_rate()
+        self._pre_computations()
+
+    _checkpoint_attributes = _BaseSimulator._checkpoint_attributes + (
+        "_noise_generator",
+        "_jitter_generator",
+        "_jitter_last",
+        "_phase",
+    )
+
+    def _multi_rate(self):
+        """Determine the simulation step and the integer ratio between the
+        simulation and digital control clocks.
+
+        The state is advanced in steps of the shorter of the two clock
+        periods. Each control period consists of _phases steps and each
+        simulation clock period of _stride steps.
+        """
+        ratio = self.clock.T / self.digital_control.clock.T
+        if ratio >= 1:
+            self._phases, self._stride = 1, int(round(ratio))
+            self._step = self.digital_control.clock.T
+        else:
+            self._phases, self._stride = int(round(1.0 / ratio)), 1
+            self._step = self.clock.T
+        if not np.isclose(
+            self._phases * self.clock.T,
+            self._stride * self.digital_control.clock.T,
+            rtol=1e-9,
+            atol=0.0,
+        ):
             raise Exception(
-                "For this simulator, both simulation clock and digital control clock must have same clock period."
+                "For this simulator, the simulation clock period must be an integer fraction or multiple of the digital control clock period."
             )
-        self._pre_computations()
+        if self.jitter_std > 0 and (self._phases > 1 or self._stride > 1):
+            raise Exception(
+                "Clock jitter requires the simulation and digital control clocks to have the same clock period."
+            )
+        # the phase of the next step within the control period
+        self._phase = 0
 
-    def __next__(self) -> np.ndarray:
+    def _next(self) -> np.ndarray:
         """Computes the next control signal :math:`\mathbf{s}[k]`"""
 
-        t_end: float = self.t + self.clock.T
-        t_span = np.array((self.t, t_end))
-        if t_end >= self.t_stop:
+        t = [self.t]
+        for _ in range(self._stride):
+            t.append(t[-1] + self._step)
+        if t[-1] >= self.t_stop:
             raise StopIteration
-        self._state_vector = self._ordinary_differential_solution(t_span)
-        self.t = t_end
+        for k in range(self._stride):
+            t_span = np.array(t[k : k + 2])
+            self._state_vector = self._ordinary_differential_solution(t_span)
+        self.t = t[-1]
+        if self.state_bounds is not None:
+            self._monitor_state_bounds()
         return self.digital_control.control_signal()
 
+    def _simulate_block(
+        self,
+        control_signals: np.ndarray,
+        index: int,
+        states: np.ndarray,
+        state_decimation: int,
+    ) -> int:
+        # the same time grid as repeatedly calling __next__
+        P, S = self._phases, self._stride
+        t = np.cumsum(
+            np.hstack(
+                (self.t, np.full(control_signals.shape[0] * S, self._step, np.double))
+            )
+        )
+        K = int(np.searchsorted(t[S::S], self.t_stop, side="left"))
+        if K < 1:
+            return 0
+        t = t[: K * S + 1]
+        input_contributions, jitter, jitter_inputs = self._timed(
+            "input_integration_time", self._block_input_contributions
+        )(t)
+
+        state_transition = self._pre_computed_state_transition_matrix
+        control_matrices = self._pre_computed_phase_control_matrices
+        A = self.analog_system._A_operator
+        dac_end_matrix = self._dac_end_matrix
+        Gamma_tildeT = self.analog_system._Gamma_tildeT_operator
+        digital_control = self.digital_control
+        control_update = self._timed(
+            "control_update_time", digital_control.control_update
+        )
+        # the consumed input contributions are overwritten by the trajectory
+        monitor = self.state_bounds is not None
+        x = self._state_vector
+        phase = self._phase
+        for k in range(K * S):
+            control = 2.0 * digital_control._s - 1.0
+            x = (
+                np.dot(state_transition, x)
+                + input_contributions[k, :]
+                + np.dot(control_matrices[phase], control)
+            )
+            if jitter is not None:
+                x = (
+                    x
+                    + jitter[k] * (A.dot(x) + np.dot(dac_end_matrix, control))
+                    + jitter_inputs[k, :]
+                )
+            phase += 1
+            if phase == P:
+                phase = 0
+                control_update(t[k + 1], Gamma_tildeT.dot(x))
+            if S > 1 and (k + 1) % S:
+                continue
+            j = k // S
+            control_signals[j, :] = digital_control.control_signal()
+            if states is not None and (index + j) % state_decimation == 0:
+                states[(index + j) // state_decimation, :] = x
+            if monitor:
+                input_contributions[j, :] = x
+        self._state_vector = x
+        self._phase = phase
+        self.t = t[K * S]
+        if monitor:
+            self.state_bounds.monitor(t[S::S], input_contributions[:K, :])
+        return K
+
+    def _block_input_contributions(self, t: np.ndarray):
+        """Computes the input signal contributions, including noise, and
+        the jitter perturbations of a block.
+
+        Parameters
+        ----------
+        t: `array_like`, shape=(K + 1,)
+            the time grid of the block.
+
+        Returns
+        -------
+        `array_like`, shape=(K, N)
+            the input signal contributions.
+        `array_like`, shape=(K,)
+            the sampling time perturbations or None, see
+            :py:func:`cbadc.simulator.PreComputedControlSignalsSimulator._perturbations`.
+        `array_like`, shape=(K, N)
+            the input signal contribution to the jitter perturbation or None.
+        """
+        K = t.size - 1
+        input_contributions = np.zeros((K, self.analog_system.N), dtype=np.double)
+        if self._numerical_inputs:
+            for k in range(K):
+                input_contributions[k, :] = self._input_contribution(t[k : k + 2])
+        else:
+            for contribution in self._input_contributions:
+                input_contributions += contribution.block(t[:K], self._step)
+
+        noise, jitter, jitter_inputs = self._perturbations(t)
+        if noise is not None:
+            input_contributions += noise
+        return input_contributions, jitter, jitter_inputs
+
     def _analog_system_matrix_exponential(self, t: float) -> np.ndarray:
         return np.asarray(scipy.linalg.expm(np.asarray(self.analog_system.A) * t))
 
@@ -282,47 +692,172 @@ class PreComputedControlSignalsSimulator(_BaseSimulator):
 
         are computed where the formed describes the state transition and the latter
         the control contributions. Furthermore, :math:`\mathbf{d}(\tau)` is the DAC waveform
-        (or impulse response) of the digital control.
+        (or impulse response) of the digital control. For simulation clocks
+        faster than the digital control clock, :math:`T_s` is the simulation
+        clock period and the control contributions are integrated over each
+        phase :math:`[p T_s, (p + 1) T_s]` of the control period.
         """
         logger.info("Executing precomputations.")
         # expm(A T_s)
         self._pre_computed_state_transition_matrix = (
-            self._analog_system_matrix_exponential(self.clock.T)
+            self._analog_system_matrix_exponential(self._step)
         )
 
-        self._pre_computed_control_matrix = np.zeros(
-            (self.analog_system.N, self.analog_system.M)
+        self._pre_computed_control_matrix = _pre_computed_control_matrix(
+            self.analog_system, self.digital_control, self.atol, self.rtol
         )
+        if self._phases > 1:
+            self._pre_computed_phase_control_matrices = np.array(
+                [
+                    _pre_computed_control_matrix(
+                        self.analog_system,
+                        self.digital_control,
+                        self.atol,
+                        self.rtol,
+                        (phase * self._step, (phase + 1) * self._step),
+                    )
+                    for phase in range(self._phases)
+                ]
+            )
+        else:
+            self._pre_computed_phase_control_matrices = (
+                self._pre_computed_control_matrix[None, :, :]
+            )
+        self._input_pre_computations()
+        self._noise_pre_computations()
 
-        for m in range(self.analog_system.M):
+    def _noise_pre_computations(self):
+        """Precomputes the thermal noise and clock jitter perturbations.
 
-            def derivative(t, x):
-                dac_waveform = self.digital_control.impulse_response(m, t)
-                return np.dot(self.analog_system.A, x) + np.dot(
-                    self.analog_system.Gamma, dac_waveform
-                )
+        Specifically, the factor :math:`\mathbf{L}` of the integrated noise
+        covariance
 
-            def impulse_start(t, x):
-                return t - self.digital_control._impulse_response[m].t0
+        :math:`\mathbf{L} \mathbf{L}^\mathsf{T} = \int_{0}^{T_s} \exp\left(\mathbf{A} \tau\right) \mathbf{\Sigma} \exp\left(\mathbf{A}^\mathsf{T} \tau\right) \mathrm{d} \tau`
 
-            # impulse_start.terminate = True
-            impulse_start.direction = 1.0
+        and the DAC contribution :math:`\mathbf{\Gamma} \mathbf{d}(T_s)` to the
+        state derivative at the end of a clock period.
+        """
+        self._noise_factor = None
+        if self.noise_covariance is not None:
+            self._noise_factor = _noise_factor(
+                self.analog_system.A, self.noise_covariance, self._step
+            )
+        self._dac_end_matrix = None
+        if self.jitter_std > 0:
+            self._dac_end_matrix = _dac_end_matrix(
+                self.analog_system.Gamma, self.digital_control, self.clock.T
+            )
+        self._seed_generators()
 
-            tspan = np.array([0, self.digital_control.clock.T])
+    def _seed_generators(self):
+        """(Re)create the noise and jitter generators from the seed."""
+        self._noise_generator, self._jitter_generator = _perturbation_generators(
+            self.seed, self.noise_covariance is not None, self.jitter_std > 0
+        )
+        self._jitter_last = 0.0
 
-            sol = scipy.integrate.solve_ivp(
-                derivative,
-                (tspan[0], tspan[1]),
-                np.zeros((self.analog_system.N)),
-                atol=self.atol,
-                rtol=self.rtol,
-                # method="RK45",
-                method="Radau",
-                # method="DOP853",
-                jac=self.analog_system.A,
-                events=(impulse_start,),
+    def _perturbations(self, t: np.ndarray):
+        """Draw the noise and jitter perturbations of a block.
+
+        Parameters
+        ----------
+        t: `array_like`, shape=(K + 1,)
+            the time grid of the block.
+
+        Returns
+        -------
+        `array_like`, shape=(K, N)
+            the state noise or None.
+        `array_like`, shape=(K,)
+            the sampling time perturbations :math:`\delta_{k} - \delta_{k-1}`
+            or None.
+        `array_like`, shape=(K, N)
+            the input signal contribution to the jitter perturbation or None.
+        """
+        # the perturbations of a single, P = 1, perturbed simulation
+        noise, jitter, jitter_inputs, jitter_last = _draw_perturbations(
+            t,
+            [self.input_signals],
+            self.analog_system.B,
+            None if self._noise_generator is None else [self._noise_generator],
+            self._noise_factor,
+            None if self._jitter_generator is None else [self._jitter_generator],
+            self.jitter_std,
+            np.array([self._jitter_last]),
+        )
+        self._jitter_last = float(jitter_last[0])
+        if noise is not None:
+            noise = noise[:, 0, :]
+        if jitter is not None:
+            jitter, jitter_inputs = jitter[:, 0], jitter_inputs[:, 0, :]
+        return noise, jitter, jitter_inputs
+
+    def _input_pre_computations(self):
+        """Precomputes the closed-form input signal contributions.
+
+        Input signals without a known closed-form solution are instead
+        integrated numerically every clock period.
+        """
+        if self.closed_form_inputs:
+            (
+                self._input_contributions,
+                self._numerical_inputs,
+            ) = _closed_form_input_contributions(
+                self.analog_system.A, self.analog_system.B, self.input_signals
             )
-            self._pre_computed_control_matrix[:, m] = sol.y[:, -1]
+        else:
+            self._input_contributions = []
+            self._numerical_inputs = list(range(self.analog_system.L))
+
+    def _input_contribution(self, t_span: np.ndarray) -> np.ndarray:
+        """Computes the input signal contribution
+
+        :math:`\mathbf{u}_{c} = \int_{t_1}^{t_2} \exp\\left(\mathbf{A} (t_2 - \\tau)\\right) \mathbf{B} \mathbf{u}(\\tau) \mathrm{d} \\tau`
+
+        using the closed-form contributions where available and a numerical
+        solver for the remaining input signals.
+
+        Parameters
+        ----------
+        t_span : (float, float)
+            the initial time :math:`t_1` and end time :math:`t_2` of the
+            simulation.
+
+        Returns
+        -------
+        array_like, shape=(N,)
+            the input signal contribution.
+        """
+        dt = t_span[1] - t_span[0]
+        res = np.zeros(self.analog_system.N, dtype=np.double)
+        for contribution in self._input_contributions:
+            res += contribution(t_span[0], dt)
+        if not self._numerical_inputs:
+            return res
+
+        def f(t, x):
+            res = self.analog_system._A_operator.dot(x)
+            for _l in self._numerical_inputs:
+                res += np.dot(
+                    self.analog_system.B[:, _l], self.input_signals[_l].evaluate(t)
+                )
+            return res.flatten()
+
+        sol = scipy.integrate.solve_ivp(
+            f,
+            (t_span[0], t_span[1]),
+            np.zeros(self.analog_system.N),
+            atol=self.atol,
+            rtol=self.rtol,
+            method="RK45",
+        )
+
+        if self._statistics is not None:
+            self._statistics.record_ivp(sol)
+        if sol.status == -1:
+            logger.critical(f"IVP solver failed, See:\n\n{sol}")
+
+        return res + sol.y[:, -1]
 
     def _ordinary_differential_solution(self, t_span: np.ndarray) -> np.ndarray:
         """Computes system ivp in three parts:
@@ -361,41 +896,40 @@ class PreComputedControlSignalsSimulator(_BaseSimulator):
         """
 
         # Compute signal contribution
-        def f(t, x):
-            res = np.dot(self.analog_system.A, x)
-            for _l in range(self.analog_system.L):
-                res += np.dot(
-                    self.analog_system.B[:, _l], self.input_signals[_l].evaluate(t)
-                )
-            return res.flatten()
-
-        sol = scipy.integrate.solve_ivp(
-            f,
-            (t_span[0], t_span[1]),
-            np.zeros(self.analog_system.N),
-            atol=self.atol,
-            rtol=self.rtol,
-            method="RK45",
-        )
-
-        if sol.status == -1:
-            logger.critical(f"IVP solver failed, See:\n\n{sol}")
-
-        self._temp_state_vector = sol.y[:, -1]
+        self._temp_state_vector = self._timed(
+            "input_integration_time", self._input_contribution
+        )(t_span)
 
         self._temp_state_vector += np.dot(
             self._pre_computed_state_transition_matrix, self._state_vector
         ).flatten()
 
+        control = np.asarray(2 * self.digital_control._s - 1, dtype=np.double)
         self._temp_state_vector += np.dot(
-            self._pre_computed_control_matrix,
-            np.asarray(2 * self.digital_control._s - 1, dtype=np.double),
+            self._pre_computed_phase_control_matrices[self._phase], control
         ).flatten()
 
-        # Update controls for next period if necessary
-        self.digital_control.control_update(
-            t_span[1], np.dot(self.analog_system.Gamma_tildeT, self._temp_state_vector)
-        )
+        noise, jitter, jitter_inputs = self._perturbations(t_span)
+        if noise is not None:
+            self._temp_state_vector += noise[0, :]
+        if jitter is not None:
+            self._temp_state_vector += (
+                jitter[0]
+                * (
+                    self.analog_system._A_operator.dot(self._temp_state_vector)
+                    + np.dot(self._dac_end_matrix, control)
+                )
+                + jitter_inputs[0, :]
+            )
+
+        # Update controls at the end of the control period
+        self._phase += 1
+        if self._phase == self._phases:
+            self._phase = 0
+            self._control_update(
+                t_span[1],
+                self.analog_system.control_observation(self._temp_state_vector),
+            )
 
         return self._temp_state_vector
 
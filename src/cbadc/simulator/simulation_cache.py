@@ -0,0 +1,387 @@
+"""Content-addressed cache of simulated control signals.
+
+Simulations are fingerprinted by everything determining their control
+signals, i.e., the analog system matrices, the digital control (clock,
+impulse responses, and state), the input signals, the initial state, the
+simulator type and tolerances, and the noise, jitter, and seed. The control
+signals are stored bit-packed in chunks together with a checkpoint of the
+simulator, such that a cached simulation can be extended by resuming the
+simulation where it ended.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import types
+from typing import Callable, Iterator
+import numpy as np
+import cbadc.analog_signal
+import cbadc.utilities
+from . import _cache
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(value):
+    """Map a value to a deterministic, hashable representation."""
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        return (
+            "ndarray",
+            value.dtype.str,
+            value.shape,
+            hashlib.sha256(value.tobytes()).hexdigest(),
+        )
+    if isinstance(value, (bool, int, float, complex, str, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_fingerprint(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((str(key), _fingerprint(value[key])) for key in sorted(value))
+    if isinstance(value, np.random.SeedSequence):
+        return (
+            "SeedSequence",
+            _fingerprint(value.entropy),
+            value.spawn_key,
+            value.pool_size,
+        )
+    if isinstance(value, (types.FunctionType, types.MethodType, type)):
+        return ("callable", value.__module__, value.__qualname__)
+    if hasattr(value, "Gamma_tildeT") and hasattr(value, "A"):
+        # analog systems are determined by their matrices, other attributes
+        # are symbolic representations or scratch buffers.
+        return (
+            type(value).__qualname__,
+            tuple(
+                _fingerprint(np.asarray(getattr(value, name), dtype=np.double))
+                for name in ("A", "B", "CT", "Gamma", "Gamma_tildeT", "D")
+            ),
+        )
+    if hasattr(value, "__dict__"):
+        return (type(value).__qualname__, _fingerprint(vars(value)))
+    return repr(value)
+
+
+class SimulationCache:
+    """A size bounded on-disk cache of simulated control signals
+
+    The cache is used by :py:func:`cbadc.simulator.get_simulator`, which then
+    returns a :py:class:`cbadc.simulator.CachedSimulator` that serves
+    previously simulated control signals from disk and only simulates, and
+    caches, samples beyond them. When the cache exceeds max_bytes, the least
+    recently used entries are evicted.
+
+    Parameters
+    ----------
+    directory: `str`, `optional`
+        the cache directory, defaults to the environment variable
+        CBADC_CACHE_DIR.
+    max_bytes: `int`, `optional`
+        the maximum size of the cache, defaults to 2^30 (1 GiB).
+    chunk_size: `int`, `optional`
+        the number of samples per stored chunk, defaults to 2^16.
+    """
+
+    def __init__(
+        self, directory: str = None, max_bytes: int = 1 << 30, chunk_size: int = 1 << 16
+    ):
+        directory = _cache.cache_directory(directory)
+        if directory is None:
+            raise Exception(
+                f"Specify a cache directory or set the environment variable {_cache._environment_variable}."
+            )
+        if chunk_size < 1:
+            raise Exception("chunk_size must be a positive integer.")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, *parts) -> str:
+        """Fingerprint a simulation.
+
+        Parameters
+        ----------
+        parts:
+            the objects and parameters determining the simulation.
+
+        Returns
+        -------
+        `str`
+            the cache key.
+        """
+        return _cache.key(_fingerprint(parts))
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def length(self, key: str) -> int:
+        """Return the number of cached samples of an entry."""
+        checkpoint = _cache.load(self._entry(key), "checkpoint")
+        return 0 if checkpoint is None else checkpoint["samples"]
+
+    def _touch(self, key: str):
+        """Mark an entry as recently used."""
+        try:
+            os.utime(os.path.join(self._entry(key), "checkpoint.pickle"))
+        except FileNotFoundError:
+            # an entry being removed concurrently
+            pass
+
+    def load_checkpoint(self, key: str):
+        """Return the simulator checkpoint at the end of an entry, or None,
+        and mark the entry as recently used."""
+        checkpoint = _cache.load(self._entry(key), "checkpoint")
+        if checkpoint is not None:
+            self._touch(key)
+        return checkpoint
+
+    def load_chunk(self, key: str, index: int, M: int) -> np.ndarray:
+        """Load the control signals of the chunk starting at sample index
+        and mark the entry as recently used.
+
+        Returns
+        -------
+        `array_like`, shape=(chunk_size, M), dtype=numpy.int8
+            the control signals.
+        """
+        packed = np.load(os.path.join(self._entry(key), f"{index:016d}.npy"))
+        self._touch(key)
+        return np.unpackbits(packed, axis=1, count=M).astype(np.int8)
+
+    def store(self, key: str, index: int, control_signals: np.ndarray, checkpoint):
+        """Append control signals to an entry.
+
+        Parameters
+        ----------
+        key: `str`
+            the cache key.
+        index: `int`
+            the sample index of the first control signal, which must be a
+            multiple of chunk_size.
+        control_signals: `array_like`, shape=(K, M)
+            at most chunk_size control signals.
+        checkpoint: `dict`
+            the simulator checkpoint after the last control signal.
+        """
+        entry = self._entry(key)
+        os.makedirs(entry, exist_ok=True)
+        fd, temporary_filename = tempfile.mkstemp(dir=entry, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.packbits(np.asarray(control_signals, bool), axis=1))
+            os.replace(temporary_filename, os.path.join(entry, f"{index:016d}.npy"))
+        except BaseException:
+            os.remove(temporary_filename)
+            raise
+        _cache.store(
+            entry,
+            "checkpoint",
+            {"samples": index + control_signals.shape[0], "simulator": checkpoint},
+        )
+        self._evict(keep=key)
+
+    def size(self) -> int:
+        """Return the size of the cache in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        entries = []
+        for key in os.listdir(self.directory):
+            entry = self._entry(key)
+            if not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(entry, filename))
+                    for filename in os.listdir(entry)
+                )
+                last_used = os.path.getmtime(os.path.join(entry, "checkpoint.pickle"))
+            except FileNotFoundError:
+                # an entry being written or removed concurrently
+                continue
+            entries.append((key, size, last_used))
+        return entries
+
+    def _evict(self, keep: str = None):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for key, entry_size, _ in entries:
+            if size <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            logger.info(f"Evicting simulation cache entry {key}.")
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            size -= entry_size
+
+    def clear(self):
+        """Remove all cache entries."""
+        for key, _, _ in self._entries():
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+
+
+class CachedSimulator(Iterator[np.ndarray]):
+    """A simulator served from a :py:class:`cbadc.simulator.SimulationCache`
+
+    Yields the same control signals as the underlying simulator. Cached
+    control signals are read from disk, and only samples beyond them are
+    simulated, by resuming the underlying simulator from the cached
+    checkpoint, and added to the cache.
+
+    Note that samples served from the cache do not advance the digital
+    control, and that state vectors are only available while simulating.
+
+    Parameters
+    ----------
+    cache: :py:class:`cbadc.simulator.SimulationCache`
+        the cache.
+    key: `str`
+        the fingerprint of the simulation.
+    simulator: `callable`
+        constructs the underlying simulator.
+    clock: :py:class:`cbadc.analog_signal.Clock`
+        the simulation clock.
+    M: `int`
+        the number of control signals.
+    t_stop : `float`
+        determines a stop time.
+    """
+
+    def __init__(
+        self,
+        cache: SimulationCache,
+        key: str,
+        simulator: Callable,
+        clock: cbadc.analog_signal.Clock,
+        M: int,
+        t_stop: float,
+    ):
+        self.cache = cache
+        self.key = key
+        self._simulator_factory = simulator
+        self._simulator = None
+        self.clock = clock
+        self.M = M
+        self.t_stop = t_stop
+        self.t = 0.0
+        self._index = 0
+        self._cached = cache.length(key)
+        self._chunk = None
+        self._chunk_index = -1
+        # the control signals of the chunk being simulated
+        self._buffer = np.zeros((cache.chunk_size, M), dtype=np.int8)
+        self._buffered = 0
+        self._buffer_index = 0
+
+    def _resume(self):
+        """Construct the underlying simulator at the end of the cache."""
+        self._simulator = self._simulator_factory()
+        checkpoint = self.cache.load_checkpoint(self.key)
+        if checkpoint is not None:
+            self._simulator.restore(checkpoint["simulator"])
+        self._cached = 0 if checkpoint is None else checkpoint["samples"]
+        if self._cached != self._index:
+            raise Exception("The simulation cache entry changed while reading it.")
+        self._buffered = self._cached % self.cache.chunk_size
+        self._buffer_index = self._cached - self._buffered
+        if self._buffered:
+            # the incomplete last chunk is extended
+            self._buffer[: self._buffered, :] = self.cache.load_chunk(
+                self.key, self._buffer_index, self.M
+            )
+
+    def _cached_samples(self, index: int, size: int) -> np.ndarray:
+        """Return at most size cached samples starting at index."""
+        chunk_index = index - index % self.cache.chunk_size
+        if chunk_index != self._chunk_index:
+            self._chunk = self.cache.load_chunk(self.key, chunk_index, self.M)
+            self._chunk_index = chunk_index
+        return self._chunk[index - chunk_index : index - chunk_index + size, :]
+
+    def _next_samples(self, size: int) -> np.ndarray:
+        """Return the next at most size control signals."""
+        if self._simulator is None and self._index >= self._cached:
+            # the entry might have been extended, e.g., by another process
+            self._cached = self.cache.length(self.key)
+        if self._simulator is None and self._index < self._cached:
+            control_signals = self._cached_samples(
+                self._index, min(size, self._cached - self._index)
+            )
+        else:
+            if self._simulator is None:
+                self._resume()
+            size = min(size, self.cache.chunk_size - self._buffered)
+            control_signals = self._buffer[self._buffered : self._buffered + size, :]
+            done = self._simulator.simulate(size, out=control_signals).shape[0]
+            if done < size:
+                raise Exception("The underlying simulator stopped.")
+            self._buffered += size
+            if self._buffered == self.cache.chunk_size:
+                self.flush()
+        self._index += control_signals.shape[0]
+        return control_signals
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> np.ndarray:
+        t_end = self.t + self.clock.T
+        if t_end >= self.t_stop:
+            self.flush()
+            raise StopIteration
+        control_signal = self._next_samples(1)[0, :].copy()
+        self.t = t_end
+        return control_signal
+
+    def simulate(self, n_samples: int, out: np.ndarray = None, packed: bool = False):
+        """Simulate a block of control signals.
+
+        See :py:func:`cbadc.simulator._BaseSimulator.simulate`, except that
+        state trajectories are not available.
+        """
+        # the same time grid as repeatedly calling __next__
+        t = np.cumsum(np.hstack((self.t, np.full(n_samples, self.clock.T, np.double))))
+        K = int(np.searchsorted(t[1:], self.t_stop, side="left"))
+        control_signals = np.zeros((K, self.M), dtype=np.int8)
+        index = 0
+        while index < K:
+            block = self._next_samples(K - index)
+            control_signals[index : index + block.shape[0], :] = block
+            index += block.shape[0]
+        self.t = t[K]
+        self.flush()
+        if packed:
+            control_signals = cbadc.utilities.pack_control_signals(control_signals)
+        if out is None:
+            return control_signals
+        if out.shape[0] != n_samples:
+            raise Exception(f"out must be an array of length {n_samples}")
+        out[:K] = control_signals
+        return out[:K]
+
+    def state_vector(self) -> np.ndarray:
+        """return the current analog system state vector, only available
+        when simulating beyond the cached samples."""
+        if self._simulator is None:
+            raise Exception("State vectors are not cached.")
+        return self._simulator.state_vector()
+
+    def flush(self):
+        """Store the simulated control signals not yet in the cache."""
+        if (
+            self._simulator is None
+            or self._buffer_index + self._buffered <= self._cached
+        ):
+            return
+        self.cache.store(
+            self.key,
+            self._buffer_index,
+            self._buffer[: self._buffered, :],
+            self._simulator.checkpoint(),
+        )
+        self._cached = self._buffer_index + self._buffered
+        if self._buffered == self.cache.chunk_size:
+            self._buffer_index += self._buffered
+            self._buffered = 0
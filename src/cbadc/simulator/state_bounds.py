@@ -1,10 +1,64 @@
 """Report system for states."""
 import numpy as np
 
+# the record type of outage and recovery events.
+_event_dtype = np.dtype([("t", np.double), ("state", np.int64)])
+
+
+class StateBoundsExceededError(Exception):
+    """Error when a state has exceeded its bounds for too long
+
+    Parameters
+    ----------
+    t : `float`
+        the time at which the simulation was aborted.
+    states : `array_like`
+        the indices of the states exceeding their bounds.
+    message: str
+        error message
+    """
+
+    def __init__(self, t, states, message):
+        super().__init__(message)
+        self.t = t
+        self.states = states
+        self.message = message
+
 
 class StateBounds:
-    def __init__(self, bounds: np.ndarray):
+    """Monitor the state vector for outages
 
+    An outage occurs when a state leaves its bounds, and the subsequent
+    recovery when it re-enters them. The monitor is assigned to a
+    simulator's state_bounds attribute, after which the simulator
+    validates every simulated state vector.
+
+    Parameters
+    ----------
+    bounds : `array_like`, shape=(N,) or shape=(N, 2)
+        either symmetric bounds :math:`|x_\\ell(t)| \leq b_\\ell`, or
+        upper and lower bounds as the first and second column.
+    abort_after : `int`, `optional`
+        if set, raise a :py:class:`cbadc.simulator.state_bounds.StateBoundsExceededError`
+        as soon as a state has been out of bounds for this many
+        consecutive samples, defaults to None.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from cbadc.simulator.state_bounds import StateBounds
+    >>> monitor = StateBounds(np.ones(2))
+    >>> monitor.monitor(np.arange(3.0), np.array([[0.5, 0], [1.5, 0], [0.5, 0]]))
+    >>> monitor.outages()
+    array([(1., 0)], dtype=[('t', '<f8'), ('state', '<i8')])
+    >>> monitor.recoveries()
+    array([(2., 0)], dtype=[('t', '<f8'), ('state', '<i8')])
+    >>> monitor.headroom()
+    array([-0.5,  1. ])
+    """
+
+    def __init__(self, bounds: np.ndarray, abort_after: int = None):
+        bounds = np.asarray(bounds, dtype=np.double)
         self._N = bounds.shape[0]
         self._outage = []
         self._recovery = []
@@ -17,23 +71,133 @@ class StateBounds:
             self._bounds_upper = np.abs(bounds[:])
             self._bounds_lower = -self._bounds_upper
 
+        if abort_after is not None and abort_after < 1:
+            raise Exception("abort_after must be a positive integer.")
+        self.abort_after = abort_after
+        self._out_of_bounds = np.zeros(self._N, dtype=bool)
+        # number of consecutive out of bounds samples per state
+        self._duration = np.zeros(self._N, dtype=np.int64)
+        self._max = np.full(self._N, -np.inf)
+        self._min = np.full(self._N, np.inf)
+        self.samples = 0
+
     def validate(self, state):
-        res = np.zeros(self._N)
-        for n in range(self._N):
-            if state[n] > 0:
-                res[n] = state - self._bounds_upper
-            else:
-                res[n] = -(state - self._bounds_lower)
-        return res
+        """Compute how far the states are outside their bounds.
+
+        Parameters
+        ----------
+        state : `array_like`, shape=(N,) or shape=(K, N)
+            a state vector or a sequence thereof.
+
+        Returns
+        -------
+        `array_like`, shape=(N,) or shape=(K, N)
+            the distance to the violated bound, positive if out of bounds.
+        """
+        state = np.asarray(state, dtype=np.double)
+        return np.where(
+            state > 0, state - self._bounds_upper, self._bounds_lower - state
+        )
+
+    def monitor(self, t, states):
+        """Monitor a sequence of state vectors.
+
+        Parameters
+        ----------
+        t : `array_like`, shape=(K,)
+            the times of the state vectors.
+        states : `array_like`, shape=(K, N)
+            the state vectors.
+
+        Raises
+        ------
+        :py:class:`cbadc.simulator.state_bounds.StateBoundsExceededError`
+            if a state has been out of bounds for abort_after consecutive
+            samples.
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=np.double))
+        states = np.asarray(states, dtype=np.double).reshape((t.size, self._N))
+        if t.size == 0:
+            return
+        self._max = np.maximum(self._max, states.max(axis=0))
+        self._min = np.minimum(self._min, states.min(axis=0))
+        self.samples += t.size
+
+        out_of_bounds = (states > self._bounds_upper) | (states < self._bounds_lower)
+        previous = np.vstack((self._out_of_bounds, out_of_bounds[:-1, :]))
+        for events, changed in (
+            (self._outage, out_of_bounds & ~previous),
+            (self._recovery, ~out_of_bounds & previous),
+        ):
+            k, n = np.nonzero(changed)
+            if k.size:
+                record = np.zeros(k.size, dtype=_event_dtype)
+                record["t"] = t[k]
+                record["state"] = n
+                events.append(record)
+
+        # number of consecutive out of bounds samples up to each sample
+        index = np.arange(t.size)[:, None]
+        last_in_bounds = np.maximum.accumulate(
+            np.where(out_of_bounds, -1, index), axis=0
+        )
+        duration = np.where(
+            last_in_bounds < 0, index + 1 + self._duration, index - last_in_bounds
+        )
+        self._duration = duration[-1, :]
+        if self.abort_after is not None:
+            exceeded = np.any(duration >= self.abort_after, axis=1)
+            if np.any(exceeded):
+                k = int(np.argmax(exceeded))
+                self._out_of_bounds = out_of_bounds[k, :]
+                states_exceeded = np.nonzero(duration[k, :] >= self.abort_after)[0]
+                raise StateBoundsExceededError(
+                    t[k],
+                    states_exceeded,
+                    f"States {states_exceeded} out of bounds for {self.abort_after} samples at t={t[k]}.",
+                )
+        self._out_of_bounds = out_of_bounds[-1, :]
+
+    def headroom(self) -> np.ndarray:
+        """Return the smallest distance to the bounds observed per state.
+
+        Returns
+        -------
+        `array_like`, shape=(N,)
+            the headroom, negative for states that exceeded their bounds.
+        """
+        return np.minimum(
+            self._bounds_upper - self._max, self._min - self._bounds_lower
+        )
+
+    def summary(self) -> dict:
+        """Summarize the monitored states.
+
+        Returns
+        -------
+        `dict`
+            containing the observed 'max' and 'min' states, the 'headroom',
+            the number of 'outages' per state, and the number of monitored
+            'samples'.
+        """
+        return {
+            "max": self._max.copy(),
+            "min": self._min.copy(),
+            "headroom": self.headroom(),
+            "outages": np.bincount(self.outages()["state"], minlength=self._N),
+            "samples": self.samples,
+        }
 
     def report_outage(self, event):
-        self._outage.append(event)
+        self._outage.append(np.array([event], dtype=_event_dtype))
 
     def outages(self):
-        return self._outage[:]
+        """Return the outage events as an array of (t, state) records."""
+        return np.concatenate([np.zeros(0, dtype=_event_dtype)] + self._outage)
 
     def report_recovery(self, event):
-        self._recovery.append(event)
+        self._recovery.append(np.array([event], dtype=_event_dtype))
 
     def recoveries(self):
-        return self._recovery[:]
+        """Return the recovery events as an array of (t, state) records."""
+        return np.concatenate([np.zeros(0, dtype=_event_dtype)] + self._recovery)
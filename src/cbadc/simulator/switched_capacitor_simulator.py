@@ -0,0 +1,312 @@
+"""Switched-capacitor digital control simulator."""
+import logging
+import cbadc.analog_system
+import cbadc.digital_control
+import cbadc.analog_signal
+import numpy as np
+import scipy.integrate
+import scipy.linalg
+import math
+from typing import List
+from ._base_simulator import _BaseSimulator
+from ._propagators import _closed_form_input_contributions
+
+logger = logging.getLogger(__name__)
+
+
+class SwitchedCapacitorSimulator(_BaseSimulator):
+    """Simulate the analog system and a switched-capacitor digital control
+
+    The analog system and the capacitor voltages :math:`\mathbf{v}(t)` of
+    a :py:class:`cbadc.digital_control.SwitchedCapacitorControl` are simulated
+    as the augmented state
+
+    :math:`\\begin{pmatrix} \dot{\mathbf{x}}(t) \\\\ \dot{\mathbf{v}}(t) \end{pmatrix} = \\begin{pmatrix} \mathbf{A} & \mathbf{\Gamma} \mathbf{D} \\\\ \mathbf{0} & \mathbf{D} \mathbf{A}_v \mathbf{D} \end{pmatrix} \\begin{pmatrix} \mathbf{x}(t) \\\\ \mathbf{v}(t) \end{pmatrix} + \\begin{pmatrix} \mathbf{B} \\\\ \mathbf{0} \end{pmatrix} \mathbf{u}(t)`
+
+    where the diagonal matrix :math:`\mathbf{D}` selects the capacitors
+    connected to the analog system and :math:`\mathbf{A}_v` is the capacitor
+    model of the digital control. The charge (:math:`T_1`) and discharge
+    (:math:`T_2`) instants of all controls partition the clock period
+    into segments of constant :math:`\mathbf{D}`. The augmented state
+    transition matrices of the segments are precomputed, and the input
+    signal contributions are computed in closed-form where possible, see
+    :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator`.
+
+    Parameters
+    ----------
+    analog_system : :py:class:`cbadc.analog_system.AnalogSystem`
+        the analog system
+    digital_control: :py:class:`cbadc.digital_control.SwitchedCapacitorControl`
+        the switched-capacitor digital control
+    input_signals : [:py:class:`cbadc.analog_signal.AnalogSignal`]
+        a python list of analog signals (or a derived class)
+    clock: :py:class:`cbadc.simulator.clock`, `optional`
+        a clock to syncronize simulator output against, defaults to
+        a phase delayed version of the digital_control clock.
+    t_stop : `float`, optional
+        determines a stop time, defaults to :py:obj:`math.inf`
+    initial_state_vector: `array_like`, shape=(N), `optional`
+        initial state vector.
+    atol, rtol : `float`, `optional`
+        absolute and relative tolerance of the numerical integration of
+        input signals without closed-form contributions.
+
+    Attributes
+    ----------
+    capacitor_voltages : `array_like`, shape=(M,)
+        the current capacitor voltages :math:`\mathbf{v}(t)`.
+    """
+
+    def __init__(
+        self,
+        analog_system: cbadc.analog_system._valid_analog_system_types,
+        digital_control: cbadc.digital_control.SwitchedCapacitorControl,
+        input_signal: List[cbadc.analog_signal._AnalogSignal],
+        clock: cbadc.analog_signal._valid_clock_types = None,
+        t_stop: float = math.inf,
+        initial_state_vector=None,
+        atol: float = 1e-12,
+        rtol: float = 1e-8,
+    ):
+        if not isinstance(
+            digital_control, cbadc.digital_control.SwitchedCapacitorControl
+        ):
+            raise Exception(
+                "This simulator requires a cbadc.digital_control.SwitchedCapacitorControl."
+            )
+        _BaseSimulator.__init__(
+            self,
+            analog_system,
+            digital_control,
+            input_signal,
+            clock,
+            t_stop,
+            initial_state_vector,
+        )
+        M = self.digital_control.M
+        if self.analog_system.M != M or self.analog_system.M_tilde != M:
+            raise Exception(
+                "The analog system must have M = M_tilde control inputs and observations."
+            )
+        if self.digital_control.A.shape != (M, M):
+            raise Exception("The capacitor model A must be of shape=(M, M).")
+        if not np.isclose(self.clock.T, self.digital_control.T):
+            raise Exception(
+                "For this simulator, both simulation clock and digital control clock must have same clock period."
+            )
+        self.atol = atol
+        self.rtol = rtol
+        # initially, the capacitors in phase 0 are connected and charged
+        # according to the initial control signals.
+        self.capacitor_voltages = (
+            self.digital_control.VCap
+            * (2.0 * self.digital_control._s - 1.0)
+            * (self.digital_control.phase == 0)
+        )
+        (
+            self._input_contributions,
+            self._numerical_inputs,
+        ) = _closed_form_input_contributions(
+            self.analog_system.A, self.analog_system.B, self.input_signals
+        )
+        self._schedule()
+
+    _checkpoint_attributes = _BaseSimulator._checkpoint_attributes + (
+        "capacitor_voltages",
+    )
+
+    def restore(self, checkpoint: dict):
+        super().restore(checkpoint)
+        self._schedule()
+
+    def _schedule(self):
+        """Partition the clock period, starting at the current time, into
+        segments ending at the charge and discharge instants.
+
+        Discharges are ordered before charges occuring at the same instant,
+        as in :py:func:`cbadc.digital_control.SwitchedCapacitorControl.control_update`.
+        """
+        T = self.clock.T
+        M = self.digital_control.M
+        self._tolerance = 1e-9 * T
+        # the augmented state transition matrices by segment and connections
+        self._transitions = {}
+        next_times = np.hstack(
+            (self.digital_control._T2_next, self.digital_control._T1_next)
+        )
+        offsets = np.mod(next_times - self.t, T)
+        offsets[offsets <= self._tolerance] = T
+        boundaries = []
+        events = []
+        for index in np.argsort(offsets, kind="stable"):
+            if boundaries and offsets[index] - boundaries[-1] <= self._tolerance:
+                events[-1].append(index)
+            else:
+                boundaries.append(offsets[index])
+                events.append([index])
+        if T - boundaries[-1] > self._tolerance:
+            boundaries.append(T)
+            events.append([])
+        boundaries[-1] = T
+        self._boundaries = np.array(boundaries)
+        self._segment_lengths = np.diff(np.hstack((0.0, self._boundaries)))
+        # the number of control updates at the end of each segment, i.e.,
+        # two if a control is both discharged and charged.
+        self._updates = []
+        for event in events:
+            discharged = set(index for index in event if index < M)
+            charged = set(index - M for index in event if index >= M)
+            self._updates.append(
+                2 if discharged & charged else int(bool(discharged or charged))
+            )
+
+    def _transition(self, segment: int, connected: np.ndarray) -> np.ndarray:
+        """Return the augmented state transition matrix of a segment."""
+        key = (segment, connected.tobytes())
+        if key not in self._transitions:
+            N = self.analog_system.N
+            M = self.digital_control.M
+            D = np.diag(connected.astype(np.double))
+            A = np.zeros((N + M, N + M))
+            A[:N, :N] = self.analog_system.A
+            A[:N, N:] = np.dot(self.analog_system.Gamma, D)
+            A[N:, N:] = np.dot(D, np.dot(self.digital_control.A, D))
+            self._transitions[key] = scipy.linalg.expm(
+                A * self._segment_lengths[segment]
+            )
+        return self._transitions[key]
+
+    def _segment_input_contributions(self, t: np.ndarray, dt: float) -> np.ndarray:
+        """Compute the input signal contributions of the segments
+        :math:`[t_k, t_k + \\Delta t]`.
+
+        Returns
+        -------
+        `array_like`, shape=(K, N)
+            the input signal contributions.
+        """
+        result = np.zeros((t.size, self.analog_system.N), dtype=np.double)
+        for contribution in self._input_contributions:
+            result += contribution.block(t, dt)
+        if not self._numerical_inputs:
+            return result
+
+        def f(tau, x):
+            res = self.analog_system._A_operator.dot(x)
+            for _l in self._numerical_inputs:
+                res += self.analog_system.B[:, _l] * self.input_signals[_l].evaluate(
+                    tau
+                )
+            return res
+
+        for k in range(t.size):
+            sol = scipy.integrate.solve_ivp(
+                f,
+                (t[k], t[k] + dt),
+                np.zeros(self.analog_system.N),
+                atol=self.atol,
+                rtol=self.rtol,
+                method="RK45",
+            )
+            if self._statistics is not None:
+                self._statistics.record_ivp(sol)
+            result[k, :] += sol.y[:, -1]
+        return result
+
+    def _input_contributions_of_periods(self, t: np.ndarray) -> np.ndarray:
+        """Compute the input signal contributions of every segment of the
+        clock periods starting at t.
+
+        Returns
+        -------
+        `array_like`, shape=(K, J, N)
+            the input signal contributions of the J segments.
+        """
+        return np.stack(
+            [
+                self._segment_input_contributions(t + start, dt)
+                for start, dt in zip(
+                    self._boundaries - self._segment_lengths, self._segment_lengths
+                )
+            ],
+            axis=1,
+        )
+
+    def _period(self, t: float, input_contributions: np.ndarray):
+        """Advance the analog system and the capacitors one clock period
+        starting at time t."""
+        N = self.analog_system.N
+        digital_control = self.digital_control
+        Gamma_tildeT = self.analog_system._Gamma_tildeT_operator
+        control_update = self._timed(
+            "control_update_time", digital_control.control_update
+        )
+        z = np.hstack((self._state_vector, self.capacitor_voltages))
+        for segment, updates in enumerate(self._updates):
+            z = np.dot(self._transition(segment, digital_control.phase == 0), z)
+            z[:N] += input_contributions[segment, :]
+            if not updates:
+                continue
+            # the digital control discharges, or charges, the capacitors of
+            # the controls whose instants have passed.
+            t_event = t + self._boundaries[segment] + self._tolerance
+            s_tilde = Gamma_tildeT.dot(z[:N])
+            for _ in range(updates):
+                phase, reset, s = control_update(t_event, s_tilde)
+                z[N:][reset] = np.where(
+                    phase[reset] == 0,
+                    digital_control.VCap * (2.0 * s[reset] - 1.0),
+                    0.0,
+                )
+        self._state_vector = z[:N]
+        self.capacitor_voltages = z[N:]
+
+    def _next(self) -> np.ndarray:
+        """Computes the next control signal :math:`\mathbf{s}[k]`"""
+        t_end: float = self.t + self.clock.T
+        if t_end >= self.t_stop:
+            raise StopIteration
+        input_contributions = self._timed(
+            "input_integration_time", self._input_contributions_of_periods
+        )(np.array([self.t]))
+        self._period(self.t, input_contributions[0])
+        self.t = t_end
+        if self.state_bounds is not None:
+            self._monitor_state_bounds()
+        # a copy, as the digital control updates its control signals in place
+        return np.array(self.digital_control.control_signal())
+
+    def _simulate_block(
+        self,
+        control_signals: np.ndarray,
+        index: int,
+        states: np.ndarray,
+        state_decimation: int,
+    ) -> int:
+        # the same time grid as repeatedly calling __next__
+        t = np.cumsum(
+            np.hstack(
+                (self.t, np.full(control_signals.shape[0], self.clock.T, np.double))
+            )
+        )
+        K = int(np.searchsorted(t[1:], self.t_stop, side="left"))
+        if K < 1:
+            return 0
+        t = t[: K + 1]
+        input_contributions = self._timed(
+            "input_integration_time", self._input_contributions_of_periods
+        )(t[:K])
+        monitor = self.state_bounds is not None
+        if monitor:
+            trajectory = np.zeros((K, self.analog_system.N), dtype=np.double)
+        for k in range(K):
+            self._period(t[k], input_contributions[k])
+            control_signals[k, :] = self.digital_control.control_signal()
+            if states is not None and (index + k) % state_decimation == 0:
+                states[(index + k) // state_decimation, :] = self._state_vector
+            if monitor:
+                trajectory[k, :] = self._state_vector
+        self.t = t[K]
+        if monitor:
+            self.state_bounds.monitor(t[1 : K + 1], trajectory)
+        return K
@@ -1,5 +1,6 @@
 """Simulation utilities."""
-from typing import Dict, Generator
+import os
+from typing import Dict, Generator, List
 import numpy as np
 from ._base_simulator import _BaseSimulator
 
@@ -10,7 +11,9 @@ def extended_simulation_result(
     """Extended simulation output
 
     Used to also pass the state vector from a
-    simulator generator.
+    simulator generator. For long simulations, consider the
+    :py:class:`cbadc.simulator.TrajectoryRecorder` which records into
+    preallocated arrays instead of copying every sample.
 
     Parameters
     ----------
@@ -29,3 +32,212 @@ def extended_simulation_result(
             "analog_state": np.array(analog_state),
             "t": simulator.t,
         }
+
+
+class TrajectoryRecorder:
+    """Record a simulation into preallocated arrays
+
+    Simulates in blocks, see :py:func:`cbadc.simulator._BaseSimulator.simulate`,
+    and records every decimation:th sample of the time, the (selected)
+    state vector entries, and the control signals into preallocated, or,
+    if a directory is given, memory-mapped arrays. Additionally, the
+    running minimum, maximum, and root mean square of the selected states
+    are computed over all simulated samples. Hence, the memory used is
+    constant regardless of the simulation length.
+
+    Parameters
+    ----------
+    simulator: :py:class:`cbadc.simulator._BaseSimulator`
+        the simulator to record.
+    n_samples: `int`
+        the maximum number of samples to simulate.
+    decimation: `int`, `optional`
+        record every decimation:th sample, defaults to 1.
+    state_indices: `list[int]`, `optional`
+        the state vector entries to record, defaults to all.
+    directory: `str`, `optional`
+        if set, the arrays are memory-mapped to the files t.npy,
+        states.npy, and control_signals.npy in this directory, which can
+        later be read by :py:func:`numpy.load`, defaults to None.
+    block_size: `int`, `optional`
+        the number of samples simulated at a time, defaults to 2^14.
+
+    Attributes
+    ----------
+    samples: `int`
+        the number of simulated samples.
+
+    Examples
+    --------
+    >>> import cbadc
+    >>> import numpy as np
+    >>> N = 2
+    >>> A = np.eye(N, k=-1) * 6250
+    >>> B = np.zeros((N, 1)); B[0] = 6250
+    >>> analog_system = cbadc.analog_system.AnalogSystem(
+    ...     A, B, np.eye(N), -6250 * np.eye(N), np.eye(N))
+    >>> digital_control = cbadc.digital_control.DigitalControl(
+    ...     cbadc.analog_signal.Clock(8e-5), N)
+    >>> simulator = cbadc.simulator.get_simulator(
+    ...     analog_system, digital_control, [cbadc.analog_signal.ConstantSignal(0.1)])
+    >>> recorder = cbadc.simulator.TrajectoryRecorder(simulator, 1000, decimation=10)
+    >>> recorder.record()
+    1000
+    >>> recorder.states.shape
+    (100, 2)
+    >>> bool(np.all(recorder.statistics()["max"] <= 1.0))
+    True
+    """
+
+    def __init__(
+        self,
+        simulator: _BaseSimulator,
+        n_samples: int,
+        decimation: int = 1,
+        state_indices: List[int] = None,
+        directory: str = None,
+        block_size: int = 1 << 14,
+    ):
+        if n_samples < 0:
+            raise Exception("n_samples must be non-negative.")
+        if decimation < 1:
+            raise Exception("decimation must be a positive integer.")
+        if block_size < 1:
+            raise Exception("block_size must be a positive integer.")
+        self.simulator = simulator
+        self.n_samples = n_samples
+        self.decimation = decimation
+        if state_indices is None:
+            self._state_indices = np.arange(simulator.analog_system.N)
+        else:
+            self._state_indices = np.array(state_indices, dtype=int)
+            if self._state_indices.ndim != 1 or np.any(
+                (self._state_indices < 0)
+                | (self._state_indices >= simulator.analog_system.N)
+            ):
+                raise Exception("state_indices must be a list of valid state indices.")
+        self.block_size = block_size
+        self.samples = 0
+
+        n_records = (n_samples + decimation - 1) // decimation
+        shapes = {
+            "t": ((n_records,), np.double),
+            "states": ((n_records, self._state_indices.size), np.double),
+            "control_signals": (
+                (n_records, simulator.digital_control.M),
+                np.int8,
+            ),
+        }
+        self._arrays = {}
+        for name, (shape, dtype) in shapes.items():
+            if directory is None:
+                self._arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                os.makedirs(directory, exist_ok=True)
+                self._arrays[name] = np.lib.format.open_memmap(
+                    os.path.join(directory, f"{name}.npy"),
+                    mode="w+",
+                    dtype=dtype,
+                    shape=shape,
+                )
+
+        self._min = np.full(self._state_indices.size, np.inf)
+        self._max = np.full(self._state_indices.size, -np.inf)
+        self._sum_of_squares = np.zeros(self._state_indices.size)
+
+    def record(self, n_samples: int = None) -> int:
+        """Simulate and record.
+
+        Parameters
+        ----------
+        n_samples: `int`, `optional`
+            the number of samples to simulate, defaults to the remaining
+            samples.
+
+        Returns
+        -------
+        `int`
+            the number of simulated samples, which is less than requested
+            only if the simulator stopped.
+        """
+        remaining = self.n_samples - self.samples
+        if n_samples is None:
+            n_samples = remaining
+        elif n_samples > remaining:
+            raise Exception(
+                f"Can't record {n_samples} samples, only {remaining} remaining."
+            )
+        t = self._arrays["t"]
+        states = self._arrays["states"]
+        control_signals = self._arrays["control_signals"]
+        T = self.simulator.clock.T
+        done = 0
+        while done < n_samples:
+            size = min(n_samples - done, self.block_size)
+            t0 = self.simulator.t
+            block_controls, block_states = self.simulator.simulate(
+                size, state_decimation=1
+            )
+            K = block_controls.shape[0]
+            block_states = block_states[:, self._state_indices]
+            self._min = np.minimum(self._min, block_states.min(axis=0, initial=np.inf))
+            self._max = np.maximum(self._max, block_states.max(axis=0, initial=-np.inf))
+            self._sum_of_squares += np.sum(block_states**2, axis=0)
+
+            # the sample indices within the block to record
+            first = (-self.samples) % self.decimation
+            selection = slice(first, K, self.decimation)
+            begin = (self.samples + first) // self.decimation
+            end = begin + len(range(first, K, self.decimation))
+            t[begin:end] = t0 + T * np.arange(1, K + 1)[selection]
+            states[begin:end, :] = block_states[selection, :]
+            control_signals[begin:end, :] = block_controls[selection, :]
+
+            self.samples += K
+            done += K
+            if K < size:
+                break
+        return done
+
+    def _records(self) -> int:
+        return (self.samples + self.decimation - 1) // self.decimation
+
+    @property
+    def t(self) -> np.ndarray:
+        """`array_like`, shape=(records,): the recorded times."""
+        return self._arrays["t"][: self._records()]
+
+    @property
+    def states(self) -> np.ndarray:
+        """`array_like`, shape=(records, len(state_indices)): the recorded
+        states."""
+        return self._arrays["states"][: self._records(), :]
+
+    @property
+    def control_signals(self) -> np.ndarray:
+        """`array_like`, shape=(records, M): the recorded control signals."""
+        return self._arrays["control_signals"][: self._records(), :]
+
+    def statistics(self) -> Dict[str, np.ndarray]:
+        """Return the running state statistics.
+
+        Returns
+        -------
+        `dict`
+            containing the per (selected) state 'min', 'max', and 'rms'
+            over all simulated samples, as well as the number of 'samples'.
+        """
+        return {
+            "min": self._min.copy(),
+            "max": self._max.copy(),
+            "rms": np.sqrt(self._sum_of_squares / self.samples)
+            if self.samples
+            else np.zeros_like(self._sum_of_squares),
+            "samples": self.samples,
+        }
+
+    def flush(self):
+        """Flush memory-mapped arrays to disk."""
+        for array in self._arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
@@ -10,7 +10,10 @@ from cbadc.simulator import (
     PreComputedControlSignalsSimulator,
     AnalyticalSimulator,
     MPSimulator,
+    ModalSimulator,
+    SwitchedCapacitorSimulator,
 )
+from cbadc.simulator.simulation_cache import CachedSimulator, SimulationCache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -21,6 +24,8 @@ class SimulatorType(enum.Enum):
     pre_computed_numerical = 2
     analytical = 3
     mpmath = 4
+    full_event_driven = 5
+    modal = 6
 
 
 def get_simulator(
@@ -33,7 +38,73 @@ def get_simulator(
     atol: float = 1e-9,
     rtol: float = 1e-6,
     simulator_type: SimulatorType = SimulatorType.pre_computed_numerical,
+    cache: SimulationCache = None,
+    noise_covariance=None,
+    jitter_std: float = 0.0,
+    seed=None,
 ):
+    noisy = noise_covariance is not None or jitter_std > 0
+    if noisy and (
+        simulator_type
+        not in (SimulatorType.pre_computed_numerical, SimulatorType.modal)
+        or isinstance(digital_control, cbadc.digital_control.SwitchedCapacitorControl)
+    ):
+        raise Exception(
+            "Noise and jitter are only supported by the pre_computed_numerical and modal simulator types."
+        )
+    if cache is not None:
+        if noisy and seed is None:
+            raise Exception(
+                "Simulations with noise or jitter require a seed to be cached."
+            )
+        key = cache.key(
+            cbadc.__version__,
+            simulator_type.name,
+            analog_system,
+            digital_control,
+            input_signal,
+            clock,
+            initial_state_vector,
+            atol,
+            rtol,
+            noise_covariance,
+            jitter_std,
+            seed,
+        )
+        logger.info(f"Simulation cache entry {key} used for simulation.")
+        return CachedSimulator(
+            cache,
+            key,
+            lambda: get_simulator(
+                analog_system,
+                digital_control,
+                input_signal,
+                clock,
+                math.inf,
+                initial_state_vector,
+                atol,
+                rtol,
+                simulator_type,
+                noise_covariance=noise_covariance,
+                jitter_std=jitter_std,
+                seed=seed,
+            ),
+            clock if clock is not None else digital_control.clock,
+            digital_control.M,
+            t_stop,
+        )
+    if isinstance(digital_control, cbadc.digital_control.SwitchedCapacitorControl):
+        logger.info("SwitchedCapacitorSimulator used for simulation.")
+        return SwitchedCapacitorSimulator(
+            analog_system,
+            digital_control,
+            input_signal,
+            clock,
+            t_stop,
+            initial_state_vector,
+            atol,
+            rtol,
+        )
     if SimulatorType.full_numerical == simulator_type:
         logger.info("FullSimulator used for simulation.")
         return FullSimulator(
@@ -46,6 +117,19 @@ def get_simulator(
             atol,
             rtol,
         )
+    if SimulatorType.full_event_driven == simulator_type:
+        logger.info("Event driven FullSimulator used for simulation.")
+        return FullSimulator(
+            analog_system,
+            digital_control,
+            input_signal,
+            clock,
+            t_stop,
+            initial_state_vector,
+            atol,
+            rtol,
+            event_driven=True,
+        )
     if SimulatorType.pre_computed_numerical == simulator_type:
         logger.info("PreComputedControlSignalSimulator used for simulation.")
         return PreComputedControlSignalsSimulator(
@@ -57,6 +141,24 @@ def get_simulator(
             initial_state_vector,
             atol,
             rtol,
+            noise_covariance=noise_covariance,
+            jitter_std=jitter_std,
+            seed=seed,
+        )
+    if SimulatorType.modal == simulator_type:
+        logger.info("ModalSimulator used for simulation.")
+        return ModalSimulator(
+            analog_system,
+            digital_control,
+            input_signal,
+            clock,
+            t_stop,
+            initial_state_vector,
+            atol=atol,
+            rtol=rtol,
+            noise_covariance=noise_covariance,
+            jitter_std=jitter_std,
+            seed=seed,
         )
     if SimulatorType.analytical == simulator_type:
         logger.info("AnalyticalSimulator used for simulation.")
@@ -0,0 +1,334 @@
+"""Parameter sweeps
+
+This module provides tools to distribute simulations, and the corresponding
+input estimations, of a grid of analog systems, digital controls, input
+signals, and estimator settings over a process pool.
+"""
+import copy
+import itertools
+import logging
+import multiprocessing
+import numpy as np
+import cbadc.analog_system
+import cbadc.digital_control
+import cbadc.digital_estimator
+import cbadc.simulator
+import cbadc.utilities
+from cbadc.simulator._propagators import _spawn_seeds
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The templates shared by all tasks of a worker process.
+_templates = None
+
+
+def _initialize_worker(templates: Dict):
+    global _templates
+    _templates = templates
+
+
+def _snr(estimate: np.ndarray, fs: float, bandwidth: float = None) -> float:
+    """Estimate the SNR of a sinusoidal estimate
+
+    Parameters
+    ----------
+    estimate: `array_like`, shape=(K,)
+        the estimated signal.
+    fs: `float`
+        the sample rate of the estimate.
+    bandwidth: `float`, `optional`
+        the signal bandwidth, defaults to fs / 2.
+
+    Returns
+    -------
+    `float`
+        the SNR expressed in dB.
+    """
+    f, psd = cbadc.utilities.compute_power_spectral_density(
+        estimate, fs=fs, nperseg=estimate.size
+    )
+    signal_index = cbadc.utilities.find_sinusoidal(psd, 15)
+    noise_index = np.ones(psd.size, dtype=bool)
+    noise_index[signal_index] = False
+    noise_index[0] = False
+    if bandwidth is not None:
+        noise_index[f > bandwidth] = False
+    snr = cbadc.utilities.snr_spectrum_computation(psd, signal_index, noise_index)
+    return 10.0 * np.log10(snr)
+
+
+def _run_task(task: Tuple[int, int, int]) -> Dict:
+    system_index, input_index, estimator_index = task
+    analog_system, digital_control = _templates["systems"][system_index]
+    input_signals = _templates["input_signals"][input_index]
+    n_samples = _templates["n_samples"]
+
+    estimator = None
+    if estimator_index is not None:
+        template = _templates["estimators"][system_index][estimator_index]
+        estimator = copy.deepcopy(
+            template,
+            {
+                id(template.analog_system): template.analog_system,
+                id(template.digital_control): template.digital_control,
+            },
+        )
+        n_samples += estimator.K3
+
+    seed = _templates["seeds"][task]
+    template = _templates["simulators"][system_index]
+    if template is not None:
+        # reuse the precomputed matrices and only redo the input
+        # contributions and the noise and jitter generators.
+        simulator = copy.deepcopy(
+            template, {id(template.analog_system): template.analog_system}
+        )
+        simulator.input_signals = input_signals
+        simulator._input_pre_computations()
+        simulator.seed = seed
+        simulator._seed_generators()
+    else:
+        simulator = cbadc.simulator.get_simulator(
+            analog_system,
+            copy.deepcopy(digital_control),
+            input_signals,
+            simulator_type=_templates["simulator_type"],
+            **dict(_templates["simulator_kwargs"], seed=seed),
+        )
+    control_signals = simulator.simulate(n_samples)
+
+    result = {
+        "system": system_index,
+        "input": input_index,
+        "estimator": estimator_index,
+    }
+    if _templates["return_control_signals"]:
+        result["control_signals"] = control_signals
+    if estimator is None:
+        return result
+
+    # the array estimators require a multiple of the downsampling factor
+    K = control_signals.shape[0]
+    K -= K % getattr(estimator, "downsample", 1)
+    estimate = estimator.estimate(control_signals[:K])[: _templates["n_samples"]]
+    result["estimate"] = estimate
+    fs = 1.0 / estimator.Ts
+    result["snr"] = np.array(
+        [
+            _snr(estimate[estimator.K3 :, l], fs, _templates["bandwidth"])
+            for l in range(analog_system.L)
+        ]
+    )
+    return result
+
+
+class Sweep:
+    """A parallel parameter sweep.
+
+    The sweep consists of the cartesian product of the systems, the input
+    signals, and the estimator settings. Each combination is simulated,
+    and optionally estimated, on a process pool.
+
+    Quantities that do not depend on the input signals, i.e., the
+    precomputed matrices of :py:class:`cbadc.simulator.PreComputedControlSignalsSimulator`
+    and the filter coefficients of the estimators, are computed once in the
+    parent process and shared with each worker process as it starts. Thereafter,
+    only the task indices are dispatched to the workers.
+
+    Parameters
+    ----------
+    systems: [(:py:class:`cbadc.analog_system.AnalogSystem`, :py:class:`cbadc.digital_control.DigitalControl`)]
+        a list of analog system and digital control pairs.
+    input_signals: [[:py:class:`cbadc.analog_signal._AnalogSignal`]]
+        a list of input signal lists, each containing L input signals.
+    estimators: [`dict`], `optional`
+        a list of estimator settings. Each setting is a dict of keyword
+        arguments for the estimator where the key 'estimator' selects the
+        estimator class, defaulting to
+        :py:class:`cbadc.digital_estimator.BatchEstimator`.
+        Defaults to None, i.e., no estimation.
+    n_samples: `int`, `optional`
+        number of estimated (or control signal) samples per simulation,
+        defaults to :math:`2^{14}`.
+    simulator_type: :py:class:`cbadc.simulator.SimulatorType`, `optional`
+        the simulator type, defaults to pre-computed numerical.
+    simulator_kwargs: `dict`, `optional`
+        additional keyword arguments passed to :py:func:`cbadc.simulator.get_simulator`.
+        Each task is simulated with its own child of the 'seed', see
+        :py:func:`numpy.random.SeedSequence.spawn`, such that the noise
+        and jitter of the tasks are independent.
+    processes: `int`, `optional`
+        number of worker processes, defaults to :py:func:`os.cpu_count`.
+        If set to 1, the sweep is run in the calling process.
+    chunksize: `int`, `optional`
+        number of tasks dispatched to a worker at a time, defaults to
+        a fourth of the tasks per worker.
+    return_control_signals: `bool`, `optional`
+        include the control signals in the results, defaults to False.
+    bandwidth: `float`, `optional`
+        the signal bandwidth used to compute the SNR, defaults to
+        half the sample rate.
+
+    Yields
+    ------
+    `dict`
+        a result containing the indices 'system', 'input', and 'estimator'
+        of the task together with the 'control_signals' (optionally), the
+        'estimate' of shape=(n_samples, L) and its 'snr' [dB] of shape=(L,),
+        assuming sinusoidal input signals.
+
+    Examples
+    --------
+    >>> import cbadc
+    >>> import numpy as np
+    >>> N = 2
+    >>> beta = 6250.0
+    >>> T = 1.0 / (2 * beta)
+    >>> analog_system = cbadc.analog_system.ChainOfIntegrators(
+    ...     beta * np.ones(N), np.zeros(N), -beta * np.eye(N)
+    ... )
+    >>> digital_control = cbadc.digital_control.DigitalControl(
+    ...     cbadc.analog_signal.Clock(T), N
+    ... )
+    >>> sweep = cbadc.sweep.Sweep(
+    ...     [(analog_system, digital_control)],
+    ...     [[cbadc.analog_signal.ConstantSignal(a)] for a in (-0.1, 0.1)],
+    ...     n_samples=100,
+    ...     processes=1,
+    ... )
+    >>> len(sweep.run())
+    2
+    """
+
+    def __init__(
+        self,
+        systems: List[
+            Tuple[
+                cbadc.analog_system._valid_analog_system_types,
+                cbadc.digital_control._valid_digital_control_types,
+            ]
+        ],
+        input_signals: List[List],
+        estimators: List[Dict] = None,
+        n_samples: int = 1 << 14,
+        simulator_type: cbadc.simulator.SimulatorType = cbadc.simulator.SimulatorType.pre_computed_numerical,
+        simulator_kwargs: Dict = None,
+        processes: int = None,
+        chunksize: int = None,
+        return_control_signals: bool = False,
+        bandwidth: float = None,
+    ):
+        if n_samples < 1:
+            raise Exception("n_samples must be a positive integer.")
+        for analog_system, digital_control in systems:
+            for signals in input_signals:
+                if analog_system.L != len(signals):
+                    raise Exception(
+                        "The analog system does not have as many inputs as in input list"
+                    )
+        self.systems = systems
+        self.input_signals = input_signals
+        self.estimators = estimators
+        self.n_samples = n_samples
+        self.simulator_type = simulator_type
+        self.simulator_kwargs = simulator_kwargs if simulator_kwargs else {}
+        self.processes = processes if processes else multiprocessing.cpu_count()
+        self.tasks = list(
+            itertools.product(
+                range(len(systems)),
+                range(len(input_signals)),
+                range(len(estimators)) if estimators else [None],
+            )
+        )
+        self._seeds = dict(
+            zip(
+                self.tasks,
+                _spawn_seeds(self.simulator_kwargs.get("seed"), len(self.tasks)),
+            )
+        )
+        if chunksize:
+            self.chunksize = chunksize
+        else:
+            self.chunksize = max(1, len(self.tasks) // (4 * self.processes))
+        self.return_control_signals = return_control_signals
+        self.bandwidth = bandwidth
+
+    def _templates(self) -> Dict:
+        """Precompute everything that is shared between tasks."""
+        logger.info("Precomputing sweep templates.")
+        simulators = []
+        estimators = []
+        for analog_system, digital_control in self.systems:
+            simulator = None
+            if (
+                self.simulator_type
+                == cbadc.simulator.SimulatorType.pre_computed_numerical
+            ):
+                simulator = cbadc.simulator.get_simulator(
+                    analog_system,
+                    copy.deepcopy(digital_control),
+                    self.input_signals[0],
+                    simulator_type=self.simulator_type,
+                    **self.simulator_kwargs,
+                )
+            # only the precomputed simulators, and not, e.g., the switched
+            # capacitor or cached simulators, are reused as templates.
+            if isinstance(
+                simulator, cbadc.simulator.PreComputedControlSignalsSimulator
+            ):
+                simulators.append(simulator)
+            else:
+                simulators.append(None)
+            system_estimators = []
+            for settings in self.estimators if self.estimators else []:
+                kwargs = dict(settings)
+                estimator_type = kwargs.pop(
+                    "estimator", cbadc.digital_estimator.BatchEstimator
+                )
+                system_estimators.append(
+                    estimator_type(analog_system, digital_control, **kwargs)
+                )
+            estimators.append(system_estimators)
+        return {
+            "systems": self.systems,
+            "input_signals": self.input_signals,
+            "simulators": simulators,
+            "estimators": estimators,
+            "n_samples": self.n_samples,
+            "simulator_type": self.simulator_type,
+            "simulator_kwargs": self.simulator_kwargs,
+            "seeds": self._seeds,
+            "return_control_signals": self.return_control_signals,
+            "bandwidth": self.bandwidth,
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        templates = self._templates()
+        if self.processes == 1:
+            _initialize_worker(templates)
+            for task in self.tasks:
+                yield _run_task(task)
+            return
+        with multiprocessing.Pool(
+            self.processes, initializer=_initialize_worker, initargs=(templates,)
+        ) as pool:
+            for result in pool.imap_unordered(_run_task, self.tasks, self.chunksize):
+                yield result
+
+    def run(self) -> List[Dict]:
+        """Run the full sweep.
+
+        Returns
+        -------
+        [`dict`]
+            the results ordered as the tasks.
+        """
+        results = {
+            (result["system"], result["input"], result["estimator"]): result
+            for result in self
+        }
+        return [results[task] for task in self.tasks]
+
+    def __len__(self) -> int:
+        return len(self.tasks)
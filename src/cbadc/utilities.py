@@ -3,6 +3,7 @@
 This module contains various helpful functions to accommodate
 the cbadc toolbox.
 """
+import copy
 import struct
 from typing import Generator, Iterator, Union
 import numpy as np
@@ -12,6 +13,9 @@ from tqdm import tqdm
 import requests
 import os
 import pickle
+import queue
+import threading
+import time
 import scipy.io.wavfile
 import numpy.typing as npt
 import scipy.signal
@@ -121,6 +125,69 @@ def byte_stream_2_control_signal(
         yield s
 
 
+def pack_control_signals(control_signals: np.ndarray) -> np.ndarray:
+    """Pack an array of control signals into integer words
+
+    Bit :math:`m` of each word represents the control signal
+    :math:`s_m[k]`, i.e., the same format as
+    :py:func:`cbadc.utilities.control_signal_2_byte_stream`. Therefore,
+    writing the resulting array as raw bytes results in the same file
+    as :py:func:`cbadc.utilities.write_byte_stream_to_file`.
+
+    Parameters
+    ----------
+    control_signals : `array_like`, shape=(K, M)
+        an array of (binary) control signals.
+
+    Returns
+    -------
+    `array_like`, shape=(K,)
+        the packed control signals where the dtype is determined
+        by :py:func:`cbadc.utilities.number_of_bytes_selector`.
+
+    Example
+    -------
+    >>> control_signal = np.array([[0, 1, 0], [1, 0, 1],[0, 0, 1]])
+    >>> pack_control_signals(control_signal)
+    array([2, 5, 4], dtype=uint8)
+    """
+    control_signals = np.asarray(control_signals)
+    M = control_signals.shape[1]
+    format = number_of_bytes_selector(M)
+    weights = np.left_shift(np.uint64(1), np.arange(M, dtype=np.uint64))
+    packed = np.dot((control_signals > 0).astype(np.uint64), weights)
+    return packed.astype(np.dtype(format["format_marker"]))
+
+
+def unpack_control_signals(packed_control_signals: np.ndarray, M: int) -> np.ndarray:
+    """Unpack an array of integer words into control signals
+
+    The inverse of :py:func:`cbadc.utilities.pack_control_signals`.
+
+    Parameters
+    ----------
+    packed_control_signals : `array_like`, shape=(K,)
+        the packed control signals.
+    M : `int`
+        number of control signals.
+
+    Returns
+    -------
+    `array_like`, shape=(K, M), dtype=numpy.int8
+        the unpacked control signals.
+
+    Example
+    -------
+    >>> unpack_control_signals(np.array([2, 5, 4], dtype=np.uint8), 3)
+    array([[0, 1, 0],
+           [1, 0, 1],
+           [0, 0, 1]], dtype=int8)
+    """
+    words = np.asarray(packed_control_signals).astype(np.uint64)
+    shifts = np.arange(M, dtype=np.uint64)
+    return (np.right_shift(words[:, None], shifts) & np.uint64(1)).astype(np.int8)
+
+
 def write_byte_stream_to_file(filename: str, iterator: Iterator[bytes]):
     """Write a stream into binary file.
 
@@ -164,6 +231,214 @@ def write_byte_stream_to_files(
         iteration += 1
 
 
+class BitstreamWriter:
+    """Write control signals to a binary file on a background thread.
+
+    Blocks of control signals are packed into words, as in
+    :py:func:`cbadc.utilities.pack_control_signals`, and gathered in buffers
+    of (at least) buffer_size bytes. Full buffers are passed through a
+    bounded queue to a writer thread which writes them to file. Therefore,
+    the resulting file is identical to the one written by
+    :py:func:`cbadc.utilities.write_byte_stream_to_file` for the byte stream
+    :py:func:`cbadc.utilities.control_signal_2_byte_stream`, whereas the
+    disk I/O overlaps with the simulation.
+
+    Parameters
+    ----------
+    filename: `str`
+        filename for output file.
+    M: `int`
+        number of controls.
+    buffer_size: `int`, `optional`
+        number of bytes gathered before a write, defaults to :math:`2^{20}`.
+    queue_size: `int`, `optional`
+        maximum number of buffers waiting to be written, defaults to 8.
+        A full queue blocks the producer.
+
+    Attributes
+    ----------
+    filename: `str`
+        filename of the output file.
+    M: `int`
+        number of controls.
+
+    See also
+    --------
+    :py:func:`cbadc.utilities.read_byte_stream_from_file`
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'control_signals.dat')
+    >>> with BitstreamWriter(filename, 3) as writer:
+    ...     writer.write(np.array([[0, 1, 0], [1, 0, 1], [0, 0, 1]]))
+    >>> writer.stats()['samples']
+    3
+    >>> cs = byte_stream_2_control_signal(read_byte_stream_from_file(filename, 3), 3)
+    >>> next(cs)
+    array([0, 1, 0], dtype=int8)
+    """
+
+    def __init__(
+        self, filename: str, M: int, buffer_size: int = 1 << 20, queue_size: int = 8
+    ):
+        if buffer_size < 1 or queue_size < 1:
+            raise Exception("buffer_size and queue_size must be positive integers.")
+        self.filename = filename
+        self.M = M
+        self._dtype = np.dtype(number_of_bytes_selector(M)["format_marker"])
+        self._buffer_size = buffer_size
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._samples = 0
+        self._bytes = 0
+        self._wait_time = 0.0
+        self._write_time = 0.0
+        self._closed = False
+        self._file = open(filename, "wb")
+        self._t_start = time.perf_counter()
+        self._t_stop = None
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+        logger.info(f"Writing control signals to file {filename}.")
+
+    def _writer(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                t0 = time.perf_counter()
+                self._file.write(chunk)
+                self._write_time += time.perf_counter() - t0
+                self._bytes += len(chunk)
+            except Exception as error:
+                self._error = error
+
+    def _check(self):
+        if self._closed:
+            raise Exception("Writer is closed.")
+        if self._error is not None:
+            raise Exception(f"Writer thread failed: {self._error}")
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        chunk = b"".join(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        t0 = time.perf_counter()
+        self._queue.put(chunk)
+        self._wait_time += time.perf_counter() - t0
+
+    def write(self, control_signals: np.ndarray, packed: bool = False):
+        """Write a block of control signals.
+
+        Parameters
+        ----------
+        control_signals: `array_like`, shape=(K, M) or shape=(K,)
+            a block of control signals, or packed control signals if
+            packed is True.
+        packed: `bool`, `optional`
+            whether the control signals are already packed, defaults to False.
+        """
+        self._check()
+        if packed:
+            words = np.asarray(control_signals).astype(self._dtype, copy=False)
+        else:
+            control_signals = np.asarray(control_signals)
+            if control_signals.shape[1] != self.M:
+                raise Exception(f"control signals must be of shape (K, {self.M}).")
+            words = pack_control_signals(control_signals)
+        chunk = words.tobytes()
+        self._buffer.append(chunk)
+        self._buffered_bytes += len(chunk)
+        self._samples += words.size
+        if self._buffered_bytes >= self._buffer_size:
+            self._flush()
+
+    def write_simulation(self, simulator, n_samples: int, block_size: int = 1 << 14):
+        """Simulate and write n_samples control signals.
+
+        Parameters
+        ----------
+        simulator: :py:class:`cbadc.simulator._BaseSimulator`
+            the simulator, see :py:func:`cbadc.simulator.get_simulator`.
+        n_samples: `int`
+            number of control signals to simulate and write.
+        block_size: `int`, `optional`
+            number of control signals simulated per block, defaults
+            to :math:`2^{14}`.
+
+        Returns
+        -------
+        `int`
+            the number of written control signals, which is fewer than
+            n_samples if the simulator reached its stop time.
+        """
+        written = 0
+        while written < n_samples:
+            words = simulator.simulate(
+                min(block_size, n_samples - written), packed=True
+            )
+            if words.size == 0:
+                break
+            self.write(words, packed=True)
+            written += words.size
+        return written
+
+    def close(self):
+        """Flush the remaining control signals and close the file."""
+        if self._closed:
+            return
+        self._flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._closed = True
+        self._t_stop = time.perf_counter()
+        stats = self.stats()
+        logger.info(
+            f"Wrote {stats['samples']} control signals to file {self.filename} at {stats['samples_per_second']:.3e} samples/s."
+        )
+        if self._error is not None:
+            raise Exception(f"Writer thread failed: {self._error}")
+
+    def stats(self) -> dict:
+        """Return throughput statistics.
+
+        Returns
+        -------
+        `dict`
+            containing the number of 'samples' and 'bytes' written, the
+            'elapsed' time [s] since the writer was opened, the
+            throughput 'samples_per_second' and 'bytes_per_second', the
+            'write_time' [s] spent in the writer thread, and the
+            'wait_time' [s] the producer was blocked by a full queue.
+        """
+        t_stop = self._t_stop if self._t_stop is not None else time.perf_counter()
+        elapsed = t_stop - self._t_start
+        return {
+            "samples": self._samples,
+            "bytes": self._bytes,
+            "elapsed": elapsed,
+            "samples_per_second": self._samples / elapsed if elapsed > 0 else 0.0,
+            "bytes_per_second": self._bytes / elapsed if elapsed > 0 else 0.0,
+            "write_time": self._write_time,
+            "wait_time": self._wait_time,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def read_byte_stream_from_file(
     filenames: Union[str, list], M: int
 ) -> Generator[bytes, None, None]:
@@ -582,6 +857,68 @@ def pickle_load(filename: str):
         return pickle.load(f)
 
 
+# Bump whenever the content of a checkpoint changes.
+_checkpoint_version = 1
+
+
+def _checkpoint(obj, attributes: Tuple[str, ...]) -> dict:
+    """Snapshot the dynamic state of an object.
+
+    Parameters
+    ----------
+    obj: any
+        the object to be checkpointed.
+    attributes: `tuple` of `str`
+        the names of the attributes constituting the dynamic state.
+
+    Returns
+    -------
+    `dict`
+        a versioned, picklable, snapshot.
+    """
+    return {
+        "version": _checkpoint_version,
+        "type": type(obj).__name__,
+        "state": {
+            attribute: copy.deepcopy(getattr(obj, attribute))
+            for attribute in attributes
+        },
+    }
+
+
+def _restore(obj, attributes: Tuple[str, ...], checkpoint: dict):
+    """Restore the dynamic state of an object from a snapshot.
+
+    Parameters
+    ----------
+    obj: any
+        the object to be restored.
+    attributes: `tuple` of `str`
+        the names of the attributes constituting the dynamic state.
+    checkpoint: `dict`
+        a snapshot as returned by :py:func:`cbadc.utilities._checkpoint`.
+    """
+    if checkpoint.get("version") != _checkpoint_version:
+        raise Exception(
+            f"Unsupported checkpoint version {checkpoint.get('version')}, expected {_checkpoint_version}."
+        )
+    if checkpoint.get("type") != type(obj).__name__:
+        raise Exception(
+            f"Checkpoint of a {checkpoint.get('type')} cannot be restored into a {type(obj).__name__}."
+        )
+    state = checkpoint["state"]
+    if set(state.keys()) != set(attributes):
+        raise Exception("Checkpoint does not match the dynamic state of the object.")
+    for attribute in attributes:
+        current = getattr(obj, attribute)
+        value = state[attribute]
+        if isinstance(current, np.ndarray) and np.shape(value) != current.shape:
+            raise Exception(
+                f"Checkpoint shape {np.shape(value)} of {attribute} does not match {current.shape}."
+            )
+        setattr(obj, attribute, copy.deepcopy(value))
+
+
 def iterator_to_numpy_array(iterator: Iterator[bytes], size: int, L: int = 1):
     """Convert an iterator into a numpy array
 
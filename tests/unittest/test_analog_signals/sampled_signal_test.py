@@ -0,0 +1,41 @@
+from cbadc.analog_signal import SampledSignal
+import numpy as np
+import pytest
+
+samples = np.array([0.5, -1.0, 2.0, 0.25])
+fs = 1e3
+
+
+def test_zero_order_hold():
+    u = SampledSignal(samples, fs, interpolation_order=0)
+    for n, sample in enumerate(samples):
+        assert u.evaluate(n / fs) == sample
+        assert u.evaluate((n + 0.7) / fs) == sample
+    assert u.evaluate(-0.5 / fs) == 0.0
+    assert u.evaluate(samples.size / fs) == 0.0
+
+
+def test_linear_interpolation():
+    u = SampledSignal(samples, fs)
+    t = np.linspace(0, (samples.size - 1) / fs, 101)
+    np.testing.assert_allclose(
+        [u.evaluate(_t) for _t in t],
+        np.interp(t, np.arange(samples.size) / fs, samples),
+    )
+
+
+def test_invalid_interpolation_order():
+    with pytest.raises(Exception):
+        SampledSignal(samples, fs, interpolation_order=2)
+
+
+@pytest.mark.parametrize("filename", ["samples.npy", "samples.bin"])
+def test_from_file(tmp_path, filename):
+    filename = str(tmp_path / filename)
+    if filename.endswith(".npy"):
+        np.save(filename, samples)
+    else:
+        samples.tofile(filename)
+    u = SampledSignal.from_file(filename, fs)
+    assert isinstance(u.samples, np.memmap)
+    assert u.evaluate(1.5 / fs) == 0.5
@@ -1,6 +1,9 @@
 from tests.fixture.chain_of_integrators import chain_of_integrators
 import pytest
 import numpy as np
+import copy
+import scipy.sparse
+import cbadc
 
 from cbadc.analog_system import AnalogSystem, InvalidAnalogSystemError
 
@@ -69,3 +72,42 @@ def test_wrong_n_Gamma_tilde():
     Gamma_tilde_temp = Gamma_tildeT[:, 1:]
     with pytest.raises(InvalidAnalogSystemError):
         AnalogSystem(A, B, CT, Gamma, Gamma_tilde_temp)
+
+
+def test_sparse_initialization(chain_of_integrators):
+    dense = chain_of_integrators["system"]
+    sparse = AnalogSystem(
+        scipy.sparse.csr_matrix(chain_of_integrators["A"]),
+        chain_of_integrators["B"],
+        chain_of_integrators["CT"],
+        scipy.sparse.csc_matrix(chain_of_integrators["Gamma"]),
+        scipy.sparse.coo_matrix(chain_of_integrators["Gamma_tildeT"]),
+    )
+    assert sparse.sparse and not dense.sparse
+    np.testing.assert_allclose(sparse.A, dense.A)
+    assert sparse._A_s == dense._A_s
+    x = np.arange(1.0, chain_of_integrators["N"] + 1)
+    u = np.ones(1)
+    s = np.ones(chain_of_integrators["M"])
+    np.testing.assert_allclose(
+        sparse.derivative(x, 0.0, u, s), dense.derivative(x, 0.0, u, s)
+    )
+    np.testing.assert_allclose(
+        sparse.control_observation(x), dense.control_observation(x)
+    )
+    np.testing.assert_allclose(
+        sparse.signal_observation(x), dense.signal_observation(x)
+    )
+
+    digital_control = cbadc.digital_control.DigitalControl(
+        cbadc.analog_signal.Clock(1.0 / (2 * chain_of_integrators["beta"])),
+        chain_of_integrators["M"],
+    )
+    input_signal = [cbadc.analog_signal.Sinusoidal(0.5, 10.0)]
+    control_signals = [
+        cbadc.simulator.PreComputedControlSignalsSimulator(
+            system, copy.deepcopy(digital_control), input_signal
+        ).simulate(100)
+        for system in (dense, sparse)
+    ]
+    np.testing.assert_array_equal(control_signals[0], control_signals[1])
@@ -1,4 +1,4 @@
-from cbadc.digital_control import DigitalControl
+from cbadc.digital_control import DigitalControl, MultiPhaseDigitalControl
 from cbadc.analog_signal import Clock
 import numpy as np
 
@@ -60,3 +60,20 @@ def test_control_signal():
     print("control contribution response: ", np.asarray(res))
     np.testing.assert_allclose(np.zeros(M), digitalControl.control_signal())
     np.testing.assert_allclose(-np.ones(M), res)
+
+
+def test_multi_phase_next_events():
+    Ts = 1e-3
+    M = 6
+    clock = Clock(Ts)
+    phi_1 = np.array([3, 0, 5, 1, 3, 4]) * Ts / M
+    digitalControl = MultiPhaseDigitalControl(clock, phi_1)
+    times, phases = digitalControl.next_events(3 * M)
+    assert np.all(np.diff(times) >= 0)
+    for time in np.unique(times):
+        assert time == digitalControl._t_next
+        x = np.random.randn(M)
+        digitalControl.control_update(time, x)
+        phase = phases[times == time]
+        np.testing.assert_equal(digitalControl._t_last_update[phase], time)
+        np.testing.assert_equal(digitalControl.control_signal()[phase], x[phase] >= 0)
@@ -1,4 +1,6 @@
+import copy
 import cbadc
+import pytest
 import numpy as np
 from tests.fixture.chain_of_integrators import chain_of_integrators
 from cbadc.analog_signal import Clock
@@ -79,3 +81,76 @@ def test_write_C_header_with_fixed_point(chain_of_integrators):
         fixed_point=fixed_point,
     )
     filter.write_C_header("FIR_filter_C_header_with_fixed_point")
+
+
+@pytest.mark.parametrize("downsample", [1, 3])
+def test_estimate_array(downsample):
+    eta2 = 1e3
+    K1 = 40
+    K2 = 33
+    analog_system = cbadc.analog_system.AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+    digital_control = cbadc.digital_control.DigitalControl(Clock(Ts), M)
+    control_signals = np.random.randint(2, size=(600, M))
+    template = cbadc.digital_estimator.FIRFilter(
+        analog_system,
+        digital_control,
+        eta2,
+        K1,
+        K2,
+        downsample=downsample,
+        solver_type=cbadc.digital_estimator.FilterComputationBackend.numpy,
+    )
+    reference_estimator = copy.deepcopy(template)
+    reference_estimator(iter(control_signals))
+    reference_estimates = np.array(
+        [next(reference_estimator) for _ in range(600 // downsample)]
+    )
+    for backend in cbadc.digital_estimator.FIRFilterBackend:
+        for packed in (False, True):
+            if packed:
+                signals = cbadc.utilities.pack_control_signals(control_signals)
+            else:
+                signals = control_signals
+            array_estimator = copy.deepcopy(template)
+            estimates = np.vstack(
+                [
+                    array_estimator.estimate(
+                        signals[start:stop], backend=backend, packed=packed
+                    )
+                    for start, stop in ((0, 30), (30, 45), (45, 600))
+                ]
+            )
+            np.testing.assert_allclose(
+                estimates, reference_estimates, rtol=1e-9, atol=1e-12
+            )
+
+
+def test_estimate_array_fixed_point():
+    eta2 = 1e3
+    K1 = 21
+    K2 = 22
+    analog_system = cbadc.analog_system.AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+    digital_control = cbadc.digital_control.DigitalControl(Clock(Ts), M)
+    control_signals = np.random.randint(2, size=(200, M))
+    template = cbadc.digital_estimator.FIRFilter(
+        analog_system,
+        digital_control,
+        eta2,
+        K1,
+        K2,
+        fixed_point=cbadc.utilities.FixedPoint(32, 16.0),
+        solver_type=cbadc.digital_estimator.FilterComputationBackend.numpy,
+    )
+    reference_estimator = copy.deepcopy(template)
+    reference_estimator(iter(control_signals))
+    reference_estimates = np.array([next(reference_estimator) for _ in range(200)])
+    for backend in (
+        cbadc.digital_estimator.FIRFilterBackend.direct,
+        cbadc.digital_estimator.FIRFilterBackend.lookup_table,
+    ):
+        estimates = copy.deepcopy(template).estimate(
+            cbadc.utilities.pack_control_signals(control_signals),
+            backend=backend,
+            packed=True,
+        )
+        np.testing.assert_equal(estimates, reference_estimates)
@@ -1,10 +1,17 @@
 from cbadc.simulator import get_simulator
-from cbadc.digital_estimator import BatchEstimator
+from cbadc.digital_estimator import (
+    BatchEstimator,
+    FIRFilter,
+    IIRFilter,
+    ParallelEstimator,
+    SegmentedEstimator,
+)
 from cbadc.analog_signal import ConstantSignal, Clock
 from cbadc.analog_system import AnalogSystem
 from cbadc.digital_control import DigitalControl
 
 import numpy as np
+import pytest
 from tests.fixture.chain_of_integrators import chain_of_integrators
 
 beta = 6250.0
@@ -119,3 +126,155 @@ def test_stf():
     omega = np.logspace(-5, 0) * beta
     stf = estimator.signal_transfer_function(omega)
     print(stf)
+
+
+@pytest.mark.parametrize("estimator_type", [BatchEstimator, FIRFilter])
+def test_checkpoint(estimator_type):
+    clock = Clock(Ts)
+    analogSystem = AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+    circuitSimulator = get_simulator(
+        analogSystem, DigitalControl(clock, M), [ConstantSignal(0.25)], clock
+    )
+    control_signals = circuitSimulator.simulate(200)
+
+    def estimator():
+        return estimator_type(analogSystem, DigitalControl(clock, M), 100.0, 20, 10)
+
+    consumed = []
+
+    def control_signal_sequence():
+        for s in control_signals:
+            consumed.append(s)
+            yield s
+
+    reference_estimator = estimator()
+    reference_estimator(control_signal_sequence())
+    for _ in range(67):
+        next(reference_estimator)
+    checkpoint = reference_estimator.checkpoint()
+    position = len(consumed)
+    reference_estimates = np.array([next(reference_estimator) for _ in range(50)])
+
+    resumed_estimator = estimator()
+    resumed_estimator.restore(checkpoint)
+    resumed_estimator(iter(control_signals[position:]))
+    np.testing.assert_equal(
+        np.array([next(resumed_estimator) for _ in range(50)]), reference_estimates
+    )
+
+
+@pytest.mark.parametrize("estimator_type", [BatchEstimator, ParallelEstimator])
+def test_estimate_array(estimator_type):
+    clock = Clock(Ts)
+    analogSystem = AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+    circuitSimulator = get_simulator(
+        analogSystem, DigitalControl(clock, M), [ConstantSignal(0.25)], clock
+    )
+    control_signals = circuitSimulator.simulate(200)
+
+    def estimator():
+        return estimator_type(analogSystem, DigitalControl(clock, M), 100.0, 20, 10)
+
+    reference_estimator = estimator()
+    reference_estimator(iter(control_signals))
+    reference_estimates = np.array([next(reference_estimator) for _ in range(180)])
+
+    array_estimator = estimator()
+    out = np.zeros((80, analogSystem.L))
+    estimates = np.vstack(
+        (
+            array_estimator.estimate(control_signals[:13]),
+            array_estimator.estimate(control_signals[13:71], out=out),
+            array_estimator.estimate(control_signals[71:]),
+        )
+    )
+    np.testing.assert_allclose(estimates, reference_estimates, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("downsample", [1, 3])
+def test_estimate_array_iir(downsample):
+    clock = Clock(Ts)
+    analogSystem = AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+    circuitSimulator = get_simulator(
+        analogSystem, DigitalControl(clock, M), [ConstantSignal(0.25)], clock
+    )
+    control_signals = circuitSimulator.simulate(210)
+
+    def estimator():
+        return IIRFilter(
+            analogSystem, DigitalControl(clock, M), 100.0, 10, downsample=downsample
+        )
+
+    reference_estimator = estimator()
+    reference_estimator(iter(control_signals))
+    reference_estimates = np.array(
+        [next(reference_estimator) for _ in range(210 // downsample)]
+    )
+
+    array_estimator = estimator()
+    estimates = np.vstack(
+        [
+            array_estimator.estimate(control_signals[start:stop])
+            for start, stop in ((0, 3), (3, 12), (12, 210))
+        ]
+    )
+    np.testing.assert_allclose(estimates, reference_estimates, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_segmented_estimator(processes):
+    clock = Clock(Ts)
+    analogSystem = AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+    circuitSimulator = get_simulator(
+        analogSystem, DigitalControl(clock, M), [ConstantSignal(0.25)], clock
+    )
+    control_signals = circuitSimulator.simulate(1000)
+
+    def estimator():
+        return BatchEstimator(analogSystem, DigitalControl(clock, M), 100.0, 20, 10)
+
+    reference_estimates = estimator().estimate(control_signals)
+
+    segmented_estimator = SegmentedEstimator(
+        estimator(), 170, processes=processes, validation_size=100
+    )
+    estimates = segmented_estimator.estimate(control_signals)
+    assert estimates.shape == reference_estimates.shape
+    np.testing.assert_allclose(estimates, reference_estimates, atol=1e-10)
+    assert segmented_estimator.deviation < 1e-10
+
+
+@pytest.mark.parametrize(
+    "estimator_type,downsample", [(FIRFilter, 2), (IIRFilter, 1), (IIRFilter, 3)]
+)
+def test_segmented_estimator_filters(estimator_type, downsample):
+    clock = Clock(Ts)
+    analogSystem = AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+    circuitSimulator = get_simulator(
+        analogSystem, DigitalControl(clock, M), [ConstantSignal(0.25)], clock
+    )
+    control_signals = circuitSimulator.simulate(1500)
+
+    def estimator():
+        if estimator_type == FIRFilter:
+            return FIRFilter(
+                analogSystem,
+                DigitalControl(clock, M),
+                100.0,
+                20,
+                10,
+                downsample=downsample,
+            )
+        return IIRFilter(
+            analogSystem, DigitalControl(clock, M), 100.0, 10, downsample=downsample
+        )
+
+    reference_estimates = estimator().estimate(control_signals)
+
+    segmented_estimator = SegmentedEstimator(
+        estimator(), 170, processes=1, validation_size=100
+    )
+    estimates = segmented_estimator.estimate(control_signals)
+    assert estimates.shape == reference_estimates.shape
+    np.testing.assert_allclose(estimates, reference_estimates, atol=1e-10)
+    assert segmented_estimator.deviation < 1e-10
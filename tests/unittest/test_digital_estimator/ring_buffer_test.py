@@ -0,0 +1,27 @@
+from cbadc.digital_estimator._ring_buffer import _RingBuffer
+import numpy as np
+
+
+def test_ring_buffer():
+    size = 5
+    ring_buffer = _RingBuffer(size, 2, dtype=np.int64)
+    reference = np.zeros((0, 2), dtype=np.int64)
+    for K in [3, 2, 1, 4, 5]:
+        rows = np.random.randint(-100, 100, size=(K, 2))
+        if len(ring_buffer) + K > size:
+            discard = len(ring_buffer) + K - size
+            ring_buffer.discard(discard)
+            reference = reference[discard:, :]
+        ring_buffer.append(rows)
+        reference = np.vstack((reference, rows))
+        np.testing.assert_equal(ring_buffer.view(), reference)
+
+
+def test_ring_buffer_push():
+    ring_buffer = _RingBuffer(4, 1, full=True)
+    reference = np.zeros((4, 1), dtype=np.int8)
+    for k in range(10):
+        rows = np.array([[k], [-k]], dtype=np.int8)
+        ring_buffer.push(rows)
+        reference = np.vstack((reference[2:, :], rows))
+        np.testing.assert_equal(ring_buffer.view(), reference)
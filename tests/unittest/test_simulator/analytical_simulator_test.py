@@ -89,3 +89,22 @@ def test_switch_cap_control_system_with_delay():
     )
     for control_signal in sim:
         print(control_signal)
+
+
+def test_cache(tmp_path):
+    analogSignals = [cbadc.analog_signal.ConstantSignal(0.1)]
+    clock = cbadc.analog_signal.Clock(Ts)
+    analog_system = cbadc.analog_system.AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+
+    def simulator():
+        return cbadc.simulator.analytical_simulator.AnalyticalSimulator(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, M),
+            analogSignals,
+            clock,
+            cache_dir=str(tmp_path),
+        )
+
+    reference = simulator().simulate(50)
+    assert len(list(tmp_path.iterdir())) == 1
+    np.testing.assert_equal(simulator().simulate(50), reference)
@@ -90,3 +90,36 @@ def test_switch_cap_control_system_with_delay():
     )
     for control_signal in sim:
         print(control_signal)
+
+
+def test_closed_form_inputs(tmp_path):
+    analogSignals = [cbadc.analog_signal.Sinusoidal(amplitude, 1 / Ts / 32, 0.3)]
+    clock = cbadc.analog_signal.Clock(Ts)
+    analog_system = cbadc.analog_system.AnalogSystem(A, B, CT, Gamma, Gamma_tildeT)
+
+    def simulator(closed_form_inputs):
+        return cbadc.simulator.mp_simulator.MPSimulator(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, M),
+            analogSignals,
+            clock,
+            closed_form_inputs=closed_form_inputs,
+            cache_dir=str(tmp_path),
+        )
+
+    reference = simulator(False)
+    reference_controls = reference.simulate(10)
+    sim = simulator(True)
+    np.testing.assert_equal(sim.simulate(10), reference_controls)
+    np.testing.assert_allclose(
+        np.array(sim.state_vector(), dtype=np.double),
+        np.array(reference.state_vector(), dtype=np.double),
+        atol=1e-12,
+    )
+    # system and input propagators
+    assert len(list(tmp_path.iterdir())) == 2
+    cached = simulator(True)
+    assert cached.Af == sim.Af
+    assert cached._input_contributions[0].propagator == (
+        sim._input_contributions[0].propagator
+    )
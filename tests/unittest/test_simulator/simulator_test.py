@@ -2,7 +2,15 @@ import cbadc
 import numpy as np
 from tests.fixture.chain_of_integrators import chain_of_integrators
 import pytest
+import copy
+import pickle
+import math
+import os
+import time
 import cbadc.simulator.numerical_simulator
+import scipy.integrate
+import scipy.linalg
+import scipy.sparse
 
 beta = 6250.0
 rho = -62.5
@@ -124,3 +132,925 @@ def test_Ts_multiple_of_T(chain_of_integrators):
     cbadc.simulator.FullSimulator(
         chain_of_integrators["system"], digitalControl, analogSignals, sim_clock
     )
+
+
+@pytest.mark.parametrize(
+    "analog_signal,atol",
+    [
+        (cbadc.analog_signal.ConstantSignal(0.1), 1e-8),
+        (cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 64, np.pi / 3, 0.01), 1e-8),
+        (cbadc.analog_signal.Ramp(1e3, Ts * 3.5, Ts / 3, 0.01), 1e-8),
+        (
+            cbadc.analog_signal.SampledSignal(
+                0.5 * np.sin(2 * np.pi * np.arange(32) / 16), 1 / Ts / 4
+            ),
+            1e-8,
+        ),
+        # the numerical reference integrates across the jumps of the
+        # zero-order hold, which limits its accuracy to about 5e-7.
+        (
+            cbadc.analog_signal.SampledSignal(
+                0.5 * np.sin(2 * np.pi * np.arange(32) / 16), 1 / Ts / 4, 0
+            ),
+            1e-6,
+        ),
+    ],
+)
+def test_closed_form_inputs(analog_signal, atol):
+    analog_system = cbadc.analog_system.AnalogSystem(
+        A, B, CT.transpose(), Gamma, Gamma_tildeT
+    )
+    clock = cbadc.analog_signal.Clock(Ts)
+    simulators = [
+        cbadc.simulator.PreComputedControlSignalsSimulator(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, M),
+            [analog_signal],
+            t_stop=Ts * 100,
+            atol=1e-14,
+            rtol=1e-12,
+            closed_form_inputs=closed_form_inputs,
+        )
+        for closed_form_inputs in (True, False)
+    ]
+    for s_closed_form, s_numerical in zip(*simulators):
+        np.testing.assert_array_equal(s_closed_form, s_numerical)
+        np.testing.assert_allclose(
+            simulators[0].state_vector(),
+            simulators[1].state_vector(),
+            atol=atol,
+        )
+
+
+@pytest.mark.parametrize(
+    "simulator_class",
+    [cbadc.simulator.AnalyticalSimulator, cbadc.simulator.MPSimulator],
+)
+def test_sampled_signal_unsupported(simulator_class):
+    analog_system = cbadc.analog_system.AnalogSystem(
+        A, B, CT.transpose(), Gamma, Gamma_tildeT
+    )
+    clock = cbadc.analog_signal.Clock(Ts)
+    with pytest.raises(Exception, match="SampledSignal"):
+        simulator_class(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.SampledSignal(np.zeros(16), 1 / Ts)],
+        )
+
+
+@pytest.mark.parametrize(
+    "simulator_type",
+    [
+        cbadc.simulator.SimulatorType.pre_computed_numerical,
+        cbadc.simulator.SimulatorType.full_numerical,
+    ],
+)
+def test_simulate(simulator_type):
+    analog_system = cbadc.analog_system.AnalogSystem(
+        A, B, CT.transpose(), Gamma, Gamma_tildeT
+    )
+    clock = cbadc.analog_signal.Clock(Ts)
+    analog_signals = [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 64)]
+    size = 50
+
+    def simulator():
+        return cbadc.simulator.get_simulator(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, M),
+            analog_signals,
+            clock=clock,
+            simulator_type=simulator_type,
+        )
+
+    reference_simulator = simulator()
+    reference_controls = np.zeros((size, M), dtype=np.int8)
+    reference_states = np.zeros((size, N))
+    for index in range(size):
+        reference_controls[index, :] = next(reference_simulator)
+        reference_states[index, :] = reference_simulator.state_vector()
+
+    block_simulator = simulator()
+    block_simulator._block_size = 7
+    block_sizes = []
+    simulate_block = block_simulator._simulate_block
+
+    def _simulate_block(control_signals, *args):
+        block_sizes.append(control_signals.shape[0])
+        return simulate_block(control_signals, *args)
+
+    block_simulator._simulate_block = _simulate_block
+    controls, states = block_simulator.simulate(size // 2, state_decimation=3)
+    np.testing.assert_equal(controls, reference_controls[: size // 2, :])
+    np.testing.assert_allclose(states, reference_states[: size // 2 : 3, :], atol=1e-8)
+    packed = block_simulator.simulate(size - size // 2, packed=True)
+    np.testing.assert_equal(
+        cbadc.utilities.unpack_control_signals(packed, M),
+        reference_controls[size // 2 :, :],
+    )
+    np.testing.assert_allclose(
+        block_simulator.state_vector(), reference_states[-1, :], atol=1e-8
+    )
+    assert max(block_sizes) <= block_simulator._block_size
+
+
+@pytest.mark.parametrize(
+    "simulator_type",
+    [
+        cbadc.simulator.SimulatorType.pre_computed_numerical,
+        cbadc.simulator.SimulatorType.full_numerical,
+    ],
+)
+def test_checkpoint(simulator_type):
+    analog_system = cbadc.analog_system.AnalogSystem(
+        A, B, CT.transpose(), Gamma, Gamma_tildeT
+    )
+    clock = cbadc.analog_signal.Clock(Ts)
+    analog_signals = [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 64)]
+
+    def simulator():
+        return cbadc.simulator.get_simulator(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, M),
+            analog_signals,
+            clock=clock,
+            simulator_type=simulator_type,
+        )
+
+    reference_simulator = simulator()
+    reference_simulator.simulate(37)
+    checkpoint = reference_simulator.checkpoint()
+    reference_controls = reference_simulator.simulate(50)
+
+    resumed_simulator = simulator()
+    resumed_simulator.restore(pickle.loads(pickle.dumps(checkpoint)))
+    np.testing.assert_equal(resumed_simulator.simulate(50), reference_controls)
+    np.testing.assert_equal(
+        resumed_simulator.state_vector(), reference_simulator.state_vector()
+    )
+
+    estimator = cbadc.digital_estimator.BatchEstimator(
+        analog_system, cbadc.digital_control.DigitalControl(clock, M), 1.0, 10, 5
+    )
+    with pytest.raises(Exception):
+        resumed_simulator.restore(estimator.checkpoint())
+
+
+def test_simulate_t_stop():
+    analog_system = cbadc.analog_system.AnalogSystem(
+        A, B, CT.transpose(), Gamma, Gamma_tildeT
+    )
+    clock = cbadc.analog_signal.Clock(Ts)
+    simulator = cbadc.simulator.PreComputedControlSignalsSimulator(
+        analog_system,
+        cbadc.digital_control.DigitalControl(clock, M),
+        [cbadc.analog_signal.ConstantSignal(0.1)],
+        clock=clock,
+        t_stop=Ts * 10.5,
+    )
+    out = np.zeros((20, M), dtype=np.int8)
+    controls = simulator.simulate(20, out=out)
+    assert controls.shape == (10, M)
+    assert simulator.simulate(5).shape == (0, M)
+
+
+def test_ensemble_simulator():
+    analog_system = cbadc.analog_system.AnalogSystem(
+        A, B, CT.transpose(), Gamma, Gamma_tildeT
+    )
+    clock = cbadc.analog_signal.Clock(Ts)
+    input_signals = [
+        [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 64)],
+        [cbadc.analog_signal.Sinusoidal(0.2, 1 / Ts / 128, np.pi / 4)],
+        [cbadc.analog_signal.ConstantSignal(-0.3)],
+        [cbadc.analog_signal.SincPulse(0.4, 1 / Ts / 16, Ts * 10)],
+    ]
+    initial_state_vectors = np.random.randn(len(input_signals), N) * 0.1
+    size = 40
+    ensemble = cbadc.simulator.EnsembleSimulator(
+        analog_system,
+        cbadc.digital_control.DigitalControl(clock, M),
+        input_signals,
+        initial_state_vectors=initial_state_vectors,
+    )
+    controls, states = ensemble.simulate(size, state_decimation=1)
+    assert controls.shape == (size, len(input_signals), M)
+    for p, input_signal in enumerate(input_signals):
+        simulator = cbadc.simulator.PreComputedControlSignalsSimulator(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, M),
+            input_signal,
+            clock=clock,
+            initial_state_vector=initial_state_vectors[p, :],
+        )
+        for index in range(size):
+            np.testing.assert_equal(next(simulator), controls[index, p, :])
+            np.testing.assert_allclose(
+                simulator.state_vector(), states[index, p, :], atol=1e-8
+            )
+
+
+def test_ensemble_simulator_features():
+    clock = cbadc.analog_signal.Clock(Ts)
+    input_signals = [
+        [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 64)],
+        [cbadc.analog_signal.ConstantSignal(-0.3)],
+    ]
+    size = 40
+
+    def ensemble(Gamma=Gamma):
+        return cbadc.simulator.EnsembleSimulator(
+            cbadc.analog_system.AnalogSystem(A, B, CT.transpose(), Gamma, Gamma_tildeT),
+            cbadc.digital_control.DigitalControl(clock, M),
+            input_signals,
+        )
+
+    reference = ensemble().simulate(size)
+
+    # sparse operators, packed output, and iteration with statistics
+    sparse_ensemble = ensemble(scipy.sparse.csr_matrix(Gamma))
+    packed = sparse_ensemble.simulate(size // 2, packed=True)
+    assert packed.shape == (size // 2, len(input_signals))
+    for p in range(len(input_signals)):
+        np.testing.assert_equal(
+            cbadc.utilities.unpack_control_signals(packed[:, p], M),
+            reference[: size // 2, p, :],
+        )
+    sparse_ensemble.enable_statistics()
+    np.testing.assert_equal(
+        np.array([next(sparse_ensemble) for _ in range(size // 2)]),
+        reference[size // 2 :],
+    )
+    stats = sparse_ensemble.disable_statistics()
+    assert stats["samples"] == size // 2
+    assert stats["input_integration_time"] > 0
+    assert stats["control_update_time"] > 0
+
+    unsupported = ensemble()
+    unsupported.state_bounds = cbadc.simulator.StateBounds(np.ones(N))
+    with pytest.raises(Exception):
+        unsupported.simulate(size)
+    with pytest.raises(Exception):
+        cbadc.simulator.EnsembleSimulator(
+            cbadc.analog_system.AnalogSystem(A, B, CT.transpose(), Gamma, Gamma_tildeT),
+            cbadc.digital_control.DigitalControl(clock, M),
+            input_signals,
+            clock=cbadc.analog_signal.Clock(Ts / 2),
+        )
+
+
+@pytest.mark.parametrize(
+    "digital_control",
+    [
+        cbadc.digital_control.DigitalControl(cbadc.analog_signal.Clock(Ts), M),
+        cbadc.digital_control.DigitalControl(
+            cbadc.analog_signal.Clock(Ts),
+            M,
+            impulse_response=cbadc.analog_signal.RCImpulseResponse(Ts / 5, Ts / 10),
+        ),
+        cbadc.digital_control.MultiPhaseDigitalControl(
+            cbadc.analog_signal.Clock(Ts), np.arange(M) * Ts / M
+        ),
+    ],
+)
+def test_event_driven_full_simulator(digital_control):
+    analog_system = cbadc.analog_system.AnalogSystem(
+        A, B, CT.transpose(), Gamma, Gamma_tildeT
+    )
+    analog_signals = [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 64)]
+    simulators = [
+        cbadc.simulator.FullSimulator(
+            analog_system,
+            copy.deepcopy(digital_control),
+            analog_signals,
+            digital_control.clock,
+            t_stop=Ts * 40,
+            atol=1e-14,
+            rtol=1e-11,
+            event_driven=event_driven,
+        )
+        for event_driven in (False, True)
+    ]
+    assert simulators[1].event_driven
+    for s_numerical, s_event_driven in zip(*simulators):
+        np.testing.assert_array_equal(s_numerical, s_event_driven)
+        np.testing.assert_allclose(
+            simulators[0].state_vector(),
+            simulators[1].state_vector(),
+            atol=1e-5,
+        )
+
+
+@pytest.mark.parametrize(
+    "simulator_type",
+    [
+        cbadc.simulator.SimulatorType.pre_computed_numerical,
+        cbadc.simulator.SimulatorType.full_numerical,
+    ],
+)
+def test_statistics(chain_of_integrators, simulator_type):
+    size = 50
+    clock = cbadc.analog_signal.Clock(Ts)
+
+    def simulator():
+        return cbadc.simulator.get_simulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 32)],
+            simulator_type=simulator_type,
+        )
+
+    reference_simulator = simulator()
+    reference = np.array([next(reference_simulator) for _ in range(2 * size)])
+
+    callbacks = []
+    instrumented_simulator = simulator()
+    simulator_class = instrumented_simulator.__class__
+    with pytest.raises(Exception):
+        instrumented_simulator.stats()
+    instrumented_simulator.enable_statistics(callback=callbacks.append, interval=1e-9)
+    assert type(instrumented_simulator) is simulator_class
+    controls = [next(instrumented_simulator) for _ in range(size)]
+    controls.extend(instrumented_simulator.simulate(size))
+    np.testing.assert_equal(np.array(controls), reference)
+
+    stats = instrumented_simulator.disable_statistics()
+    assert stats["samples"] == 2 * size
+    assert stats["samples_per_second"] > 0
+    assert stats["control_update_time"] > 0
+    assert stats["input_integration_time"] + stats["state_transition_time"] > 0
+    if simulator_type == cbadc.simulator.SimulatorType.full_numerical:
+        assert stats["ivp_calls"] > 0 and stats["nfev"] > 0
+    else:
+        assert stats["input_integration_time"] > 0
+    assert callbacks and callbacks[-1]["samples"] <= 2 * size
+    assert type(instrumented_simulator) is simulator_class
+    pickle.dumps(instrumented_simulator.checkpoint())
+    with pytest.raises(Exception):
+        instrumented_simulator.stats()
+
+
+@pytest.mark.parametrize(
+    "simulator_type",
+    [
+        cbadc.simulator.SimulatorType.pre_computed_numerical,
+        cbadc.simulator.SimulatorType.full_numerical,
+    ],
+)
+def test_statistics_copy(chain_of_integrators, simulator_type):
+    size = 20
+    clock = cbadc.analog_signal.Clock(Ts)
+    simulator = cbadc.simulator.get_simulator(
+        chain_of_integrators["system"],
+        cbadc.digital_control.DigitalControl(clock, M),
+        [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 32)],
+        simulator_type=simulator_type,
+    )
+    simulator.enable_statistics()
+    simulator.simulate(size)
+    t_next = simulator.digital_control._t_next
+
+    copies = [copy.deepcopy(simulator), pickle.loads(pickle.dumps(simulator))]
+    controls = [simulator_copy.simulate(size) for simulator_copy in copies]
+    # simulating the copies does not advance the original
+    assert simulator.digital_control._t_next == t_next
+    assert simulator.stats()["samples"] == size
+    reference = simulator.simulate(size)
+    for simulator_copy, copy_controls in zip(copies, controls):
+        np.testing.assert_equal(copy_controls, reference)
+        assert simulator_copy.stats()["samples"] == 2 * size
+
+
+@pytest.mark.parametrize("directory", [False, True])
+def test_trajectory_recorder(chain_of_integrators, tmp_path, directory):
+    size = 103
+    decimation = 4
+    state_indices = [0, 3]
+    clock = cbadc.analog_signal.Clock(Ts)
+
+    def simulator():
+        return cbadc.simulator.get_simulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 32)],
+        )
+
+    reference = [
+        result
+        for result, _ in zip(
+            cbadc.simulator.extended_simulation_result(simulator()), range(size)
+        )
+    ]
+    reference_states = np.array([result["analog_state"] for result in reference])
+    reference_controls = np.array([result["control_signal"] for result in reference])
+    reference_t = np.array([result["t"] for result in reference])
+
+    recorder = cbadc.simulator.TrajectoryRecorder(
+        simulator(),
+        size,
+        decimation=decimation,
+        state_indices=state_indices,
+        directory=str(tmp_path) if directory else None,
+        block_size=10,
+    )
+    assert recorder.record(size // 3) == size // 3
+    assert recorder.record() == size - size // 3
+    recorder.flush()
+
+    np.testing.assert_allclose(
+        recorder.states, reference_states[::decimation, state_indices], atol=1e-8
+    )
+    np.testing.assert_equal(recorder.control_signals, reference_controls[::decimation])
+    np.testing.assert_allclose(recorder.t, reference_t[::decimation])
+    stats = recorder.statistics()
+    assert stats["samples"] == size
+    np.testing.assert_allclose(
+        stats["max"], reference_states[:, state_indices].max(axis=0), atol=1e-8
+    )
+    np.testing.assert_allclose(
+        stats["min"], reference_states[:, state_indices].min(axis=0), atol=1e-8
+    )
+    np.testing.assert_allclose(
+        stats["rms"],
+        np.sqrt(np.mean(reference_states[:, state_indices] ** 2, axis=0)),
+        atol=1e-8,
+    )
+    if directory:
+        np.testing.assert_equal(
+            np.load(tmp_path / "states.npy", mmap_mode="r"), recorder.states
+        )
+
+
+@pytest.mark.parametrize(
+    "simulator_type",
+    [
+        cbadc.simulator.SimulatorType.pre_computed_numerical,
+        cbadc.simulator.SimulatorType.full_numerical,
+    ],
+)
+def test_state_bounds(chain_of_integrators, simulator_type):
+    size = 100
+    clock = cbadc.analog_signal.Clock(Ts)
+    bounds = np.array([0.8, 0.8, 0.8, 0.8, 0.8])
+
+    def simulator():
+        simulator = cbadc.simulator.get_simulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(0.9, 1 / Ts / 32)],
+            simulator_type=simulator_type,
+        )
+        simulator.state_bounds = cbadc.simulator.StateBounds(bounds)
+        return simulator
+
+    reference_simulator = simulator()
+    states = []
+    for _ in range(size):
+        next(reference_simulator)
+        states.append(reference_simulator.state_vector())
+    states = np.array(states)
+    out_of_bounds = np.abs(states) > bounds
+    summary = reference_simulator.state_bounds.summary()
+    np.testing.assert_allclose(summary["max"], states.max(axis=0))
+    np.testing.assert_allclose(
+        summary["headroom"], np.min(bounds - np.abs(states), axis=0)
+    )
+    np.testing.assert_equal(
+        summary["outages"],
+        np.sum(out_of_bounds & ~np.vstack((np.zeros(N, bool), out_of_bounds[:-1])), 0),
+    )
+
+    block_simulator = simulator()
+    block_simulator.simulate(size)
+    np.testing.assert_equal(
+        block_simulator.state_bounds.outages()["state"],
+        reference_simulator.state_bounds.outages()["state"],
+    )
+    np.testing.assert_allclose(
+        block_simulator.state_bounds.recoveries()["t"],
+        reference_simulator.state_bounds.recoveries()["t"],
+    )
+
+
+def test_state_bounds_abort(chain_of_integrators):
+    clock = cbadc.analog_signal.Clock(Ts)
+    simulator = cbadc.simulator.get_simulator(
+        chain_of_integrators["system"],
+        cbadc.digital_control.DigitalControl(clock, M),
+        [cbadc.analog_signal.ConstantSignal(0.5)],
+    )
+    # bounds far below the state swing
+    simulator.state_bounds = cbadc.simulator.StateBounds(
+        1e-3 * np.ones(N), abort_after=10
+    )
+    with pytest.raises(cbadc.simulator.StateBoundsExceededError) as error:
+        simulator.simulate(1 << 10)
+    assert error.value.t < (1 << 10) * Ts
+    assert simulator.state_bounds.summary()["headroom"].min() < 0
+
+
+def test_discrete_noise_covariance():
+    Sigma = np.diag(np.arange(1.0, N + 1))
+    Q = cbadc.simulator._propagators._discrete_noise_covariance(A, Sigma, Ts)
+    tau = np.linspace(0, Ts, 2001)
+    integrand = [
+        np.dot(
+            np.dot(scipy.linalg.expm(A * t), Sigma),
+            scipy.linalg.expm(A.transpose() * t),
+        )
+        for t in tau
+    ]
+    np.testing.assert_allclose(
+        Q, scipy.integrate.simpson(integrand, x=tau, axis=0), rtol=1e-6, atol=1e-12
+    )
+    L = cbadc.simulator._propagators._covariance_factor(Q)
+    np.testing.assert_allclose(np.dot(L, L.transpose()), Q, rtol=1e-10)
+    # singular covariance
+    Q[:, 0] = Q[0, :] = 0.0
+    L = cbadc.simulator._propagators._covariance_factor(Q)
+    np.testing.assert_allclose(np.dot(L, L.transpose()), Q, atol=1e-12 * Q.max())
+
+
+def test_noise_and_jitter(chain_of_integrators):
+    size = 300
+    clock = cbadc.analog_signal.Clock(Ts)
+
+    def simulator(**kwargs):
+        return cbadc.simulator.PreComputedControlSignalsSimulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 30)],
+            **kwargs,
+        )
+
+    noiseless_controls, noiseless_states = simulator().simulate(
+        size, state_decimation=1
+    )
+    np.testing.assert_equal(
+        simulator(jitter_std=0.0, seed=1).simulate(size), noiseless_controls
+    )
+
+    kwargs = {
+        "noise_covariance": 1e-4 / Ts * np.eye(N),
+        "jitter_std": 1e-3 * Ts,
+        "seed": np.random.SeedSequence(1234),
+    }
+    controls, states = simulator(**kwargs).simulate(size, state_decimation=1)
+    assert not np.allclose(states, noiseless_states)
+    # bit-exact reproduction, also when simulated in pieces and resumed from
+    # a checkpoint.
+    noisy_simulator = simulator(**kwargs)
+    first_controls, first_states = noisy_simulator.simulate(
+        size // 2, state_decimation=1
+    )
+    checkpoint = pickle.loads(pickle.dumps(noisy_simulator.checkpoint()))
+    resumed_simulator = simulator(**kwargs)
+    resumed_simulator.restore(checkpoint)
+    second_controls, second_states = resumed_simulator.simulate(
+        size - size // 2, state_decimation=1
+    )
+    np.testing.assert_equal(np.vstack((first_controls, second_controls)), controls)
+    np.testing.assert_equal(np.vstack((first_states, second_states)), states)
+
+    # independent streams
+    other_controls = simulator(
+        **dict(kwargs, seed=np.random.SeedSequence(1234).spawn(1)[0])
+    ).simulate(size)
+    assert np.any(other_controls != controls)
+
+    # forwarded by get_simulator
+    np.testing.assert_equal(
+        cbadc.simulator.get_simulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 30)],
+            **kwargs,
+        ).simulate(size),
+        controls,
+    )
+    with pytest.raises(Exception):
+        cbadc.simulator.get_simulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 30)],
+            simulator_type=cbadc.simulator.SimulatorType.full_numerical,
+            **kwargs,
+        )
+
+
+def test_ensemble_noise_and_jitter(chain_of_integrators):
+    size = 100
+    clock = cbadc.analog_signal.Clock(Ts)
+    input_signals = [
+        [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 30)],
+        [cbadc.analog_signal.ConstantSignal(0.2)],
+        [cbadc.analog_signal.ConstantSignal(0.2)],
+    ]
+    kwargs = {
+        "noise_covariance": 1e-4 / Ts * np.eye(N),
+        "jitter_std": 1e-3 * Ts,
+    }
+    ensemble = cbadc.simulator.EnsembleSimulator(
+        chain_of_integrators["system"],
+        cbadc.digital_control.DigitalControl(clock, M),
+        input_signals,
+        seed=1234,
+        **kwargs,
+    )
+    controls, states = ensemble.simulate(size, state_decimation=1)
+    # identical members draw independent streams
+    assert np.any(controls[:, 1, :] != controls[:, 2, :])
+    # member p is perturbed as a simulator seeded by the p:th child
+    seeds = np.random.SeedSequence(1234).spawn(len(input_signals))
+    for p, input_signal in enumerate(input_signals):
+        simulator = cbadc.simulator.PreComputedControlSignalsSimulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            input_signal,
+            clock=clock,
+            seed=seeds[p],
+            **kwargs,
+        )
+        member_controls, member_states = simulator.simulate(size, state_decimation=1)
+        np.testing.assert_equal(member_controls, controls[:, p, :])
+        np.testing.assert_allclose(member_states, states[:, p, :], atol=1e-8)
+
+
+def test_simulation_cache(chain_of_integrators, tmp_path):
+    size = 250
+    clock = cbadc.analog_signal.Clock(Ts)
+    cache = cbadc.simulator.SimulationCache(str(tmp_path), chunk_size=64)
+
+    def simulator(cache=None, amplitude=0.5, t_stop=math.inf):
+        return cbadc.simulator.get_simulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(amplitude, 1 / Ts / 32)],
+            t_stop=t_stop,
+            cache=cache,
+        )
+
+    reference = simulator().simulate(size)
+
+    # populate the cache partially, through the iterator and in blocks
+    cached_simulator = simulator(cache)
+    first = np.array([next(cached_simulator) for _ in range(10)])
+    np.testing.assert_equal(first, reference[:10])
+    np.testing.assert_equal(cached_simulator.simulate(90), reference[10:100])
+    assert cache.length(cached_simulator.key) == 100
+
+    # served from the cache and then extended
+    cached_simulator = simulator(cache)
+    np.testing.assert_equal(cached_simulator.simulate(100), reference[:100])
+    assert cached_simulator._simulator is None
+    np.testing.assert_equal(cached_simulator.simulate(size - 100), reference[100:])
+    assert cache.length(cached_simulator.key) == size
+
+    # t_stop and packed output
+    cached_simulator = simulator(cache, t_stop=Ts * 120.5)
+    np.testing.assert_equal(
+        cbadc.utilities.unpack_control_signals(
+            cached_simulator.simulate(size, packed=True), M
+        ),
+        reference[:120],
+    )
+    assert cached_simulator._simulator is None
+
+    # noise, jitter, and seed are part of the key
+    def noisy_simulator(seed):
+        return cbadc.simulator.get_simulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 32)],
+            cache=cache,
+            noise_covariance=1e-4 / Ts * np.eye(N),
+            seed=seed,
+        )
+
+    keys = {noisy_simulator(seed).key for seed in (1, 2)}
+    assert len(keys) == 2 and cached_simulator.key not in keys
+    assert (
+        noisy_simulator(np.random.SeedSequence(1)).key
+        != noisy_simulator(np.random.SeedSequence(1).spawn(1)[0]).key
+    )
+    with pytest.raises(Exception):
+        noisy_simulator(None)
+
+    # a different simulation evicts the least recently used entry
+    key = cached_simulator.key
+    cache.max_bytes = cache.size()
+    other = simulator(cache, amplitude=0.25)
+    assert other.key != key
+    other.simulate(size)
+    assert cache.length(key) == 0
+    assert cache.length(other.key) == size
+
+
+def test_simulation_cache_eviction_order(chain_of_integrators, tmp_path):
+    size = 100
+    clock = cbadc.analog_signal.Clock(Ts)
+    cache = cbadc.simulator.SimulationCache(str(tmp_path), chunk_size=64)
+
+    def simulator(amplitude):
+        return cbadc.simulator.get_simulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(clock, M),
+            [cbadc.analog_signal.Sinusoidal(amplitude, 1 / Ts / 32)],
+            cache=cache,
+        )
+
+    first, second = simulator(0.5), simulator(0.25)
+    for age, cached_simulator in ((200, first), (100, second)):
+        cached_simulator.simulate(size)
+        last_used = time.time() - age
+        os.utime(
+            os.path.join(cache.directory, cached_simulator.key, "checkpoint.pickle"),
+            (last_used, last_used),
+        )
+
+    # reading the older entry from the cache marks it as recently used
+    reader = simulator(0.5)
+    reader.simulate(size)
+    assert reader._simulator is None
+
+    cache.max_bytes = cache.size()
+    third = simulator(0.125)
+    third.simulate(size)
+    assert cache.length(first.key) == size
+    assert cache.length(second.key) == 0
+    assert cache.length(third.key) == size
+
+
+def test_modal_simulator(chain_of_integrators):
+    size = 200
+    N = 6
+    beta = 6250.0
+    # a diagonalizable system with complex conjugate eigenvalues
+    A = beta * (np.eye(N, k=-1) - np.eye(N, k=1)) - 60.0 * np.eye(N)
+    B = np.zeros((N, 1))
+    B[0] = beta
+    analog_system = cbadc.analog_system.AnalogSystem(
+        A, B, np.eye(N), -beta * np.eye(N), np.eye(N)
+    )
+    clock = cbadc.analog_signal.Clock(1 / (2 * beta))
+
+    def simulator(simulator_type):
+        return cbadc.simulator.get_simulator(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, N),
+            [cbadc.analog_signal.Sinusoidal(0.3, beta / 256)],
+            simulator_type=simulator_type,
+        )
+
+    reference_controls, reference_states = simulator(
+        cbadc.simulator.SimulatorType.pre_computed_numerical
+    ).simulate(size, state_decimation=1)
+
+    modal_simulator = simulator(cbadc.simulator.SimulatorType.modal)
+    assert modal_simulator.modal
+    controls, states = modal_simulator.simulate(size // 2, state_decimation=3)
+    np.testing.assert_equal(controls, reference_controls[: size // 2])
+    np.testing.assert_allclose(states, reference_states[: size // 2 : 3], atol=1e-10)
+    # stepping and resuming from a checkpoint mix the dense and modal updates
+    np.testing.assert_equal(next(modal_simulator), reference_controls[size // 2])
+    resumed_simulator = simulator(cbadc.simulator.SimulatorType.modal)
+    resumed_simulator.restore(modal_simulator.checkpoint())
+    np.testing.assert_equal(
+        resumed_simulator.simulate(size - size // 2 - 1),
+        reference_controls[size // 2 + 1 :],
+    )
+    np.testing.assert_allclose(
+        resumed_simulator.state_vector(), reference_states[-1], atol=1e-10
+    )
+
+    # the chain of integrators is not diagonalizable
+    dense_simulator = cbadc.simulator.ModalSimulator(
+        chain_of_integrators["system"],
+        cbadc.digital_control.DigitalControl(cbadc.analog_signal.Clock(Ts), M),
+        [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 32)],
+    )
+    assert not dense_simulator.modal
+    dense_simulator.simulate(10)
+
+
+@pytest.mark.parametrize("oversampling", [True, False])
+def test_multi_rate(chain_of_integrators, oversampling):
+    size = 30
+    R = 4 if oversampling else 3
+
+    def simulator(T):
+        return cbadc.simulator.PreComputedControlSignalsSimulator(
+            chain_of_integrators["system"],
+            cbadc.digital_control.DigitalControl(cbadc.analog_signal.Clock(Ts), M),
+            [cbadc.analog_signal.Sinusoidal(0.5, 1 / Ts / 32)],
+            clock=cbadc.analog_signal.Clock(T),
+        )
+
+    reference_controls, reference_states = simulator(Ts).simulate(
+        size * R, state_decimation=1
+    )
+    if oversampling:
+        multi_rate_simulator = simulator(Ts / R)
+        controls, states = multi_rate_simulator.simulate(size * R, state_decimation=1)
+        # the control signal is held, and the state observed, R times per period
+        np.testing.assert_equal(controls[R - 1 :: R], reference_controls[:size])
+        np.testing.assert_equal(
+            controls[2 * R - 2 :: R], reference_controls[: size - 1]
+        )
+        np.testing.assert_allclose(
+            states[R - 1 :: R], reference_states[:size], atol=1e-10
+        )
+        # the partial DAC waveform integrals sum to the full period integral
+        transition = multi_rate_simulator._pre_computed_state_transition_matrix
+        np.testing.assert_allclose(
+            sum(
+                np.dot(np.linalg.matrix_power(transition, R - 1 - phase), matrix)
+                for phase, matrix in enumerate(
+                    multi_rate_simulator._pre_computed_phase_control_matrices
+                )
+            ),
+            multi_rate_simulator._pre_computed_control_matrix,
+            rtol=1e-9,
+            atol=1e-12,
+        )
+    else:
+        multi_rate_simulator = simulator(Ts * R)
+        controls, states = multi_rate_simulator.simulate(size, state_decimation=1)
+        np.testing.assert_equal(controls, reference_controls[R - 1 :: R])
+        np.testing.assert_allclose(states, reference_states[R - 1 :: R], atol=1e-12)
+    # stepping follows the same time grid
+    stepping_simulator = simulator(multi_rate_simulator.clock.T)
+    np.testing.assert_equal(
+        np.array([next(stepping_simulator) for _ in range(controls.shape[0])]),
+        controls,
+    )
+
+    with pytest.raises(Exception):
+        simulator(Ts * 2.5)
+
+
+def test_switched_capacitor_simulator():
+    size = 100
+    C_x = 1e-9
+    R_s = 1e1
+    tau = R_s * C_x / 2
+    T = 1e-6 / 2
+    analog_system = cbadc.analog_system.AnalogSystem(
+        1e6 * np.eye(M, k=-1),
+        1e6 * np.eye(M)[:, :1],
+        np.eye(M),
+        np.eye(M) / (R_s * C_x),
+        -np.eye(M),
+    )
+    input_signals = [cbadc.analog_signal.Sinusoidal(0.8, 1 / T / 512)]
+
+    def switched_capacitor_control(T1, T2):
+        return cbadc.digital_control.SwitchedCapacitorControl(
+            T, T1, T2, M, -np.eye(M) / tau
+        )
+
+    # charging at the end of each period equals an RC shaped DAC waveform
+    reference_controls, reference_states = cbadc.simulator.get_simulator(
+        analog_system,
+        cbadc.digital_control.DigitalControl(
+            cbadc.analog_signal.Clock(T),
+            M,
+            impulse_response=cbadc.analog_signal.RCImpulseResponse(tau),
+        ),
+        input_signals,
+        atol=1e-16,
+        rtol=1e-13,
+    ).simulate(size, state_decimation=1)
+    digital_control = switched_capacitor_control(0.0, T)
+    # the initial control signals of cbadc.digital_control.DigitalControl
+    digital_control._s = np.ones(M, dtype=int)
+    simulator = cbadc.simulator.get_simulator(
+        analog_system, digital_control, input_signals
+    )
+    assert isinstance(simulator, cbadc.simulator.SwitchedCapacitorSimulator)
+    controls, states = simulator.simulate(size, state_decimation=1)
+    np.testing.assert_equal(controls, reference_controls)
+    np.testing.assert_allclose(states, reference_states, atol=1e-8)
+
+    # staggered charge and discharge instants
+    T1 = np.linspace(0.1, 0.4, M) * T
+    T2 = np.linspace(1.2, 1.5, M) * T
+    controls, states = cbadc.simulator.SwitchedCapacitorSimulator(
+        analog_system, switched_capacitor_control(T1, T2), input_signals
+    ).simulate(size, state_decimation=1)
+    assert np.all(np.abs(states) < 2)
+    simulator = cbadc.simulator.SwitchedCapacitorSimulator(
+        analog_system, switched_capacitor_control(T1, T2), input_signals
+    )
+    np.testing.assert_equal(
+        np.array([next(simulator) for _ in range(size // 2)]),
+        controls[: size // 2],
+    )
+    resumed_simulator = cbadc.simulator.SwitchedCapacitorSimulator(
+        analog_system, switched_capacitor_control(T1, T2), input_signals
+    )
+    resumed_simulator.restore(simulator.checkpoint())
+    np.testing.assert_equal(
+        resumed_simulator.simulate(size - size // 2), controls[size // 2 :]
+    )
+    np.testing.assert_allclose(resumed_simulator.state_vector(), states[-1])
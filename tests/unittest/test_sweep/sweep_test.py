@@ -0,0 +1,101 @@
+import copy
+import cbadc
+import numpy as np
+
+N = 4
+M = N
+beta = 6250.0
+T = 1.0 / (2 * beta)
+amplitudes = [0.1, 0.5]
+
+
+def sweep(processes: int, simulator_kwargs=None):
+    analog_system = cbadc.analog_system.ChainOfIntegrators(
+        beta * np.ones(N), np.zeros(N), -beta * np.eye(N)
+    )
+    digital_control = cbadc.digital_control.DigitalControl(
+        cbadc.analog_signal.Clock(T), M
+    )
+    return cbadc.sweep.Sweep(
+        [(analog_system, digital_control)],
+        [
+            [cbadc.analog_signal.Sinusoidal(amplitude, 1 / T / 128)]
+            for amplitude in amplitudes
+        ],
+        estimators=[
+            {
+                "estimator": cbadc.digital_estimator.FIRFilter,
+                "eta2": 1e4,
+                "K1": 64,
+                "K2": 64,
+            }
+        ],
+        n_samples=1 << 10,
+        processes=processes,
+        return_control_signals=True,
+        simulator_kwargs=simulator_kwargs,
+    )
+
+
+def test_sweep_serial():
+    results = sweep(1).run()
+    assert len(results) == len(amplitudes)
+    for result, amplitude in zip(results, amplitudes):
+        assert result["control_signals"].shape == ((1 << 10) + 128, M)
+        assert result["estimate"].shape == (1 << 10, 1)
+        assert result["snr"][0] > 20
+        np.testing.assert_allclose(
+            np.max(np.abs(result["estimate"][128:, 0])), amplitude, rtol=0.1
+        )
+
+
+def test_sweep_parallel():
+    serial = sweep(1).run()
+    parallel = sweep(2).run()
+    for a, b in zip(serial, parallel):
+        assert a["input"] == b["input"]
+        np.testing.assert_equal(a["control_signals"], b["control_signals"])
+        np.testing.assert_allclose(a["estimate"], b["estimate"])
+
+
+def test_sweep_noise():
+    simulator_kwargs = {"noise_covariance": 1e-3 * beta * np.eye(N), "seed": 42}
+    results = sweep(1, simulator_kwargs).run()
+    noiseless = sweep(1).run()
+    for result, reference in zip(results, noiseless):
+        assert np.any(result["control_signals"] != reference["control_signals"])
+    # reproducible, independently of the process pool
+    for a, b in zip(results, sweep(2, simulator_kwargs).run()):
+        np.testing.assert_equal(a["control_signals"], b["control_signals"])
+    # independent streams per task
+    seeds = sweep(1, simulator_kwargs)._seeds
+    assert len({tuple(seed.spawn_key) for seed in seeds.values()}) == len(seeds)
+
+
+def test_sweep_switched_capacitor():
+    C_x = 1e-9
+    R_s = 1e1
+    tau = R_s * C_x / 2
+    T = 1e-6 / 2
+    analog_system = cbadc.analog_system.AnalogSystem(
+        1e6 * np.eye(M, k=-1),
+        1e6 * np.eye(M)[:, :1],
+        np.eye(M),
+        np.eye(M) / (R_s * C_x),
+        -np.eye(M),
+    )
+    digital_control = cbadc.digital_control.SwitchedCapacitorControl(
+        T, T / 2, T, M, -np.eye(M) / tau
+    )
+    input_signals = [cbadc.analog_signal.Sinusoidal(0.5, 1 / T / 128)]
+    results = cbadc.sweep.Sweep(
+        [(analog_system, digital_control)],
+        [input_signals],
+        n_samples=100,
+        processes=1,
+        return_control_signals=True,
+    ).run()
+    reference = cbadc.simulator.get_simulator(
+        analog_system, copy.deepcopy(digital_control), input_signals
+    ).simulate(100)
+    np.testing.assert_equal(results[0]["control_signals"], reference)
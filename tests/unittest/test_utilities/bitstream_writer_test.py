@@ -0,0 +1,59 @@
+import cbadc
+import numpy as np
+import os
+import pytest
+from cbadc.utilities import (
+    BitstreamWriter,
+    control_signal_2_byte_stream,
+    write_byte_stream_to_file,
+)
+
+
+@pytest.mark.parametrize("M", [3, 12, 31])
+def test_bitstream_writer(tmp_path, M):
+    control_signals = np.random.randint(2, size=(1000, M))
+    reference_filename = os.path.join(tmp_path, "reference.dat")
+    write_byte_stream_to_file(
+        reference_filename, control_signal_2_byte_stream(control_signals, M)
+    )
+    filename = os.path.join(tmp_path, "control_signals.dat")
+    with BitstreamWriter(filename, M, buffer_size=64, queue_size=2) as writer:
+        for index in range(0, 1000, 70):
+            writer.write(control_signals[index : index + 70, :])
+    with open(reference_filename, "rb") as f:
+        reference = f.read()
+    with open(filename, "rb") as f:
+        assert f.read() == reference
+    stats = writer.stats()
+    assert stats["samples"] == 1000
+    assert stats["bytes"] == len(reference)
+
+
+def test_bitstream_writer_simulation(tmp_path):
+    N = 4
+    beta = 6250.0
+    T = 1.0 / (2 * beta)
+    analog_system = cbadc.analog_system.ChainOfIntegrators(
+        beta * np.ones(N), np.zeros(N), -beta * np.eye(N)
+    )
+    clock = cbadc.analog_signal.Clock(T)
+
+    def simulator():
+        return cbadc.simulator.get_simulator(
+            analog_system,
+            cbadc.digital_control.DigitalControl(clock, N),
+            [cbadc.analog_signal.Sinusoidal(0.5, 1 / T / 64)],
+            clock=clock,
+            t_stop=T * 299.5,
+        )
+
+    filename = os.path.join(tmp_path, "control_signals.dat")
+    with BitstreamWriter(filename, N) as writer:
+        size = writer.write_simulation(simulator(), 1000, block_size=64)
+    assert size < 1000
+    control_signals = cbadc.utilities.unpack_control_signals(
+        np.fromfile(filename, dtype=np.uint8), N
+    )
+    reference = simulator().simulate(1000)
+    assert reference.shape[0] == size
+    np.testing.assert_equal(control_signals, reference)